@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Pipeline Artifact Manifest
+One SQLite table recording which artifacts (audio, transcripts, comments, ...) exist for every video.
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import hashlib
+import argparse
+import logging
+import subprocess
+import threading
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set
+
+from compressed_storage import logical_path
+from data_paths import ARTIFACTS, DEFAULT_CHANNEL_SLUG, artifact_dir, scan_files
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MANIFEST_PATH = 'data/artifacts.db'
+
+AUDIO_DIR = 'data/tmp'
+
+# kind -> (default channel directory, file name suffix after the video ID); used to build the manifest from disk
+ARTIFACT_DIRS = {
+    'audio': (AUDIO_DIR, '.mp3'),
+    **{kind: (artifact_dir(kind), ARTIFACTS[kind][1])
+       for kind in ('transcript', 'denoised', 'comments', 'stats', 'keywords', 'sentiment')},
+}
+KINDS = list(ARTIFACT_DIRS)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    video_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    path TEXT,
+    size INTEGER,
+    mtime REAL,
+    sha256 TEXT,
+    tool TEXT,
+    tool_version TEXT,
+    recorded_at TEXT NOT NULL,
+    PRIMARY KEY (video_id, kind)
+);
+CREATE INDEX IF NOT EXISTS artifacts_kind ON artifacts(kind);
+CREATE INDEX IF NOT EXISTS artifacts_path ON artifacts(path);
+-- One row per scanned directory; the old per-kind table could not tell channels apart
+DROP TABLE IF EXISTS scans;
+CREATE TABLE IF NOT EXISTS directory_scans (
+    kind TEXT NOT NULL,
+    directory TEXT NOT NULL,
+    scanned_at TEXT NOT NULL,
+    PRIMARY KEY (kind, directory)
+);
+"""
+
+COLUMNS = ('video_id', 'kind', 'path', 'size', 'mtime', 'sha256', 'tool', 'tool_version', 'recorded_at')
+
+
+@lru_cache(maxsize=1)
+def code_version() -> Optional[str]:
+    """Short git commit of this checkout, recorded as the producing tool version."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def file_sha256(path: str) -> str:
+    """SHA-256 of a file's bytes as stored on disk."""
+    with open(path, 'rb') as f:
+        return hashlib.file_digest(f, 'sha256').hexdigest()
+
+
+def kind_dir(kind: str, channel_slug: str = DEFAULT_CHANNEL_SLUG) -> str:
+    """Directory holding one kind of a channel (audio is shared by all channels)."""
+    return AUDIO_DIR if kind == 'audio' else artifact_dir(kind, channel_slug)
+
+
+def video_id_from_path(path: str) -> Optional[str]:
+    """Video ID from an artifact file name ({video_id}{suffix}, optionally .zst)."""
+    name = logical_path(os.path.basename(str(path)))
+    # Longest suffix first: *_whisper_transcript_denoised.txt before *.txt-like matches
+    for _, suffix in sorted(ARTIFACT_DIRS.values(), key=lambda item: -len(item[1])):
+        if name.endswith(suffix) and len(name) > len(suffix):
+            return name[:-len(suffix)]
+    return None
+
+
+class ArtifactManifest:
+    """Which artifacts exist per video, with size, hash and producer.
+
+    Every stage records what it writes, so planners answer questions such as
+    "videos with audio but no transcript" with one query instead of a stat()
+    per file. Rows for a kind can be rebuilt from disk with scan(); planners
+    call ensure_scanned() so a fresh manifest is bootstrapped once.
+    """
+
+    def __init__(self, path: str = DEFAULT_MANIFEST_PATH):
+        """Open (or create) the manifest.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        # Parallel Whisper workers write from separate processes
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        """Close the database connection."""
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def record(self, video_id: str, kind: str, path: Optional[str], tool: str,
+               tool_version: Optional[str] = None, sha256: Optional[str] = None) -> Dict:
+        """Record (or replace) one artifact of a video.
+
+        Args:
+            video_id: YouTube video ID
+            kind: One of KINDS
+            path: File written (None for results that are not files)
+            tool: Producer and its settings, e.g. 'stt_whisper:whisper-base'
+            tool_version: Producer code version (default: current git commit)
+            sha256: Content hash if already known (default: hash the file)
+
+        Returns:
+            Stored row
+        """
+        if kind not in KINDS:
+            raise ValueError(f"알 수 없는 산출물 종류: {kind}")
+        size = mtime = None
+        if path is not None:
+            path = str(path)
+            stat = os.stat(path)
+            size, mtime = stat.st_size, stat.st_mtime
+            sha256 = sha256 or file_sha256(path)
+        row = (video_id, kind, path, size, mtime, sha256, tool, tool_version or code_version(),
+               datetime.now().isoformat())
+        with self._lock, self._conn:
+            self._conn.execute(f"INSERT OR REPLACE INTO artifacts VALUES ({', '.join('?' * len(COLUMNS))})", row)
+        return dict(zip(COLUMNS, row))
+
+    def remove(self, video_id: str, kind: str):
+        """Forget an artifact (after its file was deleted)."""
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM artifacts WHERE video_id = ? AND kind = ?', (video_id, kind))
+
+    def move_paths(self, moves: Dict[str, str]) -> int:
+        """Update rows of files that were renamed, keeping their hash and producer.
+
+        Args:
+            moves: {old path: new path}, e.g. from data_paths.migrate
+
+        Returns:
+            Number of rows updated
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.executemany('UPDATE artifacts SET path = ? WHERE path = ?',
+                                            ((new, old) for old, new in moves.items()))
+            return cursor.rowcount
+
+    def scan(self, kinds: Optional[Iterable[str]] = None,
+             channel_slug: str = DEFAULT_CHANNEL_SLUG) -> Dict[str, int]:
+        """Rebuild rows of file-backed kinds from one channel's directories.
+
+        Args:
+            kinds: Kinds to scan (default: every kind in ARTIFACT_DIRS)
+            channel_slug: Channel whose directories are scanned
+
+        Returns:
+            Number of artifacts found per kind
+        """
+        return {kind: self.scan_directory(kind, kind_dir(kind, channel_slug)) for kind in kinds or ARTIFACT_DIRS}
+
+    def scan_directory(self, kind: str, directory: str) -> int:
+        """Rebuild the rows of one kind whose files live under a directory.
+
+        One directory listing (plus one per shard); files whose size and
+        mtime match the existing row keep their hash and producer, others are
+        re-hashed and attributed to 'scan'. Rows under the directory whose
+        files disappeared are dropped; rows of other directories (other
+        channels) are left alone.
+
+        Args:
+            kind: One of ARTIFACT_DIRS
+            directory: Directory to scan
+
+        Returns:
+            Number of artifacts found
+        """
+        suffix = ARTIFACT_DIRS[kind][1]
+        # Exact prefix match; LIKE would treat the '_' in channel directories as a wildcard
+        prefix = os.path.join(directory, '')
+        under_directory = 'kind = ? AND substr(path, 1, ?) = ?'
+        scope = (kind, len(prefix), prefix)
+        with self._lock:
+            known = {row[0]: row for row in self._conn.execute(
+                f'SELECT video_id, path, size, mtime, sha256, tool, tool_version FROM artifacts WHERE {under_directory}',
+                scope)}
+
+        rows = []
+        # Flat and sharded directories alike (see data_paths)
+        for video_id, entry in scan_files(directory, suffix):
+            path = entry.path
+            stat = entry.stat()
+            previous = known.get(video_id)
+            if previous and previous[1:4] == (path, stat.st_size, stat.st_mtime):
+                sha256, tool, tool_version = previous[4:]
+            else:
+                sha256, tool, tool_version = file_sha256(path), 'scan', None
+            rows.append((video_id, kind, path, stat.st_size, stat.st_mtime, sha256, tool,
+                         tool_version, datetime.now().isoformat()))
+
+        with self._lock, self._conn:
+            self._conn.execute(f'DELETE FROM artifacts WHERE {under_directory}', scope)
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO artifacts VALUES ({', '.join('?' * len(COLUMNS))})", rows)
+            self._conn.execute('INSERT OR REPLACE INTO directory_scans VALUES (?, ?, ?)',
+                               (kind, directory, datetime.now().isoformat()))
+        logger.info(f"✓ {kind}: {len(rows):,}개 ({directory})")
+        return len(rows)
+
+    def ensure_scanned(self, *kinds: str, channel_slug: str = DEFAULT_CHANNEL_SLUG):
+        """Scan a channel's kinds that were never scanned, so an empty manifest is not mistaken for "nothing done"."""
+        with self._lock:
+            scanned = set(self._conn.execute('SELECT kind, directory FROM directory_scans'))
+        missing = [kind for kind in kinds
+                   if kind in ARTIFACT_DIRS and (kind, kind_dir(kind, channel_slug)) not in scanned]
+        if missing:
+            logger.info(f"산출물 목록 초기 스캔: {', '.join(missing)} ({channel_slug})")
+            self.scan(missing, channel_slug)
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+
+    def get(self, video_id: str, kind: str) -> Optional[Dict]:
+        """Row of one artifact, or None."""
+        with self._lock:
+            row = self._conn.execute(f"SELECT {', '.join(COLUMNS)} FROM artifacts WHERE video_id = ? AND kind = ?",
+                                     (video_id, kind)).fetchone()
+        return dict(zip(COLUMNS, row)) if row else None
+
+    def has(self, video_id: str, kind: str) -> bool:
+        """True if the artifact is recorded."""
+        with self._lock:
+            return self._conn.execute('SELECT 1 FROM artifacts WHERE video_id = ? AND kind = ?',
+                                      (video_id, kind)).fetchone() is not None
+
+    def select(self, kind: str, with_kinds: Iterable[str] = (), without_kinds: Iterable[str] = ()) -> List[Dict]:
+        """Artifacts of one kind, filtered by which other artifacts the video has.
+
+        Args:
+            kind: Kind of the returned rows
+            with_kinds: The video must also have all of these
+            without_kinds: The video must have none of these
+
+        Returns:
+            Rows ordered by video_id, e.g. select('audio', without_kinds=['transcript'])
+        """
+        sql = f"SELECT {', '.join('a.' + c for c in COLUMNS)} FROM artifacts a WHERE a.kind = ?"
+        params = [kind]
+        for other in with_kinds:
+            sql += ' AND EXISTS (SELECT 1 FROM artifacts b WHERE b.video_id = a.video_id AND b.kind = ?)'
+            params.append(other)
+        for other in without_kinds:
+            sql += ' AND NOT EXISTS (SELECT 1 FROM artifacts b WHERE b.video_id = a.video_id AND b.kind = ?)'
+            params.append(other)
+        with self._lock:
+            rows = self._conn.execute(sql + ' ORDER BY a.video_id', params).fetchall()
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def video_ids(self, kind: str) -> Set[str]:
+        """Videos that have an artifact of this kind."""
+        with self._lock:
+            return {row[0] for row in self._conn.execute('SELECT video_id FROM artifacts WHERE kind = ?', (kind,))}
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """{kind: {'count': artifacts, 'bytes': total size}}."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT kind, COUNT(*), COALESCE(SUM(size), 0) FROM artifacts GROUP BY kind').fetchall()
+        return {kind: {'count': count, 'bytes': size} for kind, count, size in rows}
+
+
+def record_artifact(kind: str, path: Optional[str], tool: str, video_id: Optional[str] = None,
+                    tool_version: Optional[str] = None,
+                    manifest_path: Optional[str] = DEFAULT_MANIFEST_PATH) -> Optional[Dict]:
+    """Record one artifact from a script without keeping a manifest open.
+
+    Failures are logged, not raised: a missed record is repaired by the next
+    scan, a crashed stage is not.
+
+    Args:
+        kind: One of KINDS
+        path: File written (None for results kept elsewhere)
+        tool: Producer and its settings
+        video_id: Video ID (default: parsed from the file name)
+        tool_version: Producer code version (default: current git commit)
+        manifest_path: Manifest database (None disables recording)
+
+    Returns:
+        Stored row, or None if nothing was recorded
+    """
+    video_id = video_id or (video_id_from_path(path) if path else None)
+    if not manifest_path or not video_id:
+        return None
+    try:
+        with ArtifactManifest(manifest_path) as manifest:
+            return manifest.record(video_id, kind, path, tool, tool_version)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"⚠ 산출물 기록 실패: {video_id} {kind} ({e})")
+        return None
+
+
+def main():
+    """Command-line entry point."""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(
+        description='파이프라인 산출물 목록 (비디오별 오디오/자막/댓글/통계 존재 여부)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python artifact_manifest.py --scan                          # 디스크에서 다시 만들기
+  python artifact_manifest.py --scan comments --channel other_channel
+  python artifact_manifest.py --have audio --lacking transcript
+  python artifact_manifest.py --have transcript --lacking denoised --count
+        """
+    )
+    parser.add_argument('--db', default=DEFAULT_MANIFEST_PATH, help=f'목록 파일 (기본값: {DEFAULT_MANIFEST_PATH})')
+    parser.add_argument('--scan', nargs='*', choices=list(ARTIFACT_DIRS), default=None,
+                        help='디렉토리를 스캔해서 목록 갱신 (종류 생략 시 전체)')
+    parser.add_argument('--channel', default=DEFAULT_CHANNEL_SLUG,
+                        help=f'스캔할 채널 slug (기본값: {DEFAULT_CHANNEL_SLUG}, 다른 채널 행은 유지)')
+    parser.add_argument('--have', choices=KINDS, help='이 산출물이 있는 비디오')
+    parser.add_argument('--also', nargs='+', choices=KINDS, default=[], help='이 산출물도 있어야 함')
+    parser.add_argument('--lacking', nargs='+', choices=KINDS, default=[], help='이 산출물이 없어야 함')
+    parser.add_argument('--count', action='store_true', help='비디오 ID 대신 개수만 출력')
+    args = parser.parse_args()
+
+    with ArtifactManifest(args.db) as manifest:
+        if args.scan is not None:
+            start = time.perf_counter()
+            manifest.scan(args.scan or None, args.channel)
+            logger.info(f"스캔 완료 ({time.perf_counter() - start:.1f}초)")
+
+        if args.have:
+            start = time.perf_counter()
+            rows = manifest.select(args.have, with_kinds=args.also, without_kinds=args.lacking)
+            elapsed = (time.perf_counter() - start) * 1000
+            if not args.count:
+                for row in rows:
+                    print(row['video_id'])
+            logger.info(f"비디오 {len(rows):,}개 ({elapsed:.1f} ms)")
+            return
+
+        summary = manifest.summary()
+        if not summary:
+            logger.warning("⚠ 목록이 비어 있습니다. --scan으로 만드세요.")
+            sys.exit(1)
+        for kind in KINDS:
+            if kind in summary:
+                print(f"{kind:<12}{summary[kind]['count']:>8,}개{summary[kind]['bytes'] / 1024 / 1024:>12.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
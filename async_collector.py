@@ -0,0 +1,570 @@
+#!/usr/bin/env python3
+"""
+Async YouTube Data Collector
+asyncio engine for the catalog, stats and comment stages over a pooled aiohttp transport.
+"""
+
+import json
+import time
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+
+from artifact_manifest import ArtifactManifest
+from comment_schema import from_thread, upgrade
+from comment_store import CommentStore
+from crawl_checkpoint import CrawlCheckpoint
+from data_paths import artifact_dir, make_artifact_dir
+from quota_ledger import (RATE_LIMIT_RETRIES, QuotaScheduler, endpoint_cost, is_quota_response,
+                          is_rate_limit_response, rate_limit_delay)
+from youtube_channel_data_collector import (
+    MAX_IDS_PER_REQUEST, STAGE_CHECKPOINT_INTERVAL, YouTubeDataCollector
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_API_BASE_URL = 'https://www.googleapis.com/youtube/v3'
+
+# Idle keep-alive connections are reused for this long (seconds)
+KEEPALIVE_TIMEOUT = 60
+REQUEST_TIMEOUT = 60
+
+
+class ApiError(Exception):
+    """Error response from the Data API (async counterpart of HttpError)."""
+
+    def __init__(self, status: int, content: bytes, endpoint: str):
+        self.status = status
+        self.content = content
+        self.endpoint = endpoint
+        super().__init__(f"{endpoint} HTTP {status}: {content.decode('utf-8', errors='ignore')[:300]}")
+
+
+# Failures of one request: error responses, connection errors and ClientTimeout expiry
+REQUEST_ERRORS = (ApiError, aiohttp.ClientError, asyncio.TimeoutError)
+
+
+class AsyncYouTubeDataCollector(YouTubeDataCollector):
+    """YouTube channel data collector that issues Data API requests concurrently.
+
+    The public stage methods keep the synchronous signatures of
+    YouTubeDataCollector so main() can switch engines with a flag; each stage
+    runs its own event loop over one keep-alive connection pool.
+    """
+
+    def __init__(self, api_key: str, max_workers: int = 5, scheduler: Optional[QuotaScheduler] = None,
+                 base_url: str = DEFAULT_API_BASE_URL, concurrency: int = 16,
+                 reply_mode: str = 'all', max_replies: Optional[int] = None,
+                 comment_store: Optional[CommentStore] = None, manifest: Optional[ArtifactManifest] = None):
+        """Initialize the async engine.
+
+        Args:
+            api_key: YouTube Data API v3 key (comma-separated for a key pool)
+            max_workers: Number of parallel workers for transcript fetching
+            scheduler: Quota scheduler shared by every API call
+            base_url: Data API base URL (override to benchmark against a mock server)
+            concurrency: Maximum number of in-flight requests
+            reply_mode: 'all', 'inline' or 'none' (see YouTubeDataCollector)
+            max_replies: Maximum replies kept per comment thread (None: no cap)
+            comment_store: SQLite comment store that mirrors the comment JSON files
+            manifest: Artifact manifest updated for every comment/stats file written
+        """
+        super().__init__(api_key, max_workers, scheduler=scheduler,
+                         reply_mode=reply_mode, max_replies=max_replies,
+                         comment_store=comment_store, manifest=manifest)
+        self.base_url = base_url.rstrip('/')
+        self.concurrency = concurrency
+        self._session = None
+        self._semaphore = None
+
+    def _run(self, stage, *args, **kwargs):
+        """Run one async stage inside a fresh connection pool."""
+        async def runner():
+            connector = aiohttp.TCPConnector(limit=self.concurrency, keepalive_timeout=KEEPALIVE_TIMEOUT)
+            timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+            async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+                self._session = session
+                self._semaphore = asyncio.Semaphore(self.concurrency)
+                try:
+                    return await stage(*args, **kwargs)
+                except BaseException:
+                    # Stop in-flight requests and collect their errors before the loop closes
+                    others = asyncio.all_tasks() - {asyncio.current_task()}
+                    for task in others:
+                        task.cancel()
+                    await asyncio.gather(*others, return_exceptions=True)
+                    raise
+                finally:
+                    self._session = None
+                    self._semaphore = None
+
+        return asyncio.run(runner())
+
+    async def _get(self, endpoint: str, **params) -> Dict:
+        """Issue one Data API GET request through the response cache and quota scheduler.
+
+        Args:
+            endpoint: Endpoint name such as 'videos.list'
+            **params: Query parameters (None values are dropped)
+
+        Returns:
+            API response dictionary
+        """
+        return (await self._get_dated(endpoint, **params))[0]
+
+    async def _get_dated(self, endpoint: str, **params) -> Tuple[Dict, float]:
+        """Like _get, but also return when the response was fetched (see QuotaScheduler.execute_dated).
+
+        The ledger and the response cache are files, so their reads and
+        writes run in worker threads and never block the event loop.
+        """
+        resource = endpoint.split('.')[0]
+        query = {name: value for name, value in params.items() if value is not None}
+        ledger = self.scheduler.ledger
+
+        cache = self.scheduler.cache
+        cached = await asyncio.to_thread(cache.lookup, endpoint, query) if cache else None
+        if cached and cached.fresh:
+            cache.hits += 1
+            return cached.body, cached.fetched_at
+
+        async with self._semaphore:
+            key = None
+            throttled = 0
+            while True:
+                if key is None:
+                    key = self.scheduler.pick_key(endpoint_cost(endpoint))
+                if key is None:
+                    # Raises QuotaExhaustedError, or sleeps until the reset
+                    key = await asyncio.to_thread(self.scheduler.acquire_key, endpoint)
+                query['key'] = key
+                if self.scheduler.rate_limiter:
+                    await asyncio.sleep(self.scheduler.rate_limiter.reserve())
+
+                headers = {'If-None-Match': cached.etag} if cached and cached.etag else None
+                async with self._session.get(f"{self.base_url}/{resource}", params=query,
+                                             headers=headers) as resp:
+                    status = resp.status
+                    content = await resp.read()
+
+                if status == 304 and cached:
+                    await asyncio.to_thread(ledger.record, key, endpoint)
+                    cache.revalidated += 1
+                    await asyncio.to_thread(cache.touch, endpoint, cached)
+                    return cached.body, cached.fetched_at
+
+                if status >= 400:
+                    if is_quota_response(status, content):
+                        logger.warning("⚠ API 키 쿼터 소진 - 다음 키로 전환")
+                        await asyncio.to_thread(ledger.mark_exhausted, key)
+                        key = None
+                        continue
+                    # Failed requests are still charged
+                    await asyncio.to_thread(ledger.record, key, endpoint)
+                    if is_rate_limit_response(status, content) and throttled < RATE_LIMIT_RETRIES:
+                        delay = rate_limit_delay(throttled)
+                        throttled += 1
+                        logger.warning(f"⚠ 초당 요청 한도 초과 ({endpoint}) - {delay:.1f}초 후 같은 키로 재시도")
+                        await asyncio.sleep(delay)
+                        continue
+                    raise ApiError(status, content, endpoint)
+
+                await asyncio.to_thread(ledger.record, key, endpoint)
+                body = json.loads(content)
+                if cache:
+                    cache.misses += 1
+                    return body, await asyncio.to_thread(cache.put, endpoint, query, body)
+                return body, time.time()
+
+    # ------------------------------------------------------------------
+    # Channel info
+    # ------------------------------------------------------------------
+
+    def get_channel_info(self, channel_id: str) -> Dict[str, str]:
+        """Get channel information including custom URL/handle."""
+        return self._run(self._get_channel_info, channel_id)
+
+    async def _get_channel_info(self, channel_id: str) -> Dict[str, str]:
+        try:
+            response = await self._get('channels.list', part='snippet', id=channel_id)
+            if response.get('items'):
+                return self._build_channel_info(channel_id, response['items'][0]['snippet'])
+        except REQUEST_ERRORS as e:
+            logger.error(f"채널 정보 가져오기 실패: {e}")
+
+        return {
+            'channel_id': channel_id,
+            'channel_slug': channel_id,
+            'channel_title': channel_id
+        }
+
+    # ------------------------------------------------------------------
+    # Catalog
+    # ------------------------------------------------------------------
+
+    def fetch_channel_videos(self, channel_id: str, channel_slug: str, min_duration_seconds: int = 60,
+                             include_stats: bool = False) -> List[Dict]:
+        """Fetch all long-form videos from a channel (excludes Shorts)."""
+        return self._run(self._fetch_channel_videos, channel_id, channel_slug,
+                         min_duration_seconds, include_stats)
+
+    async def _fetch_channel_videos(self, channel_id: str, channel_slug: str, min_duration_seconds: int,
+                                    include_stats: bool) -> List[Dict]:
+        logger.info(f"채널 {channel_id}의 롱폼 비디오 목록 가져오는 중... (async)")
+        logger.info(f"필터: {min_duration_seconds}초 이상의 비디오만 수집")
+        videos = []
+        collected_stats = []
+
+        video_parts = 'contentDetails,snippet'
+        if include_stats:
+            video_parts += ',statistics'
+            stats_dir = artifact_dir('stats', channel_slug)
+            make_artifact_dir(stats_dir)
+
+        try:
+            uploads_playlist_id = await self._get_uploads_playlist_id_async(channel_id)
+            if not uploads_playlist_id:
+                return videos
+
+            checkpoint = await asyncio.to_thread(CrawlCheckpoint, f"catalog_{channel_id}")
+            if checkpoint.exists and checkpoint.matches(min_duration_seconds=min_duration_seconds):
+                videos = checkpoint.items
+                logger.info(f"↻ 체크포인트에서 재개: 비디오 {len(videos)}개 수집된 상태")
+            else:
+                await asyncio.to_thread(checkpoint.clear)
+            shorts_filtered = checkpoint.state.get('shorts_filtered', 0)
+
+            def fetch_details(video_ids: List[str]):
+                return asyncio.create_task(self._get_dated('videos.list', part=video_parts, id=','.join(video_ids)))
+
+            # Playlist pages must be walked in order (page tokens), but the
+            # videos.list detail call for each page runs while the next page loads.
+            # Pages whose details were not stored yet are kept in the checkpoint.
+            pending = [(ids, fetch_details(ids)) for ids in checkpoint.state.get('pending_ids', [])]
+            next_page_token = checkpoint.page_token
+            playlist_done = False
+
+            while pending or not playlist_done:
+                if not playlist_done:
+                    playlist_response = await self._get(
+                        'playlistItems.list',
+                        part='contentDetails',
+                        playlistId=uploads_playlist_id,
+                        maxResults=50,
+                        pageToken=next_page_token
+                    )
+                    video_ids = [item['contentDetails']['videoId'] for item in playlist_response.get('items', [])]
+                    if video_ids:
+                        pending.append((video_ids, fetch_details(video_ids)))
+                    next_page_token = playlist_response.get('nextPageToken')
+                    playlist_done = not next_page_token
+                else:
+                    await pending[0][1]
+
+                # Absorb finished detail calls in page order
+                page_stats = []
+                while pending and pending[0][1].done():
+                    _, task = pending.pop(0)
+                    details, fetched_at = task.result()
+                    for video_item in details.get('items', []):
+                        video_data = self._build_video_data(video_item)
+                        if video_data['duration_seconds'] >= min_duration_seconds:
+                            videos.append(video_data)
+                            if include_stats and 'statistics' in video_item:
+                                page_stats.append(self._build_engagement_data(
+                                    video_item['id'], video_item['statistics'], fetched_at))
+                        else:
+                            shorts_filtered += 1
+
+                if page_stats:
+                    await asyncio.to_thread(self._save_stats_files, stats_dir, page_stats)
+                    collected_stats.extend(page_stats)
+
+                if not playlist_done:
+                    await asyncio.to_thread(checkpoint.save, next_page_token, videos,
+                                            min_duration_seconds=min_duration_seconds,
+                                            shorts_filtered=shorts_filtered,
+                                            pending_ids=[ids for ids, _ in pending])
+
+            await asyncio.to_thread(checkpoint.clear)
+
+            if collected_stats:
+                await asyncio.to_thread(self._append_stats_history, channel_slug, collected_stats, videos)
+
+            videos.sort(key=lambda x: x['published_at'], reverse=True)
+            logger.info(f"총 {len(videos)}개의 롱폼 비디오를 가져왔습니다. (Shorts {shorts_filtered}개 제외됨)")
+
+        except REQUEST_ERRORS as e:
+            logger.error(f"비디오 목록 가져오기 실패: {e}")
+
+        return videos
+
+    async def _get_uploads_playlist_id_async(self, channel_id: str) -> Optional[str]:
+        channel_response = await self._get('channels.list', part='contentDetails', id=channel_id)
+        if not channel_response.get('items'):
+            logger.error(f"채널을 찾을 수 없습니다: {channel_id}")
+            return None
+
+        uploads_playlist_id = channel_response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
+        logger.info(f"업로드 플레이리스트 ID: {uploads_playlist_id}")
+        return uploads_playlist_id
+
+    def sync_channel_videos(self, channel_id: str, channel_slug: str, known_videos: List[Dict],
+                            min_duration_seconds: int = 60, include_stats: bool = False) -> List[Dict]:
+        """Add new uploads to an existing catalog, stopping at the first known video."""
+        return self._run(self._sync_channel_videos, channel_id, channel_slug, known_videos,
+                         min_duration_seconds, include_stats)
+
+    async def _sync_channel_videos(self, channel_id: str, channel_slug: str, known_videos: List[Dict],
+                                   min_duration_seconds: int, include_stats: bool) -> List[Dict]:
+        logger.info(f"채널 {channel_id} 증분 동기화 중... (기존 비디오 {len(known_videos)}개, async)")
+        known_ids = {video['video_id'] for video in known_videos}
+        new_ids = []
+        pages = 0
+
+        try:
+            uploads_playlist_id = await self._get_uploads_playlist_id_async(channel_id)
+            if not uploads_playlist_id:
+                return known_videos
+
+            # Page tokens force the playlist walk to be sequential; it is
+            # usually one page because the playlist is newest-first
+            next_page_token = None
+            reached_known = False
+            while not reached_known:
+                playlist_response = await self._get(
+                    'playlistItems.list',
+                    part='contentDetails',
+                    playlistId=uploads_playlist_id,
+                    maxResults=50,
+                    pageToken=next_page_token
+                )
+                pages += 1
+
+                for item in playlist_response.get('items', []):
+                    video_id = item['contentDetails']['videoId']
+                    if video_id in known_ids:
+                        reached_known = True
+                        break
+                    new_ids.append(video_id)
+
+                next_page_token = playlist_response.get('nextPageToken')
+                if not next_page_token:
+                    break
+
+            video_parts = 'contentDetails,snippet'
+            if include_stats:
+                video_parts += ',statistics'
+                stats_dir = artifact_dir('stats', channel_slug)
+                make_artifact_dir(stats_dir)
+
+            # Detail calls for the new IDs run concurrently; results are read in page order
+            batches = [new_ids[i:i + MAX_IDS_PER_REQUEST] for i in range(0, len(new_ids), MAX_IDS_PER_REQUEST)]
+            responses = await asyncio.gather(*(
+                self._get_dated('videos.list', part=video_parts, id=','.join(batch)) for batch in batches
+            ))
+
+            new_videos = []
+            collected_stats = []
+            shorts_filtered = 0
+            for details, fetched_at in responses:
+                for video_item in details.get('items', []):
+                    video_data = self._build_video_data(video_item)
+                    if video_data['duration_seconds'] >= min_duration_seconds:
+                        new_videos.append(video_data)
+                        if include_stats and 'statistics' in video_item:
+                            collected_stats.append(self._build_engagement_data(
+                                video_item['id'], video_item['statistics'], fetched_at))
+                    else:
+                        shorts_filtered += 1
+
+            if collected_stats:
+                await asyncio.to_thread(self._save_stats_files, stats_dir, collected_stats)
+                await asyncio.to_thread(self._append_stats_history, channel_slug, collected_stats, new_videos)
+
+        except REQUEST_ERRORS as e:
+            logger.error(f"증분 동기화 실패, 기존 목록을 유지합니다: {e}")
+            return known_videos
+
+        logger.info(f"✓ 새 롱폼 비디오 {len(new_videos)}개 발견 "
+                    f"(플레이리스트 {pages}페이지, Shorts {shorts_filtered}개 제외)")
+
+        videos = new_videos + known_videos
+        videos.sort(key=lambda x: x['published_at'], reverse=True)
+        return videos
+
+    # ------------------------------------------------------------------
+    # Engagement stats
+    # ------------------------------------------------------------------
+
+    def fetch_all_video_stats(self, channel_slug: str, videos: List[Dict]):
+        """Fetch engagement stats for all videos, 50 IDs per concurrent videos.list call."""
+        return self._run(self._fetch_all_video_stats, channel_slug, videos)
+
+    def _save_stats_files(self, stats_dir: str, stats: List[Dict]):
+        """Write a batch of stats snapshots (called via asyncio.to_thread)."""
+        for item in stats:
+            self._save_video_stats(stats_dir, item)
+
+    async def _fetch_stats_batch(self, video_ids: List[str]) -> Dict[str, Dict]:
+        try:
+            # maxResults is not supported together with the id filter
+            response, fetched_at = await self._get_dated('videos.list', part='statistics', id=','.join(video_ids))
+        except REQUEST_ERRORS as e:
+            logger.error(f"✗ 비디오 {len(video_ids)}개 통계 가져오기 실패: {e}")
+            return {}
+        return {
+            item['id']: self._build_engagement_data(item['id'], item['statistics'], fetched_at)
+            for item in response.get('items', [])
+        }
+
+    async def _fetch_all_video_stats(self, channel_slug: str, videos: List[Dict]):
+        logger.info("비디오 참여도 통계 수집 중... (async)")
+
+        stats_dir = artifact_dir('stats', channel_slug)
+        make_artifact_dir(stats_dir)
+
+        video_ids = [video['video_id'] for video in videos]
+        batches = [video_ids[i:i + MAX_IDS_PER_REQUEST] for i in range(0, len(video_ids), MAX_IDS_PER_REQUEST)]
+        tasks = [asyncio.create_task(self._fetch_stats_batch(batch)) for batch in batches]
+
+        collected_stats = []
+        for done, task in enumerate(asyncio.as_completed(tasks), 1):
+            batch_stats = list((await task).values())
+            await asyncio.to_thread(self._save_stats_files, stats_dir, batch_stats)
+            collected_stats.extend(batch_stats)
+            if done % 10 == 0 or done == len(tasks):
+                logger.info(f"진행률: {done}/{len(tasks)} 배치 ({done*100//len(tasks)}%)")
+
+        await asyncio.to_thread(self._append_stats_history, channel_slug, collected_stats, videos)
+        logger.info(f"✓ 참여도 통계 {len(collected_stats)}개 수집 완료: {stats_dir}/")
+
+    # ------------------------------------------------------------------
+    # Comments
+    # ------------------------------------------------------------------
+
+    def fetch_video_comments(self, video_id: str) -> List[Dict]:
+        """Fetch comment records for a video, top-level comments followed by their replies."""
+        return self._run(self._fetch_video_comments, video_id)
+
+    async def _thread_replies_async(self, item: Dict) -> List[Dict]:
+        """Async counterpart of _thread_replies (inline set, paged only when truncated)."""
+        limit = self._reply_limit(item)
+        if limit == 0:
+            return []
+
+        inline = item.get('replies', {}).get('comments', [])
+        if len(inline) >= limit or self.reply_mode == 'inline':
+            return inline[:limit]
+
+        replies = []
+        page_token = None
+        try:
+            while len(replies) < limit:
+                response = await self._get('comments.list', part='snippet',
+                                           parentId=item['snippet']['topLevelComment']['id'],
+                                           maxResults=100, pageToken=page_token, textFormat='plainText')
+                replies.extend(response.get('items', []))
+
+                page_token = response.get('nextPageToken')
+                if not page_token:
+                    break
+        except REQUEST_ERRORS:
+            # Fall back to whatever came inline
+            return inline[:limit]
+
+        return replies[:limit]
+
+    async def _fetch_video_comments(self, video_id: str) -> List[Dict]:
+        checkpoint = await asyncio.to_thread(CrawlCheckpoint, f"comments_{video_id}")
+        comments = [upgrade(comment) for comment in checkpoint.items]
+        if checkpoint.exists:
+            logger.info(f"↻ 비디오 {video_id} 댓글 체크포인트에서 재개 ({len(comments)}개 수집된 상태)")
+
+        try:
+            next_page_token = checkpoint.page_token
+            while True:
+                response = await self._get(
+                    'commentThreads.list',
+                    part=self._thread_parts(),
+                    videoId=video_id,
+                    maxResults=100,
+                    pageToken=next_page_token,
+                    textFormat='plainText'
+                )
+
+                items = response.get('items', [])
+                reply_tasks = [asyncio.create_task(self._thread_replies_async(item)) for item in items]
+                for item, replies in zip(items, await asyncio.gather(*reply_tasks)):
+                    comments.extend(from_thread(item, replies))
+
+                next_page_token = response.get('nextPageToken')
+                if not next_page_token:
+                    break
+
+                await asyncio.to_thread(checkpoint.save, next_page_token, comments)
+
+            await asyncio.to_thread(checkpoint.clear)
+            logger.info(f"✓ 비디오 {video_id} 댓글 {len(comments)}개 수집 완료")
+
+        except REQUEST_ERRORS as e:
+            if 'commentsDisabled' in str(e):
+                await asyncio.to_thread(checkpoint.clear)
+                logger.warning(f"⚠ 비디오 {video_id} 댓글 비활성화됨")
+            else:
+                logger.error(f"✗ 비디오 {video_id} 댓글 가져오기 실패: {e}")
+
+        return comments
+
+    def fetch_all_comments(self, channel_slug: str, videos: List[Dict]):
+        """Fetch comments for all videos concurrently."""
+        return self._run(self._fetch_all_comments, channel_slug, videos)
+
+    def _save_collected_comments(self, comments_dir: str, video_id: str, comments: List[Dict]) -> bool:
+        """Save one video's comments (called via asyncio.to_thread).
+
+        Returns:
+            True if the thread listing finished (no leftover checkpoint)
+        """
+        self._save_video_comments(comments_dir, video_id, comments)
+        return not CrawlCheckpoint(f"comments_{video_id}").exists
+
+    async def _fetch_all_comments(self, channel_slug: str, videos: List[Dict]):
+        logger.info("비디오 댓글 수집 중... (async)")
+
+        comments_dir = artifact_dir('comments', channel_slug)
+        make_artifact_dir(comments_dir)
+
+        stage_checkpoint = await asyncio.to_thread(CrawlCheckpoint, f"comments_stage_{channel_slug}")
+        completed = set(stage_checkpoint.items)
+        if completed:
+            logger.info(f"↻ 댓글 단계 체크포인트에서 재개: {len(completed)}개 비디오 완료된 상태")
+
+        # Bound the number of videos in flight so partial results stay small
+        video_slots = asyncio.Semaphore(self.concurrency)
+
+        async def collect(video_id: str) -> str:
+            async with video_slots:
+                comments = await self._fetch_video_comments(video_id)
+            # Each file is written as soon as its video finishes; the JSON write,
+            # comment store and manifest updates run off the event loop
+            if await asyncio.to_thread(self._save_collected_comments, comments_dir, video_id, comments):
+                completed.add(video_id)
+            return video_id
+
+        remaining = [video['video_id'] for video in videos if video['video_id'] not in completed]
+        tasks = [asyncio.create_task(collect(video_id)) for video_id in remaining]
+        try:
+            for done, task in enumerate(asyncio.as_completed(tasks), 1):
+                await task
+                if done % STAGE_CHECKPOINT_INTERVAL == 0:
+                    await asyncio.to_thread(stage_checkpoint.save, None, sorted(completed))
+                logger.info(f"진행률: {done}/{len(remaining)} ({done*100//len(remaining)}%)")
+        except BaseException:
+            await asyncio.to_thread(stage_checkpoint.save, None, sorted(completed))
+            raise
+
+        await asyncio.to_thread(stage_checkpoint.clear)
+        logger.info(f"✓ 댓글 수집 완료: {comments_dir}/")
@@ -5,14 +5,20 @@ data/chimchakman_official_comments 디렉토리의 JSON 파일들을 검사하
 comments 필드가 비어있으면 YouTube API를 통해 댓글을 가져와서 채웁니다.
 """
 
-import json
 import os
 from pathlib import Path
-from typing import Dict, List
-from googleapiclient.discovery import build
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
 import time
 
+from artifact_manifest import ArtifactManifest
+from comment_schema import comments_document, from_resource
+from comment_store import CommentStore
+from compressed_storage import read_json, write_json
+from data_paths import artifact_dir, find_files
+from quota_ledger import QuotaExhaustedError, QuotaScheduler, load_api_keys
+from response_cache import ResponseCache
+
 # 환경변수 로드
 load_dotenv()
 
@@ -20,26 +26,31 @@ load_dotenv()
 class CommentBackfiller:
     """댓글 백필 클래스"""
     
-    def __init__(self, api_key: str, comments_dir: str = "data/chimchakman_official_comments"):
+    def __init__(self, api_key: str, comments_dir: str = artifact_dir('comments'),
+                 scheduler: Optional[QuotaScheduler] = None, comment_store: Optional[CommentStore] = None,
+                 manifest: Optional[ArtifactManifest] = None):
         """
         초기화
         
         Args:
-            api_key: YouTube Data API v3 키
+            api_key: YouTube Data API v3 키 (쉼표로 구분하면 여러 키)
             comments_dir: 댓글 JSON 파일들이 있는 디렉토리
+            scheduler: 쿼터 스케줄러 (기본값: api_key + YOUTUBE_API_KEYS 와 응답 캐시로 생성)
+            comment_store: 댓글 SQLite 저장소 (기본값: data/comments.db)
+            manifest: 산출물 목록 (기본값: data/artifacts.db)
         """
-        self.youtube = build('youtube', 'v3', developerKey=api_key)
+        self.scheduler = scheduler or QuotaScheduler(load_api_keys(api_key), cache=ResponseCache())
         self.comments_dir = Path(comments_dir)
+        self.comment_store = comment_store or CommentStore()
+        self.manifest = manifest or ArtifactManifest()
         
     def load_json_file(self, filepath: Path) -> Dict:
-        """JSON 파일 로드"""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        """JSON 파일 로드 (.zst 압축 파일도 투명하게 읽음)"""
+        return read_json(filepath)
     
-    def save_json_file(self, filepath: Path, data: Dict):
-        """JSON 파일 저장"""
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+    def save_json_file(self, filepath: Path, data: Dict) -> str:
+        """JSON 파일 저장 (STORAGE_COMPRESSION=zstd이면 .zst로 압축 저장)"""
+        return write_json(filepath, data, kind='comments')
     
     def get_comments(self, video_id: str, max_results: int = 100) -> List[Dict]:
         """
@@ -50,48 +61,37 @@ class CommentBackfiller:
             max_results: 최대 댓글 수
             
         Returns:
-            댓글 리스트
+            댓글 레코드 리스트 (comment_schema.FIELDS)
         """
         comments = []
         
         try:
-            request = self.youtube.commentThreads().list(
-                part="snippet",
-                videoId=video_id,
-                maxResults=min(max_results, 100),
-                order="relevance",
-                textFormat="plainText"
-            )
-            
-            while request and len(comments) < max_results:
-                response = request.execute()
+            page_token = None
+            
+            while len(comments) < max_results:
+                response = self.scheduler.execute('commentThreads.list', lambda yt: yt.commentThreads().list(
+                    part="snippet",
+                    videoId=video_id,
+                    maxResults=min(max_results - len(comments), 100),
+                    pageToken=page_token,
+                    order="relevance",
+                    textFormat="plainText"
+                ))
                 
                 for item in response['items']:
-                    snippet = item['snippet']['topLevelComment']['snippet']
-                    comment_data = {
-                        'author': snippet['authorDisplayName'],
-                        'text': snippet['textDisplay'],
-                        'likeCount': snippet['likeCount'],
-                        'publishedAt': snippet['publishedAt']
-                    }
-                    comments.append(comment_data)
+                    comments.append(from_resource(item['snippet']['topLevelComment']))
                 
                 # 다음 페이지가 있으면 계속
                 if 'nextPageToken' in response and len(comments) < max_results:
-                    request = self.youtube.commentThreads().list(
-                        part="snippet",
-                        videoId=video_id,
-                        maxResults=min(max_results - len(comments), 100),
-                        pageToken=response['nextPageToken'],
-                        order="relevance",
-                        textFormat="plainText"
-                    )
+                    page_token = response['nextPageToken']
                 else:
                     break
                     
                 # API rate limit 고려하여 잠시 대기
                 time.sleep(0.1)
                 
+        except QuotaExhaustedError:
+            raise
         except Exception as e:
             print(f"  ⚠️  댓글 가져오기 실패: {e}")
             
@@ -138,16 +138,19 @@ class CommentBackfiller:
             # 댓글 가져오기
             comments = self.get_comments(video_id)
             
-            # 데이터 업데이트
-            data['comments'] = comments
-            data['comment_count'] = len(comments)
+            # 데이터 업데이트 (통합 스키마)
+            data.update(comments_document(video_id, comments))
             
-            # 파일 저장
-            self.save_json_file(filepath, data)
+            # 파일 저장 (SQLite 저장소에도 반영)
+            saved_path = self.save_json_file(filepath, data)
+            self.comment_store.replace_video_comments(video_id, comments)
+            self.manifest.record(video_id, 'comments', saved_path, tool='backfill_comments')
             
             print(f"  ✅ 완료: {len(comments)}개 댓글 추가됨")
             return True
             
+        except QuotaExhaustedError:
+            raise
         except Exception as e:
             print(f"  ❌ 오류: {filepath.name} - {e}")
             return False
@@ -159,8 +162,8 @@ class CommentBackfiller:
             print(f"❌ 디렉토리를 찾을 수 없습니다: {self.comments_dir}")
             return
         
-        # JSON 파일 목록
-        json_files = list(self.comments_dir.glob("*.json"))
+        # JSON 파일 목록 (평면/샤딩 구조 모두)
+        json_files = list(find_files(str(self.comments_dir), "_comments.json").values())
         
         if not json_files:
             print(f"❌ JSON 파일을 찾을 수 없습니다: {self.comments_dir}")
@@ -172,10 +175,17 @@ class CommentBackfiller:
         skipped = 0
         failed = 0
         
+        print(f"🎫 오늘 남은 쿼터: {self.scheduler.remaining():,} units\n")
+        
         for filepath in json_files:
             print(f"📄 {filepath.name}")
             
-            result = self.backfill_file(filepath)
+            try:
+                result = self.backfill_file(filepath)
+            except QuotaExhaustedError as e:
+                print(f"  ⏸️  {e}")
+                print("  쿼터 리셋 후 다시 실행하면 남은 파일부터 이어서 백필합니다.\n")
+                break
             
             if result is True:
                 backfilled += 1
@@ -192,7 +202,11 @@ class CommentBackfiller:
         print(f"  ✅ 백필됨: {backfilled}개")
         print(f"  ⏭️  건너뜀: {skipped}개")
         print(f"  ❌ 실패: {failed}개")
-        print(f"  📊 총: {len(json_files)}개\n")
+        print(f"  📊 총: {len(json_files)}개")
+        print(f"  🎫 남은 쿼터: {self.scheduler.remaining():,} units")
+        if self.scheduler.cache:
+            print(f"  💾 {self.scheduler.cache.summary()}")
+        print()
 
 
 def main():
@@ -200,7 +214,7 @@ def main():
     
     # API 키 확인
     api_key = os.getenv('YOUTUBE_API_KEY')
-    if not api_key:
+    if not load_api_keys(api_key):
         print("❌ YOUTUBE_API_KEY 환경변수를 설정해주세요.")
         print("   .env 파일에 YOUTUBE_API_KEY=your_key_here 추가")
         return
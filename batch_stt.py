@@ -9,26 +9,44 @@
 import json
 import os
 import sys
+import queue
+import threading
 import argparse
 import psutil
 import gc
+import multiprocessing
+from collections import deque
 from pathlib import Path
 from concurrent.futures import ProcessPoolExecutor, as_completed
-from typing import List, Dict
+from typing import List, Dict, Optional
 import time
 import signal
 
 # stt_whisper 모듈 import
 try:
-    from stt_whisper import test_whisper_single_video
+    from stt_whisper import (AUDIO_CACHE_DIR, VIDEO_CATALOG, VIDEO_URL_TEMPLATE, download_audio, load_model,
+                             test_whisper_single_video, transcribe_audio)
 except ImportError:
     sys.path.insert(0, str(Path(__file__).parent))
     try:
-        from stt_whisper import test_whisper_single_video
+        from stt_whisper import (AUDIO_CACHE_DIR, VIDEO_CATALOG, VIDEO_URL_TEMPLATE, download_audio,
+                                 load_model, test_whisper_single_video, transcribe_audio)
     except ImportError:
         print("❌ stt_whisper.py를 찾을 수 없습니다.")
         sys.exit(1)
 
+from artifact_manifest import ArtifactManifest
+from compressed_storage import set_compression
+from data_paths import DEFAULT_CHANNEL_SLUG, artifact_dir, channel_path, make_artifact_dir
+from stt_backends import BACKENDS, DEFAULT_BACKEND
+
+# 상주 워커가 모델 로드 직후보다 이만큼(MB) 더 커지면 교체 (메모리 누수 방지)
+DEFAULT_MAX_RSS_GROWTH_MB = 1024
+
+# 오디오 미리 받기: 다운로드 스레드 수, 아직 변환 안 된 오디오가 차지할 수 있는 디스크 (MB)
+DEFAULT_DOWNLOAD_WORKERS = 4
+DEFAULT_DISK_BUDGET_MB = 2048
+
 
 def get_memory_usage():
     """현재 메모리 사용량 조회"""
@@ -42,26 +60,24 @@ def get_memory_usage():
     }
 
 
-def process_video_wrapper(video_id: str, model_size: str, output_dir: Path) -> Dict:
+def process_video_wrapper(video_id: str, model_size: str, output_dir: Path, audio: Optional[Dict] = None,
+                          url_template: str = VIDEO_URL_TEMPLATE, catalog_path: str = VIDEO_CATALOG,
+                          backend: str = DEFAULT_BACKEND, use_vad: bool = False) -> Dict:
     """
     프로세스 풀에서 실행될 wrapper 함수
     메모리 관리와 예외 처리 강화
+    (이미 처리된 비디오는 process_batch 에서 산출물 목록으로 걸러짐)
+    
+    audio(AudioPrefetcher가 받아 둔 오디오 정보)가 있으면 변환만 하고,
+    없으면 다운로드부터 직접 수행
     """
     result = {
         'video_id': video_id,
         'success': False,
         'error': None,
-        'duration': 0,
-        'skipped': False
+        'duration': 0
     }
     
-    # 이미 처리된 경우
-    output_file = output_dir / f"{video_id}_whisper_transcript.txt"
-    if output_file.exists():
-        result['success'] = True
-        result['skipped'] = True
-        return result
-    
     start_time = time.time()
     
     try:
@@ -75,11 +91,31 @@ def process_video_wrapper(video_id: str, model_size: str, output_dir: Path) -> D
         gc.collect()
         
         # 실제 처리
-        success = test_whisper_single_video(
-            video_id=video_id,
-            model_size=model_size,
-            output_dir=output_dir
-        )
+        if audio is not None:
+            saved = transcribe_audio(
+                video_id=video_id,
+                audio_path=audio['audio_path'],
+                model_size=model_size,
+                output_dir=output_dir,
+                title=audio['title'],
+                verbose=False,
+                backend=backend,
+                use_vad=use_vad
+            )
+            success = saved is not None
+            if success and 'vad' in saved[1]:
+                result['audio_seconds'] = saved[1]['vad']['audio_seconds']
+                result['skipped_seconds'] = saved[1]['vad']['skipped_seconds']
+        else:
+            success = test_whisper_single_video(
+                video_id=video_id,
+                model_size=model_size,
+                output_dir=output_dir,
+                url_template=url_template,
+                catalog_path=catalog_path,
+                backend=backend,
+                use_vad=use_vad
+            )
         
         result['duration'] = time.time() - start_time
         result['success'] = success
@@ -100,16 +136,330 @@ def process_video_wrapper(video_id: str, model_size: str, output_dir: Path) -> D
     return result
 
 
+def persistent_worker(slot: int, inbox, results, model_size: str, output_dir: str, max_rss_growth_mb: float,
+                      backend: str = DEFAULT_BACKEND, cpu_threads: int = 0, use_vad: bool = False):
+    """
+    상주 워커 프로세스 본체
+    
+    시작할 때 모델을 한 번 로드하고, inbox에서 받아 둔 오디오(task)를 받아 변환
+    처리 후 RSS가 모델 로드 직후보다 max_rss_growth_mb 이상 커졌으면
+    결과와 함께 교체 요청을 보내고 종료 (작업 수가 아니라 실측 메모리 기준)
+    cpu_threads는 워커끼리 코어를 나눠 쓰도록 워커당 추론 스레드 수를 제한
+    """
+    # Ctrl+C는 부모가 처리 (워커는 진행 중인 비디오를 끝까지 처리)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    
+    start_time = time.time()
+    try:
+        load_model(model_size, backend, cpu_threads)
+    except Exception as e:
+        results.put({'slot': slot, 'event': 'failed', 'error': f"모델 로드 실패: {e}"})
+        return
+    
+    baseline_mb = get_memory_usage()['process_mb']
+    results.put({
+        'slot': slot,
+        'event': 'ready',
+        'pid': os.getpid(),
+        'load_seconds': time.time() - start_time,
+        'rss_mb': baseline_mb
+    })
+    
+    while True:
+        task = inbox.get()
+        if task is None:
+            break
+        
+        result = process_video_wrapper(task['video_id'], model_size, Path(output_dir), audio=task,
+                                       backend=backend, use_vad=use_vad)
+        rss_mb = get_memory_usage()['process_mb']
+        result['rss_mb'] = rss_mb
+        recycle = rss_mb - baseline_mb > max_rss_growth_mb
+        results.put({'slot': slot, 'event': 'done', 'result': result, 'recycle': recycle})
+        if recycle:
+            break
+
+
+class PersistentWhisperPool:
+    """
+    모델을 프로세스당 한 번만 로드하는 워커 풀
+    
+    ProcessPoolExecutor(max_tasks_per_child)는 워커를 작업 수 기준으로 교체해
+    그때마다 체크포인트를 다시 읽으므로, 워커별 전용 큐로 작업을 배분하고
+    RSS 증가량을 넘긴 워커만 골라 새 프로세스로 교체
+    (어느 워커가 어떤 비디오를 처리 중인지 알고 있어, 워커가 죽어도 해당 비디오만 실패 처리)
+    """
+    
+    def __init__(self, max_workers: int, model_size: str, output_dir: Path,
+                 max_rss_growth_mb: float = DEFAULT_MAX_RSS_GROWTH_MB, backend: str = DEFAULT_BACKEND,
+                 use_vad: bool = False):
+        self.model_size = model_size
+        self.backend = backend
+        self.use_vad = use_vad
+        # 워커들이 코어를 나눠 쓰도록 워커당 추론 스레드 제한
+        self.cpu_threads = max(1, (os.cpu_count() or 1) // max_workers)
+        self.output_dir = str(output_dir)
+        self.max_rss_growth_mb = max_rss_growth_mb
+        self.max_workers = max_workers
+        # fork는 audio-download 스레드가 잡고 있던 락까지 복사해 교체된 워커가 멈출 수 있으므로 spawn 사용
+        self.context = multiprocessing.get_context('spawn')
+        self.results = self.context.Queue()
+        self.workers = {}   # slot -> (process, inbox), 교체 대기 중인 슬롯은 없음
+        self.busy = {}      # slot -> video_id
+        self.loaded = set()  # 모델 로드를 마친 슬롯
+        self.loads = 0
+        self.load_seconds = 0.0
+        self.recycled = 0
+        for slot in range(max_workers):
+            self._spawn(slot)
+    
+    def _spawn(self, slot: int):
+        """슬롯에 새 워커 프로세스 시작"""
+        inbox = self.context.Queue()
+        process = self.context.Process(
+            target=persistent_worker,
+            args=(slot, inbox, self.results, self.model_size, self.output_dir, self.max_rss_growth_mb,
+                  self.backend, self.cpu_threads, self.use_vad),
+            daemon=True
+        )
+        process.start()
+        self.workers[slot] = (process, inbox)
+    
+    def _retire(self, slot: int):
+        """종료된(또는 종료 중인) 워커 정리 (새 워커는 다음 작업이 배정될 때 시작)"""
+        process, _ = self.workers.pop(slot)
+        self.loaded.discard(slot)
+        process.join(timeout=30)
+        if process.is_alive():
+            process.terminate()
+    
+    @property
+    def idle(self) -> int:
+        """작업을 받을 수 있는 워커 수"""
+        return self.max_workers - len(self.busy)
+    
+    @property
+    def waiting(self) -> int:
+        """모델 로드를 마치고 작업 없이 쉬고 있는 워커 수"""
+        return len(self.loaded - set(self.busy))
+    
+    def submit(self, task: Dict) -> bool:
+        """쉬고 있는 워커에 받아 둔 오디오 배정 (없으면 False)"""
+        for slot in range(self.max_workers):
+            if slot not in self.busy:
+                if slot not in self.workers:
+                    self._spawn(slot)
+                self.workers[slot][1].put(task)
+                self.busy[slot] = task['video_id']
+                return True
+        return False
+    
+    def next_result(self, timeout: float = 1.0) -> Optional[Dict]:
+        """
+        완료된 비디오 결과 하나 (timeout 동안 없으면 None)
+        
+        Raises:
+            RuntimeError: 워커가 모델을 로드하지 못함
+        """
+        try:
+            message = self.results.get(timeout=timeout)
+        except queue.Empty:
+            return self._check_dead_workers()
+        
+        slot = message['slot']
+        if message['event'] == 'failed':
+            raise RuntimeError(message['error'])
+        if message['event'] == 'ready':
+            self.loads += 1
+            self.load_seconds += message['load_seconds']
+            self.loaded.add(slot)
+            print(f"  🧠 워커 {slot} 준비 (pid {message['pid']}, 모델 로드 {message['load_seconds']:.1f}초, "
+                  f"{message['rss_mb']:.0f}MB)")
+            return None
+        
+        self.busy.pop(slot, None)
+        if message['recycle']:
+            self.recycled += 1
+            print(f"  ♻️  워커 {slot} 교체: 메모리 {message['result']['rss_mb']:.0f}MB "
+                  f"(로드 직후 대비 +{self.max_rss_growth_mb:.0f}MB 초과)")
+            self._retire(slot)
+        return message['result']
+    
+    def _check_dead_workers(self) -> Optional[Dict]:
+        """비정상 종료된 워커(OOM kill 등)를 교체하고 처리 중이던 비디오를 실패로 반환"""
+        for slot, (process, _) in list(self.workers.items()):
+            if process.is_alive():
+                continue
+            video_id = self.busy.pop(slot, None)
+            exitcode = process.exitcode
+            self._retire(slot)
+            if video_id is not None:
+                return {
+                    'video_id': video_id,
+                    'success': False,
+                    'error': f"워커 비정상 종료 (exit code {exitcode})",
+                    'duration': 0
+                }
+        return None
+    
+    def close(self) -> List[Dict]:
+        """
+        워커 종료 (진행 중인 비디오는 끝까지 처리한 뒤 종료)
+        
+        Returns:
+            종료를 기다리는 동안 끝난 비디오 결과 (호출한 쪽에서 집계)
+        """
+        for _, inbox in self.workers.values():
+            inbox.put(None)
+        results = []
+        
+        def collect(message: Dict):
+            if message['event'] == 'ready':
+                self.loads += 1
+                self.load_seconds += message['load_seconds']
+            elif message['event'] == 'done':
+                self.busy.pop(message['slot'], None)
+                results.append(message['result'])
+        
+        # 결과 큐를 비워 줘야 워커가 종료될 수 있음
+        while any(process.is_alive() for process, _ in self.workers.values()):
+            try:
+                collect(self.results.get(timeout=1))
+            except queue.Empty:
+                continue
+        for process, _ in self.workers.values():
+            process.join()
+        # 워커가 끝나기 직전에 넣은 메시지
+        while True:
+            try:
+                collect(self.results.get(timeout=0.1))
+            except queue.Empty:
+                break
+        return results
+
+
+class AudioPrefetcher:
+    """
+    오디오를 미리 받아 두는 다운로드 스레드 풀 (생산자)
+    
+    Whisper 워커(소비자)가 네트워크를 기다리지 않도록 다운로드 스레드가
+    순서대로 오디오를 받아 ready 큐에 넣고, 워커는 받아 둔 파일만 변환
+    아직 변환되지 않은 오디오 크기 합이 disk_budget_mb 이상이면
+    release()로 공간이 생길 때까지 새 다운로드를 시작하지 않음
+    (캐시에 원래 있던 파일은 새로 디스크를 쓰지 않으므로 예산에 넣지 않음)
+    """
+    
+    def __init__(self, video_ids: List[str], download_workers: int = DEFAULT_DOWNLOAD_WORKERS,
+                 disk_budget_mb: float = DEFAULT_DISK_BUDGET_MB, url_template: str = VIDEO_URL_TEMPLATE,
+                 audio_dir: Path = AUDIO_CACHE_DIR, catalog_path: str = VIDEO_CATALOG):
+        self.url_template = url_template
+        self.catalog_path = str(catalog_path)
+        self.audio_dir = Path(audio_dir)
+        self.budget_bytes = disk_budget_mb * 1024 * 1024
+        self.pending = deque(video_ids)
+        self.ready = queue.Queue()
+        self.condition = threading.Condition()
+        self.sizes = {}              # video_id -> 예산에 넣은 바이트 수
+        self.pending_bytes = 0       # 받았지만 아직 변환되지 않은 오디오 크기 합
+        self.outstanding = len(video_ids)  # 아직 ready 큐에 들어가지 않은 비디오 수
+        self.downloaded = 0
+        self.download_seconds = 0.0
+        self.budget_waits = 0
+        self.stopped = False
+        self.threads = [
+            threading.Thread(target=self._download_loop, name=f"audio-download-{i}", daemon=True)
+            for i in range(min(download_workers, len(video_ids)))
+        ]
+        for thread in self.threads:
+            thread.start()
+    
+    def _next_video_id(self) -> Optional[str]:
+        """다음에 받을 비디오 (디스크 예산이 찰 때까지 대기, 남은 게 없거나 중지되면 None)"""
+        with self.condition:
+            waited = False
+            while not self.stopped and self.pending and self.pending_bytes >= self.budget_bytes:
+                waited = True
+                self.condition.wait()
+            if waited:
+                self.budget_waits += 1
+            if self.stopped or not self.pending:
+                return None
+            return self.pending.popleft()
+    
+    def _download_loop(self):
+        """다운로드 스레드 본체"""
+        while True:
+            video_id = self._next_video_id()
+            if video_id is None:
+                return
+            
+            start_time = time.time()
+            try:
+                audio = download_audio(video_id, self.audio_dir, self.url_template,
+                                       catalog_path=self.catalog_path, verbose=False)
+            except Exception as e:
+                print(f"❌ 다운로드 실패: {video_id} - {e}")
+                audio = None
+            
+            with self.condition:
+                if audio is None:
+                    task = {'video_id': video_id, 'error': "오디오 다운로드 실패"}
+                else:
+                    task = audio
+                    size = 0 if audio['cached'] else os.path.getsize(audio['audio_path'])
+                    self.sizes[video_id] = size
+                    self.pending_bytes += size
+                    if not audio['cached']:
+                        self.downloaded += 1
+                        self.download_seconds += time.time() - start_time
+                self.ready.put(task)
+                self.outstanding -= 1
+    
+    def get(self) -> Optional[Dict]:
+        """받아 둔 오디오 하나 (없으면 바로 None, 실패한 비디오는 'error' 키 포함)"""
+        try:
+            return self.ready.get_nowait()
+        except queue.Empty:
+            return None
+    
+    @property
+    def starved(self) -> bool:
+        """받아 둔 오디오가 없는데 아직 다운로드할(또는 받는 중인) 비디오가 남아 있는지"""
+        return self.ready.empty() and self.outstanding > 0
+    
+    def release(self, video_id: str):
+        """변환이 끝난 오디오를 예산에서 제외 (파일은 캐시로 남김)"""
+        with self.condition:
+            self.pending_bytes -= self.sizes.pop(video_id, 0)
+            self.condition.notify_all()
+    
+    def stop(self):
+        """새 다운로드를 멈추고 진행 중인 다운로드가 끝날 때까지 대기"""
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+        for thread in self.threads:
+            thread.join()
+
+
 class BatchWhisperProcessor:
     """배치 Whisper 처리기 (개선 버전)"""
     
     def __init__(
         self, 
-        videos_json: str = "data/chimchakman_official_videos.json",
-        output_dir: str = "data/chimchakman_official_transcripts",
+        videos_json: str = channel_path(DEFAULT_CHANNEL_SLUG, "videos.json"),
+        output_dir: str = artifact_dir("transcript"),
         model_size: str = "base",
+        backend: str = DEFAULT_BACKEND,
+        use_vad: bool = False,
         max_workers: int = 2,
-        memory_threshold: float = 85.0
+        memory_threshold: float = 85.0,
+        worker_mode: str = "persistent",
+        max_rss_growth_mb: float = DEFAULT_MAX_RSS_GROWTH_MB,
+        download_workers: int = DEFAULT_DOWNLOAD_WORKERS,
+        disk_budget_mb: float = DEFAULT_DISK_BUDGET_MB,
+        url_template: str = VIDEO_URL_TEMPLATE
     ):
         """
         초기화
@@ -118,18 +468,32 @@ class BatchWhisperProcessor:
             videos_json: 비디오 목록 JSON 파일
             output_dir: 출력 디렉토리
             model_size: Whisper 모델 크기
+            backend: STT 백엔드 (openai-whisper, faster-whisper)
+            use_vad: 음성 구간만 변환 (무음/음악/게임 소리 구간 건너뜀)
             max_workers: 최대 병렬 프로세스 수
             memory_threshold: 메모리 임계값 (%)
+            worker_mode: 'persistent' (워커당 모델 1회 로드) 또는 'per-task' (비디오마다 로드, 5개마다 워커 교체)
+            max_rss_growth_mb: persistent 모드에서 워커를 교체할 RSS 증가량 (MB)
+            download_workers: persistent 모드에서 오디오를 미리 받는 다운로드 스레드 수
+            disk_budget_mb: 받아 두고 아직 변환하지 않은 오디오의 최대 크기 합 (MB)
+            url_template: 오디오 다운로드 URL 형식 ({video_id} 치환, 로컬 테스트 서버 지정 가능)
         """
         self.videos_json = Path(videos_json)
         self.output_dir = Path(output_dir)
         self.model_size = model_size
+        self.backend = backend
+        self.use_vad = use_vad
         self.max_workers = max_workers
         self.memory_threshold = memory_threshold
+        self.worker_mode = worker_mode
+        self.max_rss_growth_mb = max_rss_growth_mb
+        self.download_workers = download_workers
+        self.disk_budget_mb = disk_budget_mb
+        self.url_template = url_template
         self.shutdown_requested = False
         
         # 출력 디렉토리 생성
-        self.output_dir.mkdir(parents=True, exist_ok=True)
+        make_artifact_dir(str(self.output_dir))
         
         # 시그널 핸들러 등록
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -177,6 +541,15 @@ class BatchWhisperProcessor:
             print(f"❌ 파일 로드 오류: {e}")
             return []
     
+    def transcribed_video_ids(self) -> set:
+        """산출물 목록에서 출력 디렉토리(샤드 포함)에 자막이 있는 video_id 집합 조회"""
+        with ArtifactManifest() as manifest:
+            manifest.ensure_scanned('transcript')
+            return {
+                row['video_id'] for row in manifest.select('transcript')
+                if Path(row['path']).is_relative_to(self.output_dir)
+            }
+    
     def check_system_resources(self) -> bool:
         """시스템 리소스 체크"""
         mem = get_memory_usage()
@@ -188,6 +561,182 @@ class BatchWhisperProcessor:
         
         return True
     
+    def _report_result(self, result: Dict, completed: int, total: int, stats: Dict):
+        """비디오 하나의 결과를 통계에 반영하고 출력"""
+        video_id = result['video_id']
+        progress = f"[{completed}/{total}]"
+        
+        if 'skipped_seconds' in result:
+            stats['audio_seconds'] = stats.get('audio_seconds', 0) + result['audio_seconds']
+            stats['vad_skipped_seconds'] = stats.get('vad_skipped_seconds', 0) + result['skipped_seconds']
+        
+        if result['success']:
+            stats['success'] += 1
+            print(f"{progress} ✅ 완료: {video_id} ({result['duration']:.1f}초)")
+        else:
+            stats['failed'] += 1
+            error_msg = result.get('error', 'Unknown error')
+            stats['errors'].append({
+                'video_id': video_id,
+                'error': error_msg
+            })
+            print(f"{progress} ❌ 실패: {video_id} - {error_msg}")
+        
+        # 리소스 체크
+        if completed % 5 == 0:  # 5개마다 체크
+            mem = get_memory_usage()
+            if mem['system_percent'] > self.memory_threshold:
+                stats['memory_warnings'] += 1
+                print(f"\n⚠️  메모리 높음: {mem['system_percent']:.1f}% - 잠시 대기...")
+                time.sleep(10)  # 10초 대기
+                gc.collect()
+    
+    def _run_persistent(self, video_ids: List[str], stats: Dict) -> int:
+        """
+        다운로드/변환 파이프라인으로 처리
+        
+        다운로드 스레드(AudioPrefetcher)가 오디오를 미리 받아 두고,
+        상주 워커(워커당 모델 1회 로드, RSS 증가 시에만 교체)는 받아 둔 파일만 변환
+        
+        Returns:
+            처리한 비디오 수
+        """
+        prefetcher = AudioPrefetcher(video_ids, self.download_workers, self.disk_budget_mb, self.url_template,
+                                     catalog_path=self.videos_json)
+        pool = PersistentWhisperPool(self.max_workers, self.model_size, self.output_dir, self.max_rss_growth_mb,
+                                     self.backend, self.use_vad)
+        completed = 0
+        audio_wait = 0.0
+        
+        try:
+            while not self.shutdown_requested and completed < len(video_ids):
+                # 받아 둔 오디오를 쉬는 워커에 배정 (메모리 여유가 있을 때만)
+                while pool.idle and not prefetcher.ready.empty() and self.check_system_resources():
+                    task = prefetcher.get()
+                    if 'error' in task:
+                        completed += 1
+                        self._report_result({**task, 'success': False, 'duration': 0},
+                                            completed, len(video_ids), stats)
+                    else:
+                        pool.submit(task)
+                
+                # 모델이 준비된 워커가 오디오를 기다리는 시간 (다운로드가 변환보다 느린지 확인용)
+                waiting = pool.waiting if prefetcher.starved else 0
+                wait_start = time.time()
+                result = pool.next_result(timeout=0.2)
+                audio_wait += waiting * (time.time() - wait_start)
+                if result is None:
+                    continue
+                prefetcher.release(result['video_id'])
+                completed += 1
+                self._report_result(result, completed, len(video_ids), stats)
+            
+            if self.shutdown_requested:
+                print("\n⚠️  진행 중인 다운로드와 비디오를 마치고 종료합니다...")
+        finally:
+            prefetcher.stop()
+            # 종료 요청(Ctrl+C) 시점에 변환 중이던 비디오 결과도 집계
+            for result in pool.close():
+                prefetcher.release(result['video_id'])
+                completed += 1
+                self._report_result(result, completed, len(video_ids), stats)
+        
+        stats['model_loads'] = pool.loads
+        stats['model_load_seconds'] = pool.load_seconds
+        stats['workers_recycled'] = pool.recycled
+        stats['audio_downloads'] = prefetcher.downloaded
+        stats['download_seconds'] = prefetcher.download_seconds
+        stats['audio_wait_seconds'] = audio_wait
+        stats['budget_waits'] = prefetcher.budget_waits
+        return completed
+    
+    def _run_per_task(self, video_ids: List[str], stats: Dict) -> int:
+        """
+        비디오마다 모델을 로드하는 기존 방식 (워커는 5개 작업마다 교체)
+        
+        Returns:
+            처리한 비디오 수
+        """
+        completed = 0
+        
+        # ProcessPoolExecutor에 명시적으로 maxtasksperchild 설정
+        # 각 워커가 N개 작업 후 재시작 (메모리 누수 방지)
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            max_tasks_per_child=5  # Python 3.11+에서 지원
+        ) as executor:
+            
+            # 작업 제출 (한 번에 모두 제출하지 않고 제어)
+            pending_videos = list(video_ids)
+            active_futures = {}
+            
+            # 초기 배치 제출
+            initial_batch = min(self.max_workers * 2, len(pending_videos))
+            for _ in range(initial_batch):
+                if pending_videos and not self.shutdown_requested:
+                    video_id = pending_videos.pop(0)
+                    future = executor.submit(
+                        process_video_wrapper,
+                        video_id,
+                        self.model_size,
+                        self.output_dir,
+                        None,
+                        self.url_template,
+                        str(self.videos_json),
+                        self.backend,
+                        self.use_vad
+                    )
+                    active_futures[future] = video_id
+            
+            # 결과 수집 및 새 작업 제출
+            while active_futures and not self.shutdown_requested:
+                # 완료된 작업 찾기
+                done_futures = [f for f in active_futures if f.done()]
+                
+                for future in done_futures:
+                    video_id = active_futures.pop(future)
+                    completed += 1
+                    
+                    try:
+                        result = future.result(timeout=1)
+                        self._report_result(result, completed, len(video_ids), stats)
+                        
+                        # 새 작업 제출
+                        if pending_videos and self.check_system_resources():
+                            video_id = pending_videos.pop(0)
+                            future = executor.submit(
+                                process_video_wrapper,
+                                video_id,
+                                self.model_size,
+                                self.output_dir,
+                                None,
+                                self.url_template,
+                                str(self.videos_json),
+                                self.backend,
+                                self.use_vad
+                            )
+                            active_futures[future] = video_id
+                    
+                    except Exception as e:
+                        stats['failed'] += 1
+                        stats['errors'].append({
+                            'video_id': video_id,
+                            'error': str(e)
+                        })
+                        print(f"❌ 예외: {video_id} - {e}")
+                
+                # CPU 과부하 방지
+                if active_futures:
+                    time.sleep(0.1)
+            
+            # 종료 요청 시 남은 작업 취소
+            if self.shutdown_requested:
+                print("\n⚠️  남은 작업 취소 중...")
+                for future in active_futures:
+                    future.cancel()
+        
+        return completed
+    
     def process_batch(self, video_ids: List[str] = None) -> Dict:
         """
         배치 처리 (병렬, 리소스 모니터링 포함)
@@ -205,6 +754,13 @@ class BatchWhisperProcessor:
             print("❌ 처리할 비디오가 없습니다.")
             return {}
         
+        # 이미 처리된 비디오는 산출물 목록 한 번 조회로 제외 (파일마다 stat 하지 않음)
+        done = self.transcribed_video_ids()
+        skipped = [video_id for video_id in video_ids if video_id in done]
+        video_ids = [video_id for video_id in video_ids if video_id not in done]
+        if skipped:
+            print(f"⏭️  이미 자막 있음: {len(skipped)}개 건너뜀")
+        
         # 시스템 정보 출력
         mem = get_memory_usage()
         cpu_count = psutil.cpu_count(logical=False)
@@ -213,8 +769,10 @@ class BatchWhisperProcessor:
         print(f"🚀 배치 Whisper 처리 시작")
         print("="*80)
         print(f"  총 비디오: {len(video_ids)}개")
-        print(f"  병렬 워커: {self.max_workers}개")
-        print(f"  모델: whisper-{self.model_size}")
+        print(f"  병렬 워커: {self.max_workers}개 ({self.worker_mode})")
+        if self.worker_mode == "persistent":
+            print(f"  다운로드: 스레드 {self.download_workers}개, 디스크 예산 {self.disk_budget_mb:.0f}MB")
+        print(f"  모델: whisper-{self.model_size} ({self.backend}{', VAD' if self.use_vad else ''})")
         print(f"  출력: {self.output_dir}")
         print(f"\n💻 시스템 정보:")
         print(f"  CPU 코어: {cpu_count}개")
@@ -224,119 +782,32 @@ class BatchWhisperProcessor:
         
         # 통계 초기화
         stats = {
-            'total': len(video_ids),
+            'total': len(video_ids) + len(skipped),
             'success': 0,
             'failed': 0,
-            'skipped': 0,
+            'skipped': len(skipped),
             'errors': [],
             'memory_warnings': 0
         }
         
         start_time = time.time()
-        completed = 0
         
-        # 병렬 처리
         try:
-            # ProcessPoolExecutor에 명시적으로 maxtasksperchild 설정
-            # 각 워커가 N개 작업 후 재시작 (메모리 누수 방지)
-            with ProcessPoolExecutor(
-                max_workers=self.max_workers,
-                max_tasks_per_child=5  # Python 3.11+에서 지원
-            ) as executor:
-                
-                # 작업 제출 (한 번에 모두 제출하지 않고 제어)
-                pending_videos = list(video_ids)
-                active_futures = {}
-                
-                # 초기 배치 제출
-                initial_batch = min(self.max_workers * 2, len(pending_videos))
-                for _ in range(initial_batch):
-                    if pending_videos and not self.shutdown_requested:
-                        video_id = pending_videos.pop(0)
-                        future = executor.submit(
-                            process_video_wrapper,
-                            video_id,
-                            self.model_size,
-                            self.output_dir
-                        )
-                        active_futures[future] = video_id
-                
-                # 결과 수집 및 새 작업 제출
-                while active_futures and not self.shutdown_requested:
-                    # 완료된 작업 찾기
-                    done_futures = [f for f in active_futures if f.done()]
-                    
-                    for future in done_futures:
-                        video_id = active_futures.pop(future)
-                        completed += 1
-                        
-                        try:
-                            result = future.result(timeout=1)
-                            
-                            # 진행률 표시
-                            progress = f"[{completed}/{len(video_ids)}]"
-                            
-                            if result.get('skipped'):
-                                stats['skipped'] += 1
-                                print(f"{progress} ⏭️  건너뜀: {video_id}")
-                            elif result['success']:
-                                stats['success'] += 1
-                                print(f"{progress} ✅ 완료: {video_id} ({result['duration']:.1f}초)")
-                            else:
-                                stats['failed'] += 1
-                                error_msg = result.get('error', 'Unknown error')
-                                stats['errors'].append({
-                                    'video_id': video_id,
-                                    'error': error_msg
-                                })
-                                print(f"{progress} ❌ 실패: {video_id} - {error_msg}")
-                            
-                            # 리소스 체크
-                            if completed % 5 == 0:  # 5개마다 체크
-                                mem = get_memory_usage()
-                                if mem['system_percent'] > self.memory_threshold:
-                                    stats['memory_warnings'] += 1
-                                    print(f"\n⚠️  메모리 높음: {mem['system_percent']:.1f}% - 잠시 대기...")
-                                    time.sleep(10)  # 10초 대기
-                                    gc.collect()
-                            
-                            # 새 작업 제출
-                            if pending_videos and self.check_system_resources():
-                                video_id = pending_videos.pop(0)
-                                future = executor.submit(
-                                    process_video_wrapper,
-                                    video_id,
-                                    self.model_size,
-                                    self.output_dir
-                                )
-                                active_futures[future] = video_id
-                        
-                        except Exception as e:
-                            stats['failed'] += 1
-                            stats['errors'].append({
-                                'video_id': video_id,
-                                'error': str(e)
-                            })
-                            print(f"❌ 예외: {video_id} - {e}")
-                    
-                    # CPU 과부하 방지
-                    if active_futures:
-                        time.sleep(0.1)
-                
-                # 종료 요청 시 남은 작업 취소
-                if self.shutdown_requested:
-                    print("\n⚠️  남은 작업 취소 중...")
-                    for future in active_futures:
-                        future.cancel()
+            if self.worker_mode == "persistent":
+                completed = self._run_persistent(video_ids, stats)
+            else:
+                completed = self._run_per_task(video_ids, stats)
         
         except KeyboardInterrupt:
             print("\n\n⚠️  사용자가 중단했습니다.")
             self.shutdown_requested = True
+            completed = stats['success'] + stats['failed']
         
         except Exception as e:
             print(f"\n❌ 치명적 오류: {e}")
             import traceback
             traceback.print_exc()
+            completed = stats['success'] + stats['failed']
         
         # 최종 통계
         total_time = time.time() - start_time
@@ -353,6 +824,16 @@ class BatchWhisperProcessor:
             print(f"  ⚡ 평균 속도: {total_time/completed:.1f}초/비디오")
         if stats['memory_warnings'] > 0:
             print(f"  ⚠️  메모리 경고: {stats['memory_warnings']}회")
+        if 'model_loads' in stats:
+            print(f"  🧠 모델 로드: {stats['model_loads']}회 ({stats['model_load_seconds']:.1f}초), "
+                  f"워커 교체: {stats['workers_recycled']}회")
+        if 'audio_downloads' in stats:
+            print(f"  📥 오디오 다운로드: {stats['audio_downloads']}개 ({stats['download_seconds']:.1f}초), "
+                  f"워커 오디오 대기: {stats['audio_wait_seconds']:.1f}초, "
+                  f"디스크 예산 대기: {stats['budget_waits']}회")
+        if stats.get('audio_seconds'):
+            print(f"  🔇 VAD: 오디오 {stats['audio_seconds'] / 3600:.1f}시간 중 "
+                  f"{stats['vad_skipped_seconds'] / stats['audio_seconds']:.0%} 건너뜀")
         
         if stats['failed'] > 0:
             print(f"\n❌ 실패한 비디오 ({stats['failed']}개):")
@@ -383,18 +864,59 @@ def main():
   
   # 작은 모델로 더 많은 워커
   python batch_whisper.py --model tiny --workers 8
+  
+  # CTranslate2 int8 백엔드 (pip install faster-whisper, 속도는 stt_backends.py로 측정)
+  python batch_whisper.py --backend faster-whisper --workers 4
+  
+  # 음성 구간만 변환 (인트로 음악/무음/게임 소리 건너뜀)
+  python batch_whisper.py --backend faster-whisper --vad
+  
+  # 워커가 모델 로드 직후보다 2GB 이상 커지면 교체
+  python batch_whisper.py --max-rss-growth 2048
+  
+  # 기존 방식 (비디오마다 모델 로드)
+  python batch_whisper.py --worker-mode per-task
+  
+  # 다운로드 스레드 8개, 받아 둔 오디오는 최대 4GB
+  python batch_whisper.py --download-workers 8 --disk-budget 4096
+  
+  # 로컬 테스트 서버의 오디오로 실행 (네트워크/YouTube 없이 파이프라인 확인)
+  python -m http.server 8000 --directory fixtures/audio &
+  python batch_whisper.py --videos fixtures/audio/videos.json --source-url "http://localhost:8000/{video_id}.wav"
+  
+  # 위 과정을 자동으로 실행하고 결과 확인 (임시 디렉토리 사용)
+  python stt_pipeline_check.py
         """
     )
     
-    parser.add_argument('--videos', default='data/chimchakman_official_videos.json')
-    parser.add_argument('--output-dir', default='data/chimchakman_official_transcripts')
+    parser.add_argument('--videos', default=channel_path(DEFAULT_CHANNEL_SLUG, "videos.json"))
+    parser.add_argument('--output-dir', default=artifact_dir('transcript'))
     parser.add_argument('--model', choices=['tiny', 'base', 'small', 'medium', 'large'], default='base')
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default=DEFAULT_BACKEND,
+                       help=f'STT 백엔드 (기본: {DEFAULT_BACKEND}, faster-whisper = CTranslate2 int8)')
+    parser.add_argument('--vad', action='store_true',
+                       help='음성 구간만 변환 (무음/음악/게임 소리 구간 건너뜀, 비디오별 건너뛴 비율 출력)')
     parser.add_argument('--video-ids', nargs='+')
     parser.add_argument('--workers', type=int, default=2, help='병렬 워커 수 (권장: 2-4)')
     parser.add_argument('--memory-threshold', type=float, default=85.0, 
                        help='메모리 임계값 %% (기본: 85)')
+    parser.add_argument('--compress', action='store_true',
+                       help='자막을 zstd 사전 압축(.zst)으로 저장 (기본: 환경변수 STORAGE_COMPRESSION)')
+    parser.add_argument('--worker-mode', choices=['persistent', 'per-task'], default='persistent',
+                       help='persistent: 워커당 모델 1회 로드 (기본), per-task: 비디오마다 로드')
+    parser.add_argument('--max-rss-growth', type=float, default=DEFAULT_MAX_RSS_GROWTH_MB,
+                       help=f'워커 교체 기준 메모리 증가량 MB (기본: {DEFAULT_MAX_RSS_GROWTH_MB})')
+    parser.add_argument('--download-workers', type=int, default=DEFAULT_DOWNLOAD_WORKERS,
+                       help=f'오디오를 미리 받는 다운로드 스레드 수 (기본: {DEFAULT_DOWNLOAD_WORKERS})')
+    parser.add_argument('--disk-budget', type=float, default=DEFAULT_DISK_BUDGET_MB,
+                       help=f'받아 두고 아직 변환하지 않은 오디오 최대 크기 MB (기본: {DEFAULT_DISK_BUDGET_MB})')
+    parser.add_argument('--source-url', default=VIDEO_URL_TEMPLATE,
+                       help='오디오 다운로드 URL 형식, {video_id} 치환 (기본: YouTube 시청 페이지)')
     
     args = parser.parse_args()
+    # 환경변수로 설정해서 워커 프로세스에도 전달
+    if args.compress:
+        set_compression(True)
     
     # 워커 수 검증
     cpu_count = psutil.cpu_count(logical=False)
@@ -407,8 +929,15 @@ def main():
         videos_json=args.videos,
         output_dir=args.output_dir,
         model_size=args.model,
+        backend=args.backend,
+        use_vad=args.vad,
         max_workers=args.workers,
-        memory_threshold=args.memory_threshold
+        memory_threshold=args.memory_threshold,
+        worker_mode=args.worker_mode,
+        max_rss_growth_mb=args.max_rss_growth,
+        download_workers=args.download_workers,
+        disk_budget_mb=args.disk_budget,
+        url_template=args.source_url
     )
     
     # 처리할 비디오 ID 결정
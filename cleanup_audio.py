@@ -2,11 +2,15 @@
 """
 오디오 캐시 정리 스크립트
 transcript가 있는 비디오의 오디오 파일만 삭제
+(파일마다 확인하지 않고 data/artifacts.db 산출물 목록을 조회)
 """
 
 from pathlib import Path
 import os
 
+from artifact_manifest import ArtifactManifest
+from data_paths import artifact_dir
+
 
 def cleanup_processed_audio():
     """
@@ -15,7 +19,7 @@ def cleanup_processed_audio():
     """
     
     audio_dir = Path("data/tmp")
-    transcript_dir = Path("data/chimchakman_official_transcripts")
+    transcript_dir = Path(artifact_dir("transcript"))
     
     if not audio_dir.exists():
         print("❌ data/tmp 디렉토리가 없습니다.")
@@ -29,31 +33,40 @@ def cleanup_processed_audio():
     print("🧹 오디오 캐시 정리")
     print("="*80)
     
-    # 모든 오디오 파일
-    audio_files = list(audio_dir.glob("*.mp3"))
-    print(f"\n총 오디오 파일: {len(audio_files)}개")
-    
-    deleted = 0
-    kept = 0
-    saved_space = 0
-    
-    for audio_file in audio_files:
-        # 비디오 ID 추출
-        video_id = audio_file.stem
+    with ArtifactManifest() as manifest:
+        manifest.ensure_scanned('audio', 'transcript')
         
-        # transcript 파일 확인
-        transcript_file = transcript_dir / f"{video_id}_whisper_transcript.txt"
+        # 모든 오디오 파일 / transcript 있는 오디오 파일
+        total = len(manifest.video_ids('audio'))
+        processed = manifest.select('audio', with_kinds=['transcript'])
+        print(f"\n총 오디오 파일: {total}개")
         
-        if transcript_file.exists():
-            # transcript 있으면 오디오 삭제
-            file_size = audio_file.stat().st_size
-            audio_file.unlink()
-            deleted += 1
-            saved_space += file_size
-            print(f"✓ 삭제: {audio_file.name} ({file_size / (1024*1024):.1f} MB)")
-        else:
-            # transcript 없으면 보존 (처리 중이거나 실패)
-            kept += 1
+        deleted = 0
+        saved_space = 0
+        stale = 0
+        
+        for row in processed:
+            # 목록의 transcript 파일이 실제로 남아 있을 때만 오디오 삭제
+            transcript_path = (manifest.get(row['video_id'], 'transcript') or {}).get('path')
+            if not transcript_path or not os.path.exists(transcript_path):
+                print(f"⚠️  보존: {row['video_id']} (목록의 transcript 파일 없음: {transcript_path})")
+                manifest.remove(row['video_id'], 'transcript')
+                stale += 1
+                continue
+            
+            audio_file = Path(row['path'])
+            try:
+                audio_file.unlink()
+            except FileNotFoundError:
+                pass  # 이미 지워진 파일은 목록에서만 제거
+            else:
+                deleted += 1
+                saved_space += row['size']
+                print(f"✓ 삭제: {audio_file.name} ({row['size'] / (1024*1024):.1f} MB)")
+            manifest.remove(row['video_id'], 'audio')
+        
+        # transcript 없으면 보존 (처리 중이거나 실패)
+        kept = total - len(processed) + stale
     
     # 결과 요약
     print("\n" + "="*80)
@@ -92,6 +105,10 @@ def cleanup_all_audio():
     for audio_file in audio_files:
         audio_file.unlink()
     
+    # 산출물 목록에서도 오디오 제거
+    with ArtifactManifest() as manifest:
+        manifest.scan(['audio'])
+    
     print(f"\n✓ {len(audio_files)}개 파일 삭제됨")
     print(f"  💾 절약된 공간: {total_size / (1024*1024*1024):.2f} GB")
 
@@ -102,42 +119,31 @@ def show_audio_stats():
     """
     
     audio_dir = Path("data/tmp")
-    transcript_dir = Path("data/chimchakman_official_transcripts")
     
     if not audio_dir.exists():
         print("❌ data/tmp 디렉토리가 없습니다.")
         return
     
-    audio_files = list(audio_dir.glob("*.mp3"))
-    total_size = sum(f.stat().st_size for f in audio_files)
-    
-    # 처리 완료된 것 vs 미처리
-    processed = 0
-    unprocessed = 0
+    with ArtifactManifest() as manifest:
+        manifest.ensure_scanned('audio', 'transcript')
+        audio = manifest.select('audio')
+        # 처리 완료된 것 vs 미처리 (크기도 목록에 있으므로 stat 불필요)
+        done = manifest.select('audio', with_kinds=['transcript'])
     
-    for audio_file in audio_files:
-        video_id = audio_file.stem
-        transcript_file = transcript_dir / f"{video_id}_whisper_transcript.txt"
-        
-        if transcript_file.exists():
-            processed += 1
-        else:
-            unprocessed += 1
+    total_size = sum(row['size'] for row in audio)
+    processed = len(done)
+    unprocessed = len(audio) - processed
     
     print("="*80)
     print("📊 오디오 캐시 통계")
     print("="*80)
-    print(f"\n총 오디오 파일: {len(audio_files)}개")
+    print(f"\n총 오디오 파일: {len(audio)}개")
     print(f"  ✅ 처리 완료: {processed}개 (삭제 가능)")
     print(f"  ⏳ 미처리: {unprocessed}개 (보존 필요)")
     print(f"\n총 용량: {total_size / (1024*1024*1024):.2f} GB")
     
     if processed > 0:
-        can_save = sum(
-            (audio_dir / f"{(transcript_dir / f.name).stem}.mp3").stat().st_size
-            for f in transcript_dir.glob("*.txt")
-            if (audio_dir / f"{f.stem.replace('_whisper_transcript', '')}.mp3").exists()
-        )
+        can_save = sum(row['size'] for row in done)
         print(f"  💾 삭제 가능 공간: {can_save / (1024*1024*1024):.2f} GB")
     
     print("="*80)
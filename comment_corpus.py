@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Comment Corpus
+Every comment of a channel in a few flat arrays: one UTF-8 text buffer, dictionary-encoded authors, NumPy columns.
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+import logging
+import tracemalloc
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from comment_store import normalize_comment
+from compressed_storage import getmtime, read_json
+from data_paths import artifact_dir, find_files
+from stats_timeseries import to_epoch
+
+logger = logging.getLogger(__name__)
+
+COMMENTS_DIR = artifact_dir('comments')
+
+# like_counts / published_at value of comments stored as bare strings
+MISSING = -1
+
+ARRAYS = ('video_ids', 'video_offsets', 'source_mtimes', 'text_buffer', 'text_offsets',
+          'author_buffer', 'author_offsets', 'author_ids', 'like_counts', 'published_at')
+
+
+def corpus_path(directory: str) -> str:
+    """Corpus file of a comment directory, e.g. data/{slug}_comments_corpus.npz."""
+    return f"{os.path.normpath(directory)}_corpus.npz"
+
+
+def _encode_strings(values: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Strings as one UTF-8 buffer plus int64 offsets (len(values) + 1)."""
+    encoded = [value.encode('utf-8') for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets
+
+
+def _decode_strings(buffer: np.ndarray, offsets: np.ndarray) -> List[str]:
+    data = buffer.tobytes()
+    return [data[start:end].decode('utf-8') for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+
+
+class CommentCorpus:
+    """All comments of a channel, stored column-wise.
+
+    Row i is one comment: its text is text_buffer[text_offsets[i]:text_offsets[i + 1]]
+    (UTF-8), its author is authors[author_ids[i]] (-1: unknown) and its like
+    count and publish time (epoch seconds) are like_counts[i] and
+    published_at[i] (MISSING for comments stored as bare strings). Comments of
+    video j are rows video_offsets[j]:video_offsets[j + 1], so per-video
+    aggregates need no Python loop (see per_video). Both comment schemas are
+    normalized once at build time; consumers never check record types.
+    """
+
+    def __init__(self, video_ids: List[str], video_offsets: np.ndarray, source_mtimes: np.ndarray,
+                 text_buffer: np.ndarray, text_offsets: np.ndarray, authors: List[str],
+                 author_ids: np.ndarray, like_counts: np.ndarray, published_at: np.ndarray):
+        self.video_ids = video_ids
+        self.video_offsets = video_offsets
+        self.source_mtimes = source_mtimes
+        self.text_buffer = text_buffer
+        self.text_offsets = text_offsets
+        self.authors = authors
+        self.author_ids = author_ids
+        self.like_counts = like_counts
+        self.published_at = published_at
+        self._video_index = {video_id: i for i, video_id in enumerate(video_ids)}
+        self._text_bytes = None
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def build(cls, directory: str = COMMENTS_DIR, previous: Optional['CommentCorpus'] = None) -> 'CommentCorpus':
+        """Build a corpus from *_comments.json files, one file in memory at a time.
+
+        Videos whose file mtime matches `previous` are copied from it as array
+        slices instead of being parsed again.
+
+        Args:
+            directory: Comment JSON directory (flat or sharded, plain or .zst)
+            previous: Earlier corpus of the same directory
+
+        Returns:
+            New corpus ordered by video ID
+        """
+        authors = list(previous.authors) if previous is not None else []
+        author_index = {author: i for i, author in enumerate(authors)}
+        video_ids, mtimes, counts = [], [], []
+        texts, author_ids, likes, published = [], [], [], []
+        parsed = 0
+
+        for video_id, path in find_files(directory, '_comments.json').items():
+            mtime = getmtime(path)
+            j = previous._video_index.get(video_id) if previous is not None else None
+            if j is not None and previous.source_mtimes[j] == mtime:
+                rows = previous.video_slice(video_id)
+                start, end = previous.text_offsets[rows.start], previous.text_offsets[rows.stop]
+                texts.append((previous.text_buffer[start:end],
+                              np.diff(previous.text_offsets[rows.start:rows.stop + 1])))
+                author_ids.append(previous.author_ids[rows])
+                likes.append(previous.like_counts[rows])
+                published.append(previous.published_at[rows])
+            else:
+                try:
+                    comments = read_json(path).get('comments') or []
+                except (OSError, ValueError) as e:
+                    logger.warning(f"⚠ 댓글 파일 로드 실패: {path} ({e})")
+                    continue
+                records = [normalize_comment(comment) for comment in comments]
+                encoded = [text.encode('utf-8') for _, text, _, _ in records]
+                texts.append((np.frombuffer(b''.join(encoded), dtype=np.uint8),
+                              np.array([len(text) for text in encoded], dtype=np.int64)))
+                ids = []
+                for author, _, _, _ in records:
+                    if author is None:
+                        ids.append(-1)
+                        continue
+                    if author not in author_index:
+                        author_index[author] = len(authors)
+                        authors.append(author)
+                    ids.append(author_index[author])
+                author_ids.append(np.array(ids, dtype=np.int32))
+                likes.append(np.array([MISSING if like is None else like for _, _, like, _ in records],
+                                      dtype=np.int64))
+                published.append(np.array([to_epoch(at) or MISSING for _, _, _, at in records], dtype=np.int64))
+                parsed += 1
+            video_ids.append(video_id)
+            mtimes.append(mtime)
+            counts.append(len(author_ids[-1]))
+
+        lengths = np.concatenate([length for _, length in texts]) if texts else np.zeros(0, dtype=np.int64)
+        text_offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=text_offsets[1:])
+        video_offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=video_offsets[1:])
+
+        def joined(chunks: List[np.ndarray], dtype) -> np.ndarray:
+            return np.concatenate(chunks).astype(dtype, copy=False) if chunks else np.zeros(0, dtype=dtype)
+
+        corpus = cls(
+            video_ids, video_offsets, np.array(mtimes, dtype=np.float64),
+            joined([buffer for buffer, _ in texts], np.uint8), text_offsets, authors,
+            joined(author_ids, np.int32), joined(likes, np.int64), joined(published, np.int64)
+        )
+        logger.info(f"✓ 댓글 코퍼스: 비디오 {len(video_ids):,}개, 댓글 {len(corpus):,}개 "
+                    f"(파일 {parsed:,}개 새로 읽음)")
+        return corpus
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: str):
+        """Write the corpus to one uncompressed .npz file."""
+        author_buffer, author_offsets = _encode_strings(self.authors)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # np.savez appends .npz to names that lack it
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, video_ids=np.array(self.video_ids, dtype=str), video_offsets=self.video_offsets,
+                 source_mtimes=self.source_mtimes, text_buffer=self.text_buffer, text_offsets=self.text_offsets,
+                 author_buffer=author_buffer, author_offsets=author_offsets, author_ids=self.author_ids,
+                 like_counts=self.like_counts, published_at=self.published_at)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'CommentCorpus':
+        """Read a corpus written by save()."""
+        with np.load(path) as data:
+            arrays = {name: data[name] for name in ARRAYS}
+        return cls(
+            arrays['video_ids'].tolist(), arrays['video_offsets'], arrays['source_mtimes'],
+            arrays['text_buffer'], arrays['text_offsets'],
+            _decode_strings(arrays['author_buffer'], arrays['author_offsets']),
+            arrays['author_ids'], arrays['like_counts'], arrays['published_at']
+        )
+
+    # ------------------------------------------------------------------
+    # Access
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.text_offsets) - 1
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the arrays and the author/video ID strings."""
+        arrays = (self.video_offsets, self.source_mtimes, self.text_buffer, self.text_offsets,
+                  self.author_ids, self.like_counts, self.published_at)
+        strings = sum(sys.getsizeof(value) for value in self.authors) + sum(sys.getsizeof(v) for v in self.video_ids)
+        return sum(array.nbytes for array in arrays) + strings
+
+    def _bytes(self) -> bytes:
+        if self._text_bytes is None:
+            self._text_bytes = self.text_buffer.tobytes()
+        return self._text_bytes
+
+    def text(self, row: int) -> str:
+        """Text of one comment."""
+        return self._bytes()[self.text_offsets[row]:self.text_offsets[row + 1]].decode('utf-8')
+
+    def texts(self, rows: Optional[slice] = None) -> List[str]:
+        """Texts of a row range (default: every comment), decoded on demand."""
+        start, stop, _ = (rows or slice(None)).indices(len(self))
+        data = self._bytes()
+        offsets = self.text_offsets[start:stop + 1].tolist()
+        return [data[a:b].decode('utf-8') for a, b in zip(offsets[:-1], offsets[1:])]
+
+    def video_slice(self, video_id: str) -> slice:
+        """Rows of one video (empty slice for unknown videos)."""
+        j = self._video_index.get(video_id)
+        if j is None:
+            return slice(0, 0)
+        return slice(int(self.video_offsets[j]), int(self.video_offsets[j + 1]))
+
+    def video_texts(self, video_id: str) -> List[str]:
+        """Texts of one video's comments in stored order."""
+        return self.texts(self.video_slice(video_id))
+
+    def row_videos(self) -> np.ndarray:
+        """Video index (into video_ids) of every row."""
+        return np.repeat(np.arange(len(self.video_ids)), np.diff(self.video_offsets))
+
+    def per_video(self, values: np.ndarray) -> np.ndarray:
+        """Sum of a per-row array over each video's rows."""
+        totals = np.zeros(len(self.video_ids), dtype=np.result_type(values, np.int64))
+        np.add.at(totals, self.row_videos(), values)
+        return totals
+
+    def rows_containing(self, query: str) -> np.ndarray:
+        """Rows whose text contains a substring (case-sensitive), in row order.
+
+        The buffer is searched once; matches spanning two comments are dropped.
+        """
+        needle = query.encode('utf-8')
+        if not needle:
+            return np.arange(len(self))
+        positions = np.fromiter((m.start() for m in re.finditer(re.escape(needle), self._bytes())), dtype=np.int64)
+        rows = np.searchsorted(self.text_offsets, positions, side='right') - 1
+        inside = positions + len(needle) <= self.text_offsets[rows + 1]
+        return np.unique(rows[inside])
+
+    def count_by_video(self, query: str) -> np.ndarray:
+        """Number of comments containing a substring per video (aligned with video_ids)."""
+        return np.bincount(self.row_videos()[self.rows_containing(query)], minlength=len(self.video_ids))
+
+    def term_counts(self, terms: Iterable[str]) -> Dict[str, np.ndarray]:
+        """count_by_video for several terms, e.g. keyword candidates."""
+        return {term: self.count_by_video(term) for term in terms}
+
+
+def load_corpus(directory: str = COMMENTS_DIR, path: Optional[str] = None, refresh: bool = True) -> CommentCorpus:
+    """Load the corpus of a comment directory, updating it first if files changed.
+
+    Args:
+        directory: Comment JSON directory
+        path: Corpus file (default: corpus_path(directory))
+        refresh: Re-read changed, new and removed files (one stat per file)
+
+    Returns:
+        Corpus matching the directory
+    """
+    path = path or corpus_path(directory)
+    corpus = CommentCorpus.load(path) if os.path.exists(path) else None
+    if corpus is not None and not refresh:
+        return corpus
+
+    if corpus is not None:
+        current = {video_id: getmtime(file) for video_id, file in find_files(directory, '_comments.json').items()}
+        stored = dict(zip(corpus.video_ids, corpus.source_mtimes.tolist()))
+        if current == stored:
+            return corpus
+
+    corpus = CommentCorpus.build(directory, previous=corpus)
+    corpus.save(path)
+    return corpus
+
+
+def _json_footprint(directory: str) -> Tuple[int, float]:
+    """Peak bytes and seconds of holding every comment file as parsed JSON."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    loaded = [read_json(path) for path in find_files(directory, '_comments.json').values()]
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del loaded
+    return peak, elapsed
+
+
+def main():
+    """Command-line entry point."""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(
+        description='댓글 코퍼스 (연속 UTF-8 버퍼 + NumPy 배열)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python comment_corpus.py                  # 만들기/갱신 후 요약
+  python comment_corpus.py --compare        # json.load 대비 메모리 비교
+  python comment_corpus.py --count 징기스칸   # 비디오별 언급 댓글 수
+        """
+    )
+    parser.add_argument('--dir', default=COMMENTS_DIR, help=f'댓글 JSON 디렉토리 (기본값: {COMMENTS_DIR})')
+    parser.add_argument('--rebuild', action='store_true', help='기존 코퍼스를 무시하고 처음부터 생성')
+    parser.add_argument('--compare', action='store_true', help='모든 파일을 json으로 읽었을 때와 메모리 비교')
+    parser.add_argument('--count', metavar='TEXT', help='이 문자열을 포함한 댓글 수 (비디오별 상위)')
+    parser.add_argument('--limit', type=int, default=20, help='최대 출력 수 (기본값: 20)')
+    args = parser.parse_args()
+
+    path = corpus_path(args.dir)
+    start = time.perf_counter()
+    if args.rebuild:
+        corpus = CommentCorpus.build(args.dir)
+        corpus.save(path)
+    else:
+        corpus = load_corpus(args.dir, path)
+    if not len(corpus):
+        logger.error(f"❌ 댓글이 없습니다: {args.dir}")
+        sys.exit(1)
+    logger.info(f"비디오 {len(corpus.video_ids):,}개, 댓글 {len(corpus):,}개, 작성자 {len(corpus.authors):,}명, "
+                f"{corpus.nbytes / 1024 / 1024:.1f} MB ({time.perf_counter() - start:.1f}초): {path}")
+
+    if args.compare:
+        peak, elapsed = _json_footprint(args.dir)
+        start = time.perf_counter()
+        CommentCorpus.load(path)
+        load_elapsed = time.perf_counter() - start
+        print(f"\n{'방식':<16}{'메모리(MB)':>12}{'로드(초)':>10}")
+        print(f"{'json.load':<16}{peak / 1024 / 1024:>12.1f}{elapsed:>10.2f}")
+        print(f"{'corpus':<16}{corpus.nbytes / 1024 / 1024:>12.1f}{load_elapsed:>10.2f}")
+
+    if args.count:
+        start = time.perf_counter()
+        counts = corpus.count_by_video(args.count)
+        elapsed = (time.perf_counter() - start) * 1000
+        for j in np.argsort(-counts, kind='stable')[:args.limit]:
+            if counts[j]:
+                print(f"{counts[j]:6d}  {corpus.video_ids[j]}")
+        print(f"\n댓글 {int(counts.sum()):,}개, 비디오 {int((counts > 0).sum()):,}개 ({elapsed:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Comment Record Schema
+One comment record layout for every collector, plus a streaming migrator for files in the older layouts.
+"""
+
+import os
+import sys
+import time
+import argparse
+import logging
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Dict, List, Optional, Union
+
+from dotenv import load_dotenv
+from googleapiclient.errors import HttpError
+
+from artifact_manifest import ArtifactManifest
+from compressed_storage import COMPRESSED_SUFFIX, read_json, write_json
+from data_paths import artifact_dir, find_files
+from quota_ledger import QuotaExhaustedError, QuotaScheduler, load_api_keys
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 2
+
+# Every comment record has exactly these keys; unknown values are None
+FIELDS = ('id', 'parent_id', 'author', 'text', 'like_count', 'published_at')
+
+# comments.list accepts at most 50 comma-separated IDs per request
+MAX_IDS_PER_REQUEST = 50
+
+COMMENTS_DIR = artifact_dir('comments')
+
+
+def from_resource(resource: Dict, parent_id: Optional[str] = None) -> Dict:
+    """Record from a YouTube comment resource (topLevelComment or reply).
+
+    Args:
+        resource: comments#comment resource with a snippet
+        parent_id: Thread's top-level comment ID, if the snippet lacks parentId
+    """
+    snippet = resource['snippet']
+    return {
+        'id': resource.get('id'),
+        'parent_id': snippet.get('parentId', parent_id),
+        'author': snippet.get('authorDisplayName'),
+        'text': snippet.get('textDisplay', ''),
+        'like_count': snippet.get('likeCount'),
+        'published_at': snippet.get('publishedAt'),
+    }
+
+
+def from_thread(item: Dict, replies: List[Dict]) -> List[Dict]:
+    """Records of a commentThreads item: the top-level comment, then its replies."""
+    top = from_resource(item['snippet']['topLevelComment'])
+    return [top] + [from_resource(reply, parent_id=top['id']) for reply in replies]
+
+
+def upgrade(comment: Union[str, Dict]) -> Dict:
+    """Record from any stored comment layout.
+
+    Handles bare strings (collector before schema 2), backfiller dicts
+    (author/text/likeCount/publishedAt) and schema 2 records.
+    """
+    if isinstance(comment, str):
+        return {**dict.fromkeys(FIELDS), 'text': comment}
+    if 'likeCount' in comment or 'publishedAt' in comment:
+        return {**dict.fromkeys(FIELDS), 'author': comment.get('author'), 'text': comment.get('text', ''),
+                'like_count': comment.get('likeCount'), 'published_at': comment.get('publishedAt')}
+    return {field: comment.get(field) for field in FIELDS}
+
+
+def missing_metadata(record: Dict) -> bool:
+    """True if a record lacks what the API could still tell us."""
+    return record['id'] is None or record['like_count'] is None or record['published_at'] is None
+
+
+def comments_document(video_id: str, records: List[Dict]) -> Dict:
+    """Contents of a {video_id}_comments.json file."""
+    return {
+        'video_id': video_id,
+        'schema_version': SCHEMA_VERSION,
+        'comment_count': len(records),
+        'comments': records,
+    }
+
+
+class CommentMigrator:
+    """Upgrades comment files to schema 2, one file in memory at a time.
+
+    Records that only lack like counts or timestamps but have an ID are
+    refreshed with comments.list, 50 IDs per call. Legacy records have no
+    ID, so they are matched by text against a fresh thread listing of their
+    video; the listing stops as soon as every record of the file is matched.
+    Threads list at most 5 replies inline, so the full reply list of a thread
+    whose top-level comment matched is paged with comments.list while
+    records are still unmatched. Without a scheduler the migration is
+    offline: layouts are upgraded and missing values stay None.
+
+    Quota: 1 unit per 50 ID lookups, up to max_pages units per ID-less file,
+    plus 1 unit per 100 replies of each matched thread with more than 5.
+    """
+
+    def __init__(self, scheduler: Optional[QuotaScheduler] = None, manifest: Optional[ArtifactManifest] = None,
+                 max_pages: int = 20):
+        """Create a migrator.
+
+        Args:
+            scheduler: Quota scheduler for metadata lookups (None: offline)
+            manifest: Artifact manifest to record rewritten files in
+            max_pages: commentThreads.list pages read per video when matching
+                (reply pages of matched threads are not counted)
+        """
+        self.scheduler = scheduler
+        self.manifest = manifest
+        self.max_pages = max_pages
+        self.counts = defaultdict(int)
+
+    # ------------------------------------------------------------------
+    # Metadata lookups
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _fill(record: Dict, fetched: Dict):
+        for field in FIELDS:
+            if record[field] is None and fetched[field] is not None:
+                record[field] = fetched[field]
+
+    def _fill_by_id(self, records: List[Dict]) -> int:
+        """Refresh records that have an ID, MAX_IDS_PER_REQUEST per comments.list call."""
+        pending = [record for record in records if record['id'] and missing_metadata(record)]
+        filled = 0
+        for start in range(0, len(pending), MAX_IDS_PER_REQUEST):
+            batch = {record['id']: record for record in pending[start:start + MAX_IDS_PER_REQUEST]}
+            response = self.scheduler.execute('comments.list', lambda yt: yt.comments().list(
+                part='snippet',
+                id=','.join(batch),
+                textFormat='plainText'
+            ))
+            for resource in response.get('items', []):
+                record = batch.get(resource['id'])
+                if record is not None:
+                    self._fill(record, from_resource(resource))
+                    filled += 1
+        return filled
+
+    def _thread_replies(self, parent_id: str):
+        """Yield every reply of a thread as a record, one comments.list page (100) at a time."""
+        page_token = None
+        while True:
+            response = self.scheduler.execute('comments.list', lambda yt: yt.comments().list(
+                part='snippet',
+                parentId=parent_id,
+                maxResults=100,
+                pageToken=page_token,
+                textFormat='plainText'
+            ))
+            for resource in response.get('items', []):
+                yield from_resource(resource, parent_id=parent_id)
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                break
+
+    def _fill_by_text(self, video_id: str, records: List[Dict]) -> int:
+        """Match records without an ID to the video's current comments by text."""
+        wanted = defaultdict(deque)
+        for record in records:
+            if record['id'] is None:
+                wanted[record['text']].append(record)
+        remaining = sum(len(queue) for queue in wanted.values())
+        filled = 0
+
+        def match(fetched: Dict) -> bool:
+            nonlocal remaining, filled
+            queue = wanted.get(fetched['text'])
+            if not queue:
+                return False
+            self._fill(queue.popleft(), fetched)
+            filled += 1
+            remaining -= 1
+            return True
+
+        page_token = None
+        for _ in range(self.max_pages):
+            if not remaining:
+                break
+            response = self.scheduler.execute('commentThreads.list', lambda yt: yt.commentThreads().list(
+                part='snippet,replies',
+                videoId=video_id,
+                maxResults=100,
+                pageToken=page_token,
+                order='relevance',
+                textFormat='plainText'
+            ))
+            for item in response.get('items', []):
+                inline = item.get('replies', {}).get('comments', [])
+                top, *replies = from_thread(item, inline)
+                top_matched = match(top)
+                for fetched in replies:
+                    match(fetched)
+                # Replies past the inline set are only worth a lookup for a thread this file holds
+                if top_matched and remaining and item['snippet'].get('totalReplyCount', 0) > len(inline):
+                    inline_ids = {reply['id'] for reply in inline}
+                    for fetched in self._thread_replies(top['id']):
+                        if fetched['id'] not in inline_ids:
+                            match(fetched)
+                        if not remaining:
+                            break
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                break
+        return filled
+
+    # ------------------------------------------------------------------
+    # Migration
+    # ------------------------------------------------------------------
+
+    def migrate_file(self, path: str, refetch: bool = False) -> bool:
+        """Upgrade one comment file in place (keeping its plain or .zst form).
+
+        Args:
+            path: Logical path of a *_comments.json file
+            refetch: Look up metadata again for files that were already tried
+
+        Returns:
+            True if the file was rewritten
+        """
+        data = read_json(path)
+        comments = data.get('comments') or []
+        records = [upgrade(comment) for comment in comments]
+        video_id = data.get('video_id') or os.path.basename(str(path))[:-len('_comments.json')]
+        changed = data.get('schema_version') != SCHEMA_VERSION or records != comments
+
+        document = comments_document(video_id, records)
+        if data.get('metadata_checked_at') and not refetch:
+            document['metadata_checked_at'] = data['metadata_checked_at']
+        elif self.scheduler and any(missing_metadata(record) for record in records):
+            try:
+                filled = self._fill_by_id(records)
+                filled += self._fill_by_text(video_id, records)
+            except HttpError as e:
+                if 'commentsDisabled' not in str(e):
+                    raise
+                filled = 0
+            self.counts['filled'] += filled
+            self.counts['unmatched'] += sum(missing_metadata(record) for record in records)
+            document['metadata_checked_at'] = datetime.now().isoformat()
+            changed = True
+
+        if not changed:
+            return False
+        compressed = os.path.exists(str(path) + COMPRESSED_SUFFIX)
+        written = write_json(path, document, kind='comments', compressed=compressed)
+        if self.manifest:
+            self.manifest.record(video_id, 'comments', written, tool=f"comment_schema:v{SCHEMA_VERSION}")
+        return True
+
+    def migrate_directory(self, directory: str = COMMENTS_DIR, refetch: bool = False) -> Dict[str, int]:
+        """Upgrade every comment file of a directory.
+
+        Stops cleanly when the API quota runs out; re-running continues with
+        the files that were not looked up yet.
+
+        Returns:
+            {'files', 'rewritten', 'filled', 'unmatched', 'failed'} counts
+        """
+        for path in find_files(directory, '_comments.json').values():
+            self.counts['files'] += 1
+            try:
+                if self.migrate_file(path, refetch):
+                    self.counts['rewritten'] += 1
+            except QuotaExhaustedError as e:
+                logger.warning(f"⚠ {e} - 쿼터 리셋 후 다시 실행하면 이어서 진행합니다.")
+                break
+            except (OSError, ValueError, HttpError) as e:
+                logger.warning(f"⚠ 댓글 파일 변환 실패: {path} ({e})")
+                self.counts['failed'] += 1
+        return dict(self.counts)
+
+
+def main():
+    """Command-line entry point."""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(
+        description='댓글 파일을 통합 스키마(id, parent_id, author, text, like_count, published_at)로 변환',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python comment_schema.py                  # 오프라인 변환 (API 호출 없음)
+  python comment_schema.py --fetch          # 빠진 좋아요/작성 시각/ID를 API로 채움
+  python comment_schema.py --fetch --max-pages 5
+
+쿼터 (--fetch):
+  ID 있는 댓글 50개당 comments.list 1 unit
+  ID 없는 파일은 비디오당 commentThreads.list 최대 --max-pages units
+  + 답글이 5개를 넘는 매칭된 스레드마다 답글 100개당 comments.list 1 unit
+  예: ID 없는 파일 약 5,700개 x 20페이지 = 최대 약 114,000 units (키 하나 하루 10,000 units)
+  쿼터가 떨어지면 멈추고, 다시 실행하면 조회하지 않은 파일부터 이어서 진행
+        """
+    )
+    parser.add_argument('--dir', default=COMMENTS_DIR, help=f'댓글 JSON 디렉토리 (기본값: {COMMENTS_DIR})')
+    parser.add_argument('--fetch', action='store_true', help='빠진 메타데이터를 YouTube API로 조회')
+    parser.add_argument('--refetch', action='store_true', help='이미 조회한 파일도 다시 조회')
+    parser.add_argument('--max-pages', type=int, default=20,
+                        help='ID 없는 파일에서 비디오당 읽을 댓글 스레드 페이지 수 = 최대 units (기본값: 20, 답글 페이지 별도)')
+    args = parser.parse_args()
+
+    scheduler = None
+    if args.fetch:
+        api_keys = load_api_keys(os.getenv('YOUTUBE_API_KEY'))
+        if not api_keys:
+            logger.error("❌ YOUTUBE_API_KEY 환경변수를 설정해주세요.")
+            sys.exit(1)
+        # Lookups (and --refetch) must see current metadata, so the response cache is not used here
+        scheduler = QuotaScheduler(api_keys, cache=None)
+        logger.info(f"🎫 오늘 남은 쿼터: {scheduler.remaining():,} units "
+                    f"(ID 없는 파일은 비디오당 최대 {args.max_pages} units + 답글 페이지)")
+
+    start = time.perf_counter()
+    with ArtifactManifest() as manifest:
+        counts = CommentMigrator(scheduler, manifest, args.max_pages).migrate_directory(args.dir, args.refetch)
+    logger.info(f"✓ 파일 {counts.get('files', 0):,}개 중 {counts.get('rewritten', 0):,}개 변환, "
+                f"메타데이터 채움 {counts.get('filled', 0):,}개, 못 찾음 {counts.get('unmatched', 0):,}개, "
+                f"실패 {counts.get('failed', 0):,}개 ({time.perf_counter() - start:.1f}초)")
+    if counts.get('failed'):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+SQLite Comment Store
+All collected comments in one database with an FTS5 trigram index for Korean substring search.
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Union
+
+from compressed_storage import getmtime, read_json
+from data_paths import artifact_dir, find_files
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = 'data/comments.db'
+COMMENTS_DIR = artifact_dir('comments')
+
+# Trigram tokens need at least three characters; shorter queries fall back to LIKE
+MIN_MATCH_LENGTH = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    video_id TEXT PRIMARY KEY,
+    comment_count INTEGER NOT NULL,
+    source_mtime REAL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS comments (
+    id INTEGER PRIMARY KEY,
+    video_id TEXT NOT NULL,
+    author TEXT,
+    text TEXT NOT NULL,
+    like_count INTEGER,
+    published_at TEXT
+);
+CREATE INDEX IF NOT EXISTS comments_video_id ON comments(video_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS comments_fts USING fts5(
+    text, content='comments', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS comments_ai AFTER INSERT ON comments BEGIN
+    INSERT INTO comments_fts(rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS comments_ad AFTER DELETE ON comments BEGIN
+    INSERT INTO comments_fts(comments_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+
+def normalize_comment(comment: Union[str, Dict]) -> Tuple[Optional[str], str, Optional[int], Optional[str]]:
+    """Map any stored comment layout to (author, text, like_count, published_at).
+
+    Schema 2 records (see comment_schema) use like_count and published_at;
+    files written before it hold bare strings or backfiller dicts with
+    likeCount and publishedAt.
+    """
+    if isinstance(comment, str):
+        return None, comment, None, None
+    if 'like_count' in comment:
+        return (comment.get('author'), comment.get('text', ''),
+                comment.get('like_count'), comment.get('published_at'))
+    return (comment.get('author'), comment.get('text', ''),
+            comment.get('likeCount'), comment.get('publishedAt'))
+
+
+class CommentStore:
+    """Comments of every video in one SQLite database.
+
+    Writers replace a video's comments as a unit, mirroring the per-video
+    JSON files. One connection is shared behind a lock so collector worker
+    threads can write concurrently.
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        """Open (or create) the database.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        """Close the database connection."""
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def _replace(self, video_id: str, comments: List[Union[str, Dict]], source_mtime: Optional[float]):
+        self._conn.execute('DELETE FROM comments WHERE video_id = ?', (video_id,))
+        self._conn.executemany(
+            'INSERT INTO comments (video_id, author, text, like_count, published_at) VALUES (?, ?, ?, ?, ?)',
+            ((video_id, *normalize_comment(comment)) for comment in comments)
+        )
+        self._conn.execute(
+            'INSERT OR REPLACE INTO videos (video_id, comment_count, source_mtime, updated_at) VALUES (?, ?, ?, ?)',
+            (video_id, len(comments), source_mtime, datetime.now().isoformat())
+        )
+
+    def replace_video_comments(self, video_id: str, comments: List[Union[str, Dict]]):
+        """Store the full comment list of one video, replacing earlier rows.
+
+        Args:
+            video_id: YouTube video ID
+            comments: Bare strings or backfiller-style dicts
+        """
+        with self._lock, self._conn:
+            self._replace(video_id, comments, None)
+
+    def import_directory(self, directory: str = COMMENTS_DIR, batch_size: int = 200,
+                         force: bool = False) -> Tuple[int, int]:
+        """Stream *_comments.json files into the store, one file in memory at a time.
+
+        Files whose mtime matches the last import are skipped, so re-running
+        only picks up changed files.
+
+        Args:
+            directory: Comment JSON directory
+            batch_size: Files per transaction
+            force: Re-import unchanged files
+
+        Returns:
+            (files imported, comments imported)
+        """
+        files = comments = 0
+        pending = 0
+        with self._lock:
+            known = dict(self._conn.execute('SELECT video_id, source_mtime FROM videos'))
+            try:
+                for video_id, path in find_files(directory, '_comments.json').items():
+                    mtime = getmtime(path)
+                    if not force and known.get(video_id) == mtime:
+                        continue
+                    try:
+                        data = read_json(path)
+                    except (OSError, ValueError) as e:
+                        logger.warning(f"⚠ 댓글 파일 로드 실패: {path} ({e})")
+                        continue
+
+                    video_comments = data.get('comments') or []
+                    self._replace(data.get('video_id', video_id), video_comments, mtime)
+                    files += 1
+                    comments += len(video_comments)
+                    pending += 1
+                    if pending >= batch_size:
+                        self._conn.commit()
+                        pending = 0
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+        return files, comments
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _match_clause(query: str) -> Tuple[str, str]:
+        """SQL condition and parameter for a substring query."""
+        if len(query) >= MIN_MATCH_LENGTH:
+            # A quoted FTS5 string is a phrase; with trigrams that means "contains"
+            return 'c.id IN (SELECT rowid FROM comments_fts WHERE comments_fts MATCH ?)', \
+                '"' + query.replace('"', '""') + '"'
+        escaped = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return "c.text LIKE ? ESCAPE '\\'", f"%{escaped}%"
+
+    def search(self, query: str, limit: int = 20, video_id: Optional[str] = None) -> List[Dict]:
+        """Comments containing a substring, most liked first.
+
+        Args:
+            query: Substring to find (case-insensitive)
+            limit: Maximum rows
+            video_id: Restrict to one video
+
+        Returns:
+            Comment dictionaries (video_id, author, text, like_count, published_at)
+        """
+        condition, param = self._match_clause(query)
+        sql = f'SELECT c.video_id, c.author, c.text, c.like_count, c.published_at FROM comments c WHERE {condition}'
+        params: list = [param]
+        if video_id:
+            sql += ' AND c.video_id = ?'
+            params.append(video_id)
+        sql += ' ORDER BY c.like_count IS NULL, c.like_count DESC LIMIT ?'
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [dict(zip(('video_id', 'author', 'text', 'like_count', 'published_at'), row)) for row in rows]
+
+    def count_by_video(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Number of matching comments per video, largest first."""
+        condition, param = self._match_clause(query)
+        sql = (f'SELECT c.video_id, COUNT(*) AS n FROM comments c WHERE {condition} '
+               'GROUP BY c.video_id ORDER BY n DESC')
+        params: list = [param]
+        if limit:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def video_comments(self, video_id: str) -> List[Dict]:
+        """All stored comments of one video in insertion order."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT author, text, like_count, published_at FROM comments WHERE video_id = ? ORDER BY id',
+                (video_id,)
+            ).fetchall()
+        return [dict(zip(('author', 'text', 'like_count', 'published_at'), row)) for row in rows]
+
+    def stats(self) -> Tuple[int, int]:
+        """(videos, comments) currently stored."""
+        with self._lock:
+            videos = self._conn.execute('SELECT COUNT(*) FROM videos').fetchone()[0]
+            comments = self._conn.execute('SELECT COUNT(*) FROM comments').fetchone()[0]
+        return videos, comments
+
+
+def main():
+    """Command-line entry point."""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(
+        description='댓글 SQLite 저장소 (FTS5 trigram 검색)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python comment_store.py --import-dir
+  python comment_store.py 침착맨
+  python comment_store.py 징기스칸 --counts
+  python comment_store.py 고마워요 --video H5lz6_hqCNw --limit 5
+        """
+    )
+    parser.add_argument('query', nargs='?', help='검색할 문자열 (부분 일치)')
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help=f'데이터베이스 파일 (기본값: {DEFAULT_DB_PATH})')
+    parser.add_argument('--import-dir', nargs='?', const=COMMENTS_DIR, default=None,
+                        help=f'댓글 JSON 디렉토리 가져오기 (기본값: {COMMENTS_DIR})')
+    parser.add_argument('--force', action='store_true', help='변경되지 않은 파일도 다시 가져오기')
+    parser.add_argument('--counts', action='store_true', help='비디오별 일치 댓글 수 출력')
+    parser.add_argument('--video', help='특정 비디오로 검색 제한')
+    parser.add_argument('--limit', type=int, default=20, help='최대 출력 수 (기본값: 20)')
+    args = parser.parse_args()
+
+    with CommentStore(args.db) as store:
+        if args.import_dir:
+            start = time.perf_counter()
+            files, comments = store.import_directory(args.import_dir, force=args.force)
+            logger.info(f"✓ 파일 {files}개, 댓글 {comments:,}개 가져옴 ({time.perf_counter() - start:.1f}초)")
+
+        if not args.query:
+            videos, comments = store.stats()
+            logger.info(f"저장된 비디오 {videos:,}개, 댓글 {comments:,}개: {args.db}")
+            return
+
+        start = time.perf_counter()
+        if args.counts:
+            rows = store.count_by_video(args.query, args.limit)
+            elapsed = (time.perf_counter() - start) * 1000
+            for video_id, count in rows:
+                print(f"{count:6d}  {video_id}")
+            print(f"\n비디오 {len(rows)}개 ({elapsed:.1f} ms)")
+        else:
+            rows = store.search(args.query, args.limit, args.video)
+            elapsed = (time.perf_counter() - start) * 1000
+            for row in rows:
+                likes = row['like_count'] if row['like_count'] is not None else '-'
+                print(f"[{row['video_id']}] 👍{likes} {row['text'][:120]}")
+            print(f"\n댓글 {len(rows)}개 ({elapsed:.1f} ms)")
+
+        if not rows:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
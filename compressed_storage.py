@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Compressed Text Storage
+zstd-compressed comment/transcript files with dictionaries trained on our own corpus.
+"""
+
+import os
+import sys
+import glob as globlib
+import json
+import time
+import argparse
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import zstandard
+
+logger = logging.getLogger(__name__)
+
+COMPRESSED_SUFFIX = '.zst'
+DICT_DIR = 'data/zstd_dicts'
+COMPRESSION_LEVEL = 19
+
+# Training time grows with the sample volume; a spread-out subset gives the same ratio
+MAX_TRAINING_SAMPLES = 1000
+
+# Environment switch so every tool (and batch_stt worker processes) agrees on the mode
+COMPRESSION_ENV = 'STORAGE_COMPRESSION'
+
+# Dictionary kind -> data_paths artifact kind whose files it is trained on
+KIND_SOURCES = {
+    'comments': 'comments',
+    'transcripts': 'transcript',
+}
+
+PathLike = Union[str, Path]
+
+_local = threading.local()
+
+
+def compression_enabled() -> bool:
+    """True when new files should be written compressed (STORAGE_COMPRESSION=zstd)."""
+    return os.getenv(COMPRESSION_ENV, '').lower() == 'zstd'
+
+
+def set_compression(enabled: bool):
+    """Switch the mode for this process and the child processes it starts."""
+    os.environ[COMPRESSION_ENV] = 'zstd' if enabled else ''
+
+
+def _physical(path: PathLike) -> Optional[str]:
+    """Existing file for a logical path: the plain file or its .zst twin."""
+    path = str(path)
+    if os.path.exists(path):
+        return path
+    if not path.endswith(COMPRESSED_SUFFIX) and os.path.exists(path + COMPRESSED_SUFFIX):
+        return path + COMPRESSED_SUFFIX
+    return None
+
+
+def logical_path(path: PathLike) -> str:
+    """Path without the .zst suffix."""
+    path = str(path)
+    return path[:-len(COMPRESSED_SUFFIX)] if path.endswith(COMPRESSED_SUFFIX) else path
+
+
+def exists(path: PathLike) -> bool:
+    """True if the file exists plain or compressed."""
+    return _physical(path) is not None
+
+
+def getmtime(path: PathLike) -> float:
+    """Modification time of whichever form of the file exists."""
+    physical = _physical(path)
+    if physical is None:
+        raise FileNotFoundError(path)
+    return os.path.getmtime(physical)
+
+
+def glob(directory: PathLike, pattern: str) -> List[Path]:
+    """Logical paths matching a pattern, whether stored plain or compressed.
+
+    Args:
+        directory: Directory to search
+        pattern: Pattern for the plain name, e.g. '*_comments.json'
+
+    Returns:
+        Sorted, de-duplicated paths without the .zst suffix
+    """
+    directory = Path(directory)
+    names = {p.name for p in directory.glob(pattern)}
+    names.update(p.name[:-len(COMPRESSED_SUFFIX)] for p in directory.glob(pattern + COMPRESSED_SUFFIX))
+    return [directory / name for name in sorted(names)]
+
+
+# ----------------------------------------------------------------------
+# Dictionaries
+# ----------------------------------------------------------------------
+
+def _dictionaries() -> Dict[int, zstandard.ZstdCompressionDict]:
+    """All dictionaries in DICT_DIR keyed by dictionary ID (loaded once per thread)."""
+    cache = getattr(_local, 'dicts', None)
+    mtime = os.path.getmtime(DICT_DIR) if os.path.isdir(DICT_DIR) else None
+    if cache is None or _local.dicts_mtime != mtime:
+        cache = {}
+        for path in globlib.glob(os.path.join(DICT_DIR, '*.dict')):
+            with open(path, 'rb') as f:
+                dictionary = zstandard.ZstdCompressionDict(f.read())
+            cache[dictionary.dict_id()] = dictionary
+        _local.dicts, _local.dicts_mtime = cache, mtime
+        _local.compressors, _local.decompressors = {}, {}
+    return cache
+
+
+def _current_dictionary(kind: str) -> Optional[zstandard.ZstdCompressionDict]:
+    """Most recently trained dictionary for an artifact kind."""
+    paths = globlib.glob(os.path.join(DICT_DIR, f"{kind}-*.dict"))
+    if not paths:
+        return None
+    newest = max(paths, key=os.path.getmtime)
+    dict_id = int(Path(newest).stem.rsplit('-', 1)[1])
+    return _dictionaries().get(dict_id)
+
+
+def _compressor(kind: Optional[str]) -> zstandard.ZstdCompressor:
+    _dictionaries()
+    dictionary = _current_dictionary(kind) if kind else None
+    key = dictionary.dict_id() if dictionary else 0
+    if key not in _local.compressors:
+        _local.compressors[key] = zstandard.ZstdCompressor(level=COMPRESSION_LEVEL, dict_data=dictionary)
+    return _local.compressors[key]
+
+
+def _decompressor(data: bytes) -> zstandard.ZstdDecompressor:
+    dictionaries = _dictionaries()
+    dict_id = zstandard.get_frame_parameters(data).dict_id
+    if dict_id and dict_id not in dictionaries:
+        raise ValueError(f"zstd 사전 {dict_id}을(를) {DICT_DIR}에서 찾을 수 없습니다.")
+    if dict_id not in _local.decompressors:
+        _local.decompressors[dict_id] = zstandard.ZstdDecompressor(dict_data=dictionaries.get(dict_id))
+    return _local.decompressors[dict_id]
+
+
+def _training_sample(kind: str, path: str) -> bytes:
+    """File contents in the form they are stored when compressed."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if kind == 'comments':
+        return _dump_json(json.loads(data), compact=True).encode('utf-8')
+    return data
+
+
+def train_dictionary(kind: str, paths: List[str], dict_size: int = 112640,
+                     max_samples: int = MAX_TRAINING_SAMPLES) -> str:
+    """Train a zstd dictionary on sample files and save it to DICT_DIR.
+
+    Older dictionaries are kept so files compressed with them stay readable.
+
+    Args:
+        kind: 'comments' or 'transcripts'
+        paths: Plain sample files
+        dict_size: Dictionary size in bytes
+        max_samples: Evenly spaced subset of paths to train on
+
+    Returns:
+        Path of the new dictionary
+    """
+    step = max(len(paths) // max_samples, 1)
+    samples = [_training_sample(kind, path) for path in paths[::step][:max_samples]]
+    dictionary = zstandard.train_dictionary(dict_size, samples, level=COMPRESSION_LEVEL)
+    os.makedirs(DICT_DIR, exist_ok=True)
+    path = os.path.join(DICT_DIR, f"{kind}-{dictionary.dict_id()}.dict")
+    with open(path, 'wb') as f:
+        f.write(dictionary.as_bytes())
+    logger.info(f"✓ {kind} 사전 학습 완료: 샘플 {len(samples):,}개 → {path} ({len(dictionary.as_bytes()):,} bytes)")
+    return path
+
+
+# ----------------------------------------------------------------------
+# Reading and writing
+# ----------------------------------------------------------------------
+
+def compress(data: bytes, kind: Optional[str] = None) -> bytes:
+    """Compress bytes with the current dictionary of a kind (plain zstd without one)."""
+    return _compressor(kind).compress(data)
+
+
+def decompress(data: bytes) -> bytes:
+    """Decompress a frame, picking the dictionary from its header.
+
+    Raises:
+        ValueError: Corrupt frame or unknown dictionary
+    """
+    try:
+        return _decompressor(data).decompress(data)
+    except zstandard.ZstdError as e:
+        raise ValueError(f"zstd 압축 해제 실패: {e}") from e
+
+
+def read_bytes(path: PathLike) -> bytes:
+    """Read a file stored plain or compressed."""
+    physical = _physical(path)
+    if physical is None:
+        raise FileNotFoundError(path)
+    with open(physical, 'rb') as f:
+        data = f.read()
+    return decompress(data) if physical.endswith(COMPRESSED_SUFFIX) else data
+
+
+def read_text(path: PathLike) -> str:
+    """Read a UTF-8 text file stored plain or compressed."""
+    return read_bytes(path).decode('utf-8')
+
+
+def read_json(path: PathLike):
+    """Read a JSON file stored plain or compressed."""
+    return json.loads(read_bytes(path))
+
+
+def _dump_json(obj, compact: bool) -> str:
+    if compact:
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+    return json.dumps(obj, ensure_ascii=False, indent=2)
+
+
+def write_bytes(path: PathLike, data: bytes, kind: Optional[str] = None,
+                compressed: Optional[bool] = None) -> str:
+    """Write a file plain or compressed and remove the other form.
+
+    Args:
+        path: Logical (plain) path
+        data: File contents
+        kind: Dictionary kind ('comments', 'transcripts')
+        compressed: Override the STORAGE_COMPRESSION mode
+
+    Returns:
+        Path actually written
+    """
+    path = logical_path(path)
+    compressed = compression_enabled() if compressed is None else compressed
+    target, stale = (path + COMPRESSED_SUFFIX, path) if compressed else (path, path + COMPRESSED_SUFFIX)
+    if compressed:
+        data = compress(data, kind)
+
+    tmp_path = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, target)
+    if os.path.exists(stale):
+        os.remove(stale)
+    return target
+
+
+def write_text(path: PathLike, text: str, kind: Optional[str] = None, compressed: Optional[bool] = None) -> str:
+    """Write a UTF-8 text file plain or compressed (see write_bytes)."""
+    return write_bytes(path, text.encode('utf-8'), kind, compressed)
+
+
+def write_json(path: PathLike, obj, kind: Optional[str] = None, compressed: Optional[bool] = None) -> str:
+    """Write JSON: indent=2 when plain, minified when compressed (see write_bytes)."""
+    compressed = compression_enabled() if compressed is None else compressed
+    return write_bytes(path, _dump_json(obj, compact=compressed).encode('utf-8'), kind, compressed)
+
+
+# ----------------------------------------------------------------------
+# Maintenance
+# ----------------------------------------------------------------------
+
+def convert(paths: List[Path], kind: str, compressed: bool) -> int:
+    """Rewrite files in the requested form (re-compressing with the current dictionary)."""
+    for path in paths:
+        if kind == 'comments':
+            write_json(path, read_json(path), kind, compressed)
+        else:
+            write_bytes(path, read_bytes(path), kind, compressed)
+    return len(paths)
+
+
+def benchmark(kind: str, paths: List[Path]) -> Dict[str, Dict[str, float]]:
+    """Compare size and read throughput of plain files, zstd and zstd + dictionary.
+
+    Everything happens in memory on the given files, so it works before
+    anything is converted.
+
+    Returns:
+        {variant: {'bytes': total size, 'mb_per_s': read+decode throughput of the plain text}}
+    """
+    originals = [read_bytes(path) for path in paths]
+    if kind == 'comments':
+        payloads = [_dump_json(json.loads(data), compact=True).encode('utf-8') for data in originals]
+    else:
+        payloads = originals
+    plain_total = sum(len(o) for o in originals)
+
+    plain = zstandard.ZstdCompressor(level=COMPRESSION_LEVEL)
+    dictionary = _current_dictionary(kind)
+    variants = {'plain': (None, originals)}
+    variants['zstd'] = (zstandard.ZstdDecompressor(), [plain.compress(p) for p in payloads])
+    if dictionary is not None:
+        with_dict = zstandard.ZstdCompressor(level=COMPRESSION_LEVEL, dict_data=dictionary)
+        variants['zstd+dict'] = (zstandard.ZstdDecompressor(dict_data=dictionary),
+                                 [with_dict.compress(p) for p in payloads])
+
+    results = {}
+    for name, (decompressor, blobs) in variants.items():
+        start = time.perf_counter()
+        for blob in blobs:
+            data = decompressor.decompress(blob) if decompressor else blob
+            if kind == 'comments':
+                json.loads(data)
+            else:
+                data.decode('utf-8')
+        elapsed = time.perf_counter() - start
+        results[name] = {'bytes': sum(len(b) for b in blobs), 'mb_per_s': plain_total / 1e6 / elapsed}
+    return results
+
+
+def main():
+    """Command-line entry point."""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(
+        description='zstd 사전 압축 저장소 도구',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python compressed_storage.py comments --train
+  python compressed_storage.py comments --benchmark
+  python compressed_storage.py transcripts --train --compress-existing
+
+새 파일을 압축해서 쓰려면 .env에 STORAGE_COMPRESSION=zstd 설정
+(또는 수집기/stt_whisper/batch_stt의 --compress 옵션)
+        """
+    )
+    parser.add_argument('kind', choices=sorted(KIND_SOURCES), help='대상 데이터 종류')
+    parser.add_argument('--files', default=None, help='대상 파일 glob 패턴 (기본값: 종류별 기본 디렉토리, 샤드 포함)')
+    parser.add_argument('--train', action='store_true', help='대상 파일로 zstd 사전 학습')
+    parser.add_argument('--dict-size', type=int, default=112640, help='사전 크기 bytes (기본값: 112640)')
+    parser.add_argument('--benchmark', action='store_true', help='원본 대비 크기와 읽기 속도 비교')
+    parser.add_argument('--compress-existing', action='store_true', help='기존 파일을 .zst로 변환')
+    parser.add_argument('--decompress-existing', action='store_true', help='.zst 파일을 원본 형식으로 되돌리기')
+    args = parser.parse_args()
+
+    if args.files:
+        source = args.files
+        paths = glob(os.path.dirname(source), os.path.basename(source))
+    else:
+        # data_paths builds on this module, so it is imported only here
+        from data_paths import artifact_dir, artifacts
+        source = artifact_dir(KIND_SOURCES[args.kind])
+        paths = list(artifacts(KIND_SOURCES[args.kind]).values())
+    if not paths:
+        logger.error(f"❌ 대상 파일이 없습니다: {source}")
+        sys.exit(1)
+    logger.info(f"대상 파일 {len(paths):,}개: {source}")
+
+    if args.train:
+        plain_paths = [str(_physical(p)) for p in paths if not str(_physical(p)).endswith(COMPRESSED_SUFFIX)]
+        train_dictionary(args.kind, plain_paths, args.dict_size)
+
+    if args.benchmark:
+        results = benchmark(args.kind, paths)
+        baseline = results['plain']['bytes']
+        print(f"\n{'방식':<12}{'크기(MB)':>12}{'비율':>10}{'읽기(MB/s)':>14}")
+        for name, result in results.items():
+            print(f"{name:<12}{result['bytes'] / 1e6:>12.1f}{result['bytes'] / baseline:>10.1%}"
+                  f"{result['mb_per_s']:>14.1f}")
+
+    if args.compress_existing or args.decompress_existing:
+        converted = convert(paths, args.kind, compressed=args.compress_existing)
+        logger.info(f"✓ 파일 {converted:,}개 변환 완료")
+
+
+if __name__ == "__main__":
+    main()
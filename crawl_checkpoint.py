@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Crawl Checkpoints
+Durable page tokens and partial results so paginated crawls resume where they stopped.
+"""
+
+import os
+import re
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT_DIR = 'data/checkpoints'
+
+
+class CrawlCheckpoint:
+    """Page token and partial results of one paginated crawl.
+
+    A checkpoint is written after every page that was paid for and removed
+    once the crawl finishes, so a leftover file always means "resume here".
+    """
+
+    def __init__(self, name: str, checkpoint_dir: str = DEFAULT_CHECKPOINT_DIR):
+        """Load an existing checkpoint if there is one.
+
+        Args:
+            name: Crawl identifier, e.g. 'catalog_UUxxxx' or 'comments_VIDEOID'
+            checkpoint_dir: Directory that stores checkpoint files
+        """
+        self.name = name
+        safe_name = re.sub(r'[^\w\-]', '_', name)
+        self.path = os.path.join(checkpoint_dir, f"{safe_name}.json")
+
+        self.page_token: Optional[str] = None
+        self.items: List[Any] = []
+        self.state: Dict[str, Any] = {}
+        self.exists = False
+
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.page_token = data.get('page_token')
+                self.items = data.get('items', [])
+                self.state = data.get('state', {})
+                self.exists = True
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"⚠ 체크포인트 로드 실패, 처음부터 시작합니다: {self.path} ({e})")
+
+    def save(self, page_token: Optional[str], items: List[Any], **state):
+        """Persist progress after a page.
+
+        Args:
+            page_token: Token of the next page to request
+            items: Results collected so far
+            **state: Extra crawl state (counters, parameters)
+        """
+        self.page_token = page_token
+        self.items = items
+        self.state.update(state)
+        self.exists = True
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'name': self.name,
+                'page_token': page_token,
+                'items': items,
+                'state': self.state,
+                'updated_at': datetime.now().isoformat()
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def matches(self, **params) -> bool:
+        """Check that a checkpoint was written with the same crawl parameters."""
+        return all(self.state.get(name) == value for name, value in params.items())
+
+    def clear(self):
+        """Remove the checkpoint after the crawl finished."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.page_token = None
+        self.items = []
+        self.state = {}
+        self.exists = False
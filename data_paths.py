@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Data Paths
+Where per-channel, per-video artifacts live: one resolver for flat and video-ID-sharded directories.
+"""
+
+import os
+import sys
+import argparse
+import logging
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+from compressed_storage import exists, logical_path
+from stage_cache import StageCache
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = 'data'
+DEFAULT_CHANNEL_SLUG = 'chimchakman_official'
+
+# Files go to {directory}/{video_id[:2]}/; 64 characters -> up to 4,096 shards per directory
+SHARD_PREFIX_LENGTH = 2
+
+# Present in a directory that uses the sharded layout
+SHARD_MARKER = '.sharded'
+
+# kind -> (directory name after "{slug}_", file name suffix after the video ID)
+ARTIFACTS = {
+    'comments': ('comments', '_comments.json'),
+    'stats': ('engagement_stats', '_stats.json'),
+    'captions': ('transcripts', '_transcript.txt'),
+    'transcript': ('transcripts', '_whisper_transcript.txt'),
+    'denoised': ('transcripts', '_whisper_transcript_denoised.txt'),
+    'keywords': ('keywords', '_keywords.json'),
+    'sentiment': ('sentiment', '_sentiment.json'),
+}
+
+# Longest first, so *_whisper_transcript.txt is never read as a caption of "{id}_whisper"
+_SUFFIXES = sorted({suffix for _, suffix in ARTIFACTS.values()}, key=len, reverse=True)
+
+
+def channel_path(channel_slug: str, name: str) -> str:
+    """Per-channel file or directory, e.g. channel_path(slug, 'videos.json') -> data/{slug}_videos.json."""
+    return os.path.join(DATA_DIR, f"{channel_slug}_{name}")
+
+
+def artifact_dir(kind: str, channel_slug: str = DEFAULT_CHANNEL_SLUG) -> str:
+    """Directory holding one artifact kind of a channel, e.g. data/{slug}_comments."""
+    return channel_path(channel_slug, ARTIFACTS[kind][0])
+
+
+def shard_of(video_id: str) -> str:
+    """Shard directory name of a video."""
+    return video_id[:SHARD_PREFIX_LENGTH]
+
+
+def is_sharded(directory: str) -> bool:
+    """True if new files in the directory go to shard subdirectories."""
+    return os.path.exists(os.path.join(directory, SHARD_MARKER))
+
+
+def split_name(name: str) -> Optional[Tuple[str, str]]:
+    """(video_id, suffix) of an artifact file name, or None for other files."""
+    name = logical_path(name)
+    for suffix in _SUFFIXES:
+        if name.endswith(suffix) and len(name) > len(suffix):
+            return name[:-len(suffix)], suffix
+    return None
+
+
+def make_artifact_dir(directory: str):
+    """Create an artifact directory; directories created from scratch use the sharded layout."""
+    if os.path.isdir(directory):
+        return
+    os.makedirs(directory, exist_ok=True)
+    Path(directory, SHARD_MARKER).touch()
+
+
+def file_path(directory: str, video_id: str, suffix: str, create: bool = False) -> str:
+    """Logical path of one video's file in an artifact directory.
+
+    Reading falls back to the other layout, so a directory keeps working
+    while it is being migrated.
+
+    Args:
+        directory: Artifact directory, e.g. artifact_dir('comments')
+        video_id: YouTube video ID
+        suffix: File name suffix, e.g. '_comments.json'
+        create: Return the location new files go to and create its directory
+
+    Returns:
+        Path without the .zst suffix (see compressed_storage)
+    """
+    name = video_id + suffix
+    flat = os.path.join(directory, name)
+    sharded = os.path.join(directory, shard_of(video_id), name)
+    if create:
+        make_artifact_dir(directory)
+        if not is_sharded(directory):
+            return flat
+        os.makedirs(os.path.dirname(sharded), exist_ok=True)
+        return sharded
+
+    primary, other = (sharded, flat) if is_sharded(directory) else (flat, sharded)
+    if not exists(primary) and exists(other):
+        return other
+    return primary
+
+
+def artifact_path(kind: str, video_id: str, channel_slug: str = DEFAULT_CHANNEL_SLUG,
+                  create: bool = False) -> str:
+    """Logical path of one artifact of a video (see file_path)."""
+    return file_path(artifact_dir(kind, channel_slug), video_id, ARTIFACTS[kind][1], create)
+
+
+def _listing(directory: str):
+    """Files of an artifact directory in both layouts, sharded entries last."""
+    if not os.path.isdir(directory):
+        return
+    shards = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                if len(entry.name) == SHARD_PREFIX_LENGTH:
+                    shards.append(entry.path)
+            elif not entry.name.startswith('.') and not entry.name.endswith('.tmp'):
+                yield entry
+    for shard in shards:
+        with os.scandir(shard) as entries:
+            for entry in entries:
+                if not entry.is_dir() and not entry.name.endswith('.tmp'):
+                    yield entry
+
+
+def _video_id(name: str, suffix: str) -> Optional[str]:
+    parts = split_name(name)
+    if parts is not None:
+        return parts[0] if parts[1] == suffix else None
+    # Suffixes of files outside ARTIFACTS, e.g. '.mp3' in the audio cache
+    name = logical_path(name)
+    return name[:-len(suffix)] if name.endswith(suffix) and len(name) > len(suffix) else None
+
+
+def scan_files(directory: str, suffix: str) -> Iterator[Tuple[str, os.DirEntry]]:
+    """(video_id, directory entry) of every file with a suffix, in both layouts.
+
+    Entries are the files as stored (possibly .zst); one listing of the
+    directory plus one per shard, no per-file stat.
+    """
+    for entry in _listing(directory):
+        video_id = _video_id(entry.name, suffix)
+        if video_id is not None:
+            yield video_id, entry
+
+
+def find_files(directory: str, suffix: str) -> Dict[str, Path]:
+    """Every video's file with a suffix, whichever layout and form it is stored in.
+
+    Args:
+        directory: Artifact directory
+        suffix: File name suffix, e.g. '_stats.json'
+
+    Returns:
+        {video_id: logical path}, sorted by video ID
+    """
+    found = {}
+    for video_id, entry in scan_files(directory, suffix):
+        # Shard entries come last, so they win over a flat copy left by an interrupted migration
+        found[video_id] = Path(logical_path(entry.path))
+    return dict(sorted(found.items()))
+
+
+def artifacts(kind: str, channel_slug: str = DEFAULT_CHANNEL_SLUG) -> Dict[str, Path]:
+    """{video_id: logical path} of every artifact of a kind (see find_files)."""
+    return find_files(artifact_dir(kind, channel_slug), ARTIFACTS[kind][1])
+
+
+def migrate(directory: str, sharded: bool = True) -> Dict[str, str]:
+    """Move an artifact directory to the sharded (or back to the flat) layout.
+
+    Files are renamed in place, so nothing is copied and the directory stays
+    readable throughout: the layout switch happens first so new files land in
+    the target layout, and readers look in both places until every file is
+    moved. Re-running after an interruption resumes; if a file exists in
+    both places the newer one is kept.
+
+    Args:
+        directory: Artifact directory
+        sharded: Target layout
+
+    Returns:
+        {old path: new path} of every file moved, as stored (possibly .zst)
+    """
+    directory = os.path.normpath(directory)
+    if not os.path.isdir(directory):
+        return {}
+    marker = os.path.join(directory, SHARD_MARKER)
+    if sharded:
+        Path(marker).touch()
+    elif os.path.exists(marker):
+        os.remove(marker)
+
+    moved = {}
+    shard_dirs = set()
+    for entry in list(_listing(directory)):
+        parts = split_name(entry.name)
+        if parts is None:
+            continue
+        parent = os.path.dirname(entry.path)
+        if sharded == (parent != directory):
+            continue
+        target_dir = os.path.join(directory, shard_of(parts[0])) if sharded else directory
+        if not sharded:
+            shard_dirs.add(parent)
+        os.makedirs(target_dir, exist_ok=True)
+        target = os.path.join(target_dir, entry.name)
+        if os.path.exists(target) and os.path.getmtime(target) >= entry.stat().st_mtime:
+            os.remove(entry.path)
+        else:
+            os.replace(entry.path, target)
+            moved[entry.path] = target
+
+    for shard in shard_dirs:
+        try:
+            os.rmdir(shard)
+        except OSError:
+            pass
+    return moved
+
+
+def main():
+    """Command-line entry point."""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(
+        description='비디오별 산출물 디렉토리 구조 (평면 / 비디오 ID 샤딩)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python data_paths.py                      # 디렉토리별 구조와 파일 수
+  python data_paths.py --migrate            # 전체를 샤딩 구조로 이동 (복사 없음)
+  python data_paths.py --migrate comments stats
+  python data_paths.py --flatten            # 평면 구조로 되돌리기
+        """
+    )
+    parser.add_argument('--channel', default=DEFAULT_CHANNEL_SLUG, help=f'채널 슬러그 (기본값: {DEFAULT_CHANNEL_SLUG})')
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--migrate', nargs='*', choices=sorted(ARTIFACTS), default=None,
+                       help='샤딩 구조로 이동할 종류 (생략 시 전체)')
+    group.add_argument('--flatten', nargs='*', choices=sorted(ARTIFACTS), default=None,
+                       help='평면 구조로 되돌릴 종류 (생략 시 전체)')
+    args = parser.parse_args()
+
+    selected = args.migrate if args.migrate is not None else args.flatten
+    if selected is not None:
+        # Kinds sharing a directory (captions/transcript/denoised) move together
+        directories = sorted({artifact_dir(kind, args.channel) for kind in selected or ARTIFACTS})
+        moves = {}
+        for directory in directories:
+            if not os.path.isdir(directory):
+                continue
+            moved = migrate(directory, sharded=args.migrate is not None)
+            moves.update(moved)
+            logger.info(f"✓ {directory}: 파일 {len(moved):,}개 이동")
+
+        if moves:
+            # Keep recorded paths valid so nothing is re-hashed or recomputed;
+            # artifact_manifest builds on this module, so it is imported only here
+            from artifact_manifest import ArtifactManifest
+            with ArtifactManifest() as manifest:
+                updated = manifest.move_paths(moves)
+            with StageCache() as cache:
+                cached = cache.move_outputs({logical_path(old): logical_path(new) for old, new in moves.items()})
+            logger.info(f"✓ 경로 갱신: 산출물 목록 {updated:,}개, 단계 캐시 {cached:,}개")
+
+    found_any = False
+    for directory in sorted({artifact_dir(kind, args.channel) for kind in ARTIFACTS}):
+        if not os.path.isdir(directory):
+            continue
+        found_any = True
+        files = sum(1 for _ in _listing(directory))
+        layout = '샤딩' if is_sharded(directory) else '평면'
+        print(f"{directory:<48}{layout:>4}{files:>10,}개")
+    if not found_any:
+        logger.warning(f"⚠ {args.channel} 채널의 산출물 디렉토리가 없습니다.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
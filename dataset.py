@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Video Dataset
+Video catalog and latest engagement stats consolidated into one typed Parquet file.
+"""
+
+import os
+import sys
+import json
+import argparse
+import logging
+from typing import Dict, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from data_paths import DEFAULT_CHANNEL_SLUG, artifact_dir, channel_path, find_files
+
+logger = logging.getLogger(__name__)
+
+CATALOG_COLUMNS = ['video_id', 'title', 'description', 'published_at', 'thumbnail', 'duration_seconds']
+STATS_COLUMNS = ['view_count', 'like_count', 'comment_count', 'favorite_count', 'stats_collected_at']
+
+# mtime of the *_stats.json each row was read from; lets rebuilds skip unchanged files
+MTIME_COLUMN = 'stats_mtime'
+
+
+def dataset_path(channel_slug: str) -> str:
+    return channel_path(channel_slug, 'dataset.parquet')
+
+
+def _typed_catalog(rows: List[Dict]) -> pd.DataFrame:
+    """Catalog entries from _videos.json as a typed frame."""
+    frame = pd.DataFrame(rows, columns=CATALOG_COLUMNS)
+    for column in ('video_id', 'title', 'description', 'thumbnail'):
+        frame[column] = frame[column].astype('string')
+    frame['published_at'] = pd.to_datetime(frame['published_at'], utc=True)
+    frame['duration_seconds'] = frame['duration_seconds'].astype('Int32')
+    return frame
+
+
+def _typed_stats(rows: List[Dict]) -> pd.DataFrame:
+    """Parsed *_stats.json snapshots as a typed frame."""
+    frame = pd.DataFrame(rows, columns=['video_id'] + STATS_COLUMNS + [MTIME_COLUMN])
+    frame['video_id'] = frame['video_id'].astype('string')
+    for column in ('view_count', 'like_count', 'comment_count', 'favorite_count'):
+        frame[column] = frame[column].astype('Int64')
+    # Naive local time, as written by the collector
+    frame['stats_collected_at'] = pd.to_datetime(frame['stats_collected_at'], format='ISO8601')
+    frame[MTIME_COLUMN] = frame[MTIME_COLUMN].astype('float64')
+    return frame
+
+
+def _read_metadata(path: str) -> Dict[str, str]:
+    metadata = pq.read_schema(path).metadata or {}
+    return {key.decode(): value.decode() for key, value in metadata.items() if not key.startswith(b'pandas')}
+
+
+def build_dataset(channel_slug: str = DEFAULT_CHANNEL_SLUG, force: bool = False) -> str:
+    """Create or incrementally update the Parquet dataset of a channel.
+
+    Only *_stats.json files whose mtime changed since the last build are
+    parsed; the catalog is re-read only when _videos.json changed.
+
+    Args:
+        channel_slug: Channel slug (data/{slug}_videos.json, data/{slug}_engagement_stats/)
+        force: Rebuild from scratch
+
+    Returns:
+        Path to the Parquet file
+    """
+    path = dataset_path(channel_slug)
+    videos_file = channel_path(channel_slug, 'videos.json')
+    stats_dir = artifact_dir('stats', channel_slug)
+
+    previous = None
+    metadata = {}
+    if not force and os.path.exists(path):
+        previous = pq.read_table(path).to_pandas()
+        metadata = _read_metadata(path)
+
+    # Catalog: one file, re-read when it changed
+    videos_mtime = os.path.getmtime(videos_file) if os.path.exists(videos_file) else None
+    if previous is not None and metadata.get('videos_mtime') == repr(videos_mtime):
+        catalog = previous.loc[previous['published_at'].notna() | previous['title'].notna(), CATALOG_COLUMNS]
+    else:
+        videos = []
+        if videos_mtime is not None:
+            with open(videos_file, 'r', encoding='utf-8') as f:
+                videos = [{column: video.get(column) for column in CATALOG_COLUMNS} for video in json.load(f)]
+        catalog = _typed_catalog(videos)
+
+    # Stats: reuse rows whose source file did not change
+    stats_files = find_files(stats_dir, '_stats.json')
+    mtimes: Dict[str, float] = {video_id: os.path.getmtime(path) for video_id, path in stats_files.items()}
+
+    reused = _typed_stats([])
+    if previous is not None:
+        known = previous[previous[MTIME_COLUMN].notna()]
+        unchanged = known['video_id'].map(mtimes) == known[MTIME_COLUMN]
+        reused = known.loc[unchanged, ['video_id'] + STATS_COLUMNS + [MTIME_COLUMN]]
+
+    reused_ids = set(reused['video_id'])
+    parsed = []
+    for video_id, mtime in mtimes.items():
+        if video_id in reused_ids:
+            continue
+        stats_file = stats_files[video_id]
+        try:
+            with open(stats_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"⚠ 통계 파일 로드 실패: {stats_file} ({e})")
+            continue
+        parsed.append({
+            'video_id': video_id,
+            'view_count': data.get('view_count'),
+            'like_count': data.get('like_count'),
+            'comment_count': data.get('comment_count'),
+            'favorite_count': data.get('favorite_count'),
+            'stats_collected_at': data.get('collected_at'),
+            MTIME_COLUMN: mtime,
+        })
+
+    stats = pd.concat([reused, _typed_stats(parsed)], ignore_index=True) if parsed else reused
+    frame = catalog.merge(stats, on='video_id', how='outer')
+    frame = frame.sort_values('published_at', ascending=False, na_position='last', ignore_index=True)
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        b'channel_slug': channel_slug.encode(),
+        b'videos_mtime': repr(videos_mtime).encode(),
+    })
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    pq.write_table(table, tmp_path, compression='zstd')
+    os.replace(tmp_path, path)
+
+    logger.info(f"✓ 데이터셋 갱신: 비디오 {len(frame):,}개 (통계 파일 {len(parsed):,}개 새로 읽음) → {path}")
+    return path
+
+
+def is_stale(channel_slug: str = DEFAULT_CHANNEL_SLUG) -> bool:
+    """Check whether JSON newer than the dataset has landed (stat calls only)."""
+    path = dataset_path(channel_slug)
+    if not os.path.exists(path):
+        return True
+    built = os.path.getmtime(path)
+
+    videos_file = channel_path(channel_slug, 'videos.json')
+    if os.path.exists(videos_file) and os.path.getmtime(videos_file) > built:
+        return True
+
+    stats_dir = artifact_dir('stats', channel_slug)
+    if os.path.isdir(stats_dir):
+        if os.path.getmtime(stats_dir) > built:
+            return True
+        return any(os.path.getmtime(path) > built for path in find_files(stats_dir, '_stats.json').values())
+    return False
+
+
+def load_dataset(channel_slug: str = DEFAULT_CHANNEL_SLUG, columns: Optional[List[str]] = None,
+                 refresh: bool = True) -> pd.DataFrame:
+    """Load the catalog + latest stats of a channel as one DataFrame.
+
+    Args:
+        channel_slug: Channel slug
+        columns: Subset of columns to read (default: all)
+        refresh: Update the Parquet file first if newer JSON exists
+
+    Returns:
+        DataFrame with one row per video: duration_seconds (Int32), counts
+        (Int64, missing when no stats were collected), published_at
+        (datetime64, UTC) and stats_collected_at (datetime64, local time)
+    """
+    if refresh and is_stale(channel_slug):
+        build_dataset(channel_slug)
+    frame = pd.read_parquet(dataset_path(channel_slug), columns=columns)
+    if columns is None:
+        frame = frame.drop(columns=[MTIME_COLUMN])
+    return frame
+
+
+def main():
+    """Command-line entry point."""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='비디오 목록 + 최신 참여도 통계 Parquet 데이터셋 생성')
+    parser.add_argument('channel_slug', nargs='?', default=DEFAULT_CHANNEL_SLUG,
+                        help=f'채널 슬러그 (기본값: {DEFAULT_CHANNEL_SLUG})')
+    parser.add_argument('--rebuild', action='store_true', help='기존 데이터셋을 무시하고 처음부터 생성')
+    args = parser.parse_args()
+
+    if args.rebuild or is_stale(args.channel_slug):
+        build_dataset(args.channel_slug, force=args.rebuild)
+    else:
+        logger.info("데이터셋이 최신 상태입니다.")
+
+    frame = load_dataset(args.channel_slug, refresh=False)
+    if frame.empty:
+        logger.warning("⚠ 데이터셋이 비어 있습니다.")
+        sys.exit(1)
+    logger.info(f"비디오 {len(frame):,}개, 통계 있음 {frame['view_count'].notna().sum():,}개")
+    print(frame.dtypes.to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,13 @@ import argparse
 import re
 import os
 
+from artifact_manifest import record_artifact
+from compressed_storage import logical_path, read_text
+from data_paths import artifact_dir, find_files
+from stage_cache import code_fingerprint, run_stage
+
+TRANSCRIPTS_DIR = artifact_dir("transcript")
+
 
 def remove_repeated_interjections(text: str) -> str:
     """
@@ -118,16 +125,16 @@ def preserve_metadata(text: str) -> tuple:
     metadata_lines = []
     content_start = 0
     
-    for i, line in enumerate(lines):
+    for i, line in enumerate(lines[:10]):
         # 메타데이터 패턴 감지
-        if ':' in line and i < 10:
-            if any(key in line for key in ['Video ID', 'Title', 'Model', 'Duration']):
-                metadata_lines.append(line)
-                content_start = i + 1
-            elif line.strip() == '-' * len(line.strip()):
-                metadata_lines.append(line)
-                content_start = i + 1
-                break
+        if ':' in line and any(key in line for key in ['Video ID', 'Title', 'Model', 'Duration']):
+            metadata_lines.append(line)
+            content_start = i + 1
+        elif line.strip() and line.strip() == '-' * len(line.strip()):
+            # 구분선까지 메타데이터 (본문에 섞이면 공백 정리 때 한 줄로 합쳐짐)
+            metadata_lines.append(line)
+            content_start = i + 1
+            break
     
     metadata = '\n'.join(metadata_lines)
     content = '\n'.join(lines[content_start:])
@@ -179,10 +186,9 @@ def process_file(input_file: str, aggressive: bool = False, verbose: bool = True
     """
     파일 처리 및 저장
     """
-    # 입력 파일 읽기
+    # 입력 파일 읽기 (.zst 압축 파일도 그대로 읽음)
     try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            original_text = f.read()
+        original_text = read_text(input_file)
     except Exception as e:
         print(f"❌ 파일 읽기 실패: {e}")
         return None
@@ -198,7 +204,7 @@ def process_file(input_file: str, aggressive: bool = False, verbose: bool = True
     denoised_length = len(denoised_text)
     
     # 출력 파일명 생성
-    base_name = os.path.splitext(input_file)[0]
+    base_name = os.path.splitext(logical_path(input_file))[0]
     output_file = f"{base_name}_denoised.txt"
     
     # 저장
@@ -208,6 +214,7 @@ def process_file(input_file: str, aggressive: bool = False, verbose: bool = True
     except Exception as e:
         print(f"❌ 파일 저장 실패: {e}")
         return None
+    record_artifact('denoised', output_file, tool=f"denoiser:{'aggressive' if aggressive else 'default'}")
     
     # 결과 출력
     if verbose:
@@ -236,6 +243,29 @@ def process_file(input_file: str, aggressive: bool = False, verbose: bool = True
     return output_file
 
 
+def denoise_directory(directory: str = TRANSCRIPTS_DIR, aggressive: bool = False, force: bool = False) -> dict:
+    """
+    디렉토리의 모든 Whisper 자막 노이즈 제거 (바뀐 것만 다시 계산)
+    
+    자막 내용, 노이즈 제거 함수 코드, aggressive 설정 중 하나라도 바뀐 비디오만 처리
+    
+    Returns:
+        {'computed': n, 'reused': n, 'failed': n}
+    """
+    version = code_fingerprint(
+        preserve_metadata, remove_repeated_interjections, remove_repeated_words,
+        remove_filler_words_excessive, remove_stuttering, remove_noise_patterns,
+        clean_punctuation, normalize_spacing, denoise_transcript,
+        config={'aggressive': aggressive}
+    )
+    inputs = {video_id: str(path) for video_id, path in find_files(directory, "_whisper_transcript.txt").items()}
+    return run_stage(
+        'denoise', version, inputs,
+        lambda video_id, path: process_file(path, aggressive=aggressive, verbose=False),
+        force=force
+    )
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='STT 자막 노이즈 제거 도구',
@@ -245,6 +275,7 @@ def main():
   python denoise_stt.py H5lz6_hqCNw_whisper_transcript.txt
   python denoise_stt.py input.txt --aggressive
   python denoise_stt.py input.txt --quiet
+  python denoise_stt.py --all                 # 전체 자막 (코드/설정/자막이 바뀐 것만 다시 처리)
   
 제거되는 노이즈:
   ✓ 반복 감탄사 (아... 아... 아...)
@@ -260,9 +291,24 @@ def main():
     
     parser.add_argument(
         'input_file',
+        nargs='?',
         help='입력 STT 자막 파일'
     )
     
+    parser.add_argument(
+        '--all',
+        nargs='?',
+        const=TRANSCRIPTS_DIR,
+        metavar='DIR',
+        help=f'디렉토리의 모든 자막 처리 (기본값: {TRANSCRIPTS_DIR})'
+    )
+    
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='--all 에서 바뀌지 않은 자막도 다시 처리'
+    )
+    
     parser.add_argument(
         '--aggressive',
         '-a',
@@ -284,6 +330,14 @@ def main():
         print("🧹 STT 자막 노이즈 제거")
         print("=" * 80)
     
+    if args.all:
+        counts = denoise_directory(args.all, aggressive=args.aggressive, force=args.force)
+        print(f"\n✅ 새로 처리: {counts['computed']}개, 재사용: {counts['reused']}개, 실패: {counts['failed']}개")
+        return 1 if counts['failed'] else 0
+    
+    if not args.input_file:
+        parser.error('input_file 또는 --all 이 필요합니다.')
+    
     output_file = process_file(
         args.input_file,
         aggressive=args.aggressive,
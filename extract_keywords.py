@@ -13,6 +13,9 @@ from typing import List, Dict, Tuple
 from collections import Counter
 import re
 
+from artifact_manifest import record_artifact, video_id_from_path
+from compressed_storage import read_text
+
 
 def extract_with_hf_ner(text: str, top_n: int = 10) -> List[Tuple[str, float]]:
     """Hugging Face NER 파이프라인"""
@@ -173,8 +176,7 @@ def extract_keywords_comprehensive(file_path: str, top_n: int = 20) -> Dict:
     print(f"\n📄 파일: {file_path}")
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            text = f.read()
+        text = read_text(file_path)
     except Exception as e:
         print(f"❌ 파일 읽기 실패: {e}")
         return None
@@ -264,6 +266,8 @@ def main():
         with open(args.output, 'w', encoding='utf-8') as f:
             json.dump(result, f, ensure_ascii=False, indent=2)
         print(f"\n💾 저장: {args.output}")
+        record_artifact('keywords', args.output, tool='extract_keywords:comprehensive',
+                        video_id=video_id_from_path(args.input_file))
     
     print("\n" + "=" * 80)
     print(f"✅ 완료! ({len(result['methods_used'])}개 방법 사용)")
@@ -11,6 +11,16 @@ import re
 import os
 import sys
 import subprocess
+import contextlib
+import io
+
+from artifact_manifest import record_artifact, video_id_from_path
+from compressed_storage import read_text
+from data_paths import artifact_dir, file_path, find_files
+from stage_cache import code_fingerprint, run_stage
+
+TRANSCRIPTS_DIR = artifact_dir('denoised')
+KEYWORDS_DIR = artifact_dir('keywords')
 
 # JAVA_HOME 자동 설정 (KoNLPy용)
 def setup_java_home():
@@ -347,6 +357,39 @@ def extract_keywords_contextual(text: str, top_n: int = 10, use_konlpy: bool = T
     }
 
 
+def extract_keywords_directory(directory: str = TRANSCRIPTS_DIR, output_dir: str = KEYWORDS_DIR,
+                               top_n: int = 10, use_konlpy: bool = True, force: bool = False) -> dict:
+    """
+    노이즈 제거된 자막 전체에서 키워드 추출 (바뀐 것만 다시 계산)
+    
+    자막 내용, 추출 함수 코드(불용어 사전 포함), 설정 중 하나라도 바뀐 비디오만 처리하고
+    결과는 {output_dir}/{video_id}_keywords.json 에 저장
+    
+    Returns:
+        {'computed': n, 'reused': n, 'failed': n}
+    """
+    use_konlpy = use_konlpy and JAVA_AVAILABLE
+    version = code_fingerprint(
+        extract_metadata_and_content, extract_nouns_with_konlpy, extract_nouns_simple,
+        get_extended_stopwords, filter_by_frequency_and_length, detect_named_entities_simple,
+        rank_keywords_by_relevance, extract_keywords_contextual,
+        config={'top_n': top_n, 'use_konlpy': use_konlpy}
+    )
+    def compute(video_id: str, path: str) -> str:
+        # 비디오마다 출력되는 단계별 로그는 숨김
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = extract_keywords_contextual(read_text(path), top_n=top_n, use_konlpy=use_konlpy)
+        output_file = file_path(output_dir, video_id, '_keywords.json', create=True)
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        record_artifact('keywords', output_file, tool='extract_keywords_contextual', video_id=video_id)
+        return output_file
+    
+    inputs = {video_id: str(path)
+              for video_id, path in find_files(directory, '_whisper_transcript_denoised.txt').items()}
+    return run_stage('keywords', version, inputs, compute, force=force)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='문맥 기반 키워드 추출 (한국어 STT 최적화)',
@@ -355,24 +398,37 @@ def main():
   python extract_keywords_contextual.py input_denoised.txt
   python extract_keywords_contextual.py input.txt --top 15 --no-konlpy
   python extract_keywords_contextual.py input.txt --output result.json
+  python extract_keywords_contextual.py --all   # 전체 denoised 자막 (바뀐 것만 다시 처리)
         """
     )
     
-    parser.add_argument('input_file', help='입력 파일 (denoised 권장)')
+    parser.add_argument('input_file', nargs='?', help='입력 파일 (denoised 권장)')
     parser.add_argument('--top', type=int, default=10, help='키워드 개수')
     parser.add_argument('--no-konlpy', action='store_true', help='형태소 분석 안함')
     parser.add_argument('--output', help='JSON 출력')
+    parser.add_argument('--all', nargs='?', const=TRANSCRIPTS_DIR, metavar='DIR',
+                        help=f'디렉토리의 모든 *_denoised.txt 처리 (기본값: {TRANSCRIPTS_DIR})')
+    parser.add_argument('--output-dir', default=KEYWORDS_DIR, help=f'--all 결과 디렉토리 (기본값: {KEYWORDS_DIR})')
+    parser.add_argument('--force', action='store_true', help='--all 에서 바뀌지 않은 자막도 다시 처리')
     
     args = parser.parse_args()
     
+    if args.all:
+        counts = extract_keywords_directory(args.all, args.output_dir, top_n=args.top,
+                                            use_konlpy=not args.no_konlpy, force=args.force)
+        print(f"✅ 새로 추출: {counts['computed']}개, 재사용: {counts['reused']}개, 실패: {counts['failed']}개")
+        return
+    
+    if not args.input_file:
+        parser.error('input_file 또는 --all 이 필요합니다.')
+    
     print("=" * 80)
     print("🎯 문맥 기반 키워드 추출")
     print("=" * 80)
     
     # 파일 읽기
     print(f"\n📄 파일: {args.input_file}")
-    with open(args.input_file, 'r', encoding='utf-8') as f:
-        text = f.read()
+    text = read_text(args.input_file)
     
     print(f"✓ 텍스트: {len(text):,} 글자")
     
@@ -417,6 +473,8 @@ def main():
         with open(args.output, 'w', encoding='utf-8') as f:
             json.dump(result, f, ensure_ascii=False, indent=2)
         print(f"\n💾 저장: {args.output}")
+        record_artifact('keywords', args.output, tool='extract_keywords_contextual',
+                        video_id=video_id_from_path(args.input_file))
     
     print("\n" + "=" * 80)
     print("✅ 완료!")
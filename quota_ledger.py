@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+YouTube Data API Quota Ledger
+Tracks quota units spent per API key and schedules requests across a key pool.
+"""
+
+import os
+import json
+import time
+import random
+import hashlib
+import threading
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+
+from rate_limiter import TokenBucket
+from response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+# Daily quota per API key (YouTube Data API v3 default)
+DAILY_QUOTA = 10000
+
+# Quota resets at midnight Pacific Time
+QUOTA_TIMEZONE = ZoneInfo('America/Los_Angeles')
+
+# Unit cost per endpoint (https://developers.google.com/youtube/v3/determine_quota_cost)
+ENDPOINT_COSTS = {
+    'search.list': 100,
+    'channels.list': 1,
+    'playlistItems.list': 1,
+    'videos.list': 1,
+    'commentThreads.list': 1,
+    'comments.list': 1,
+}
+
+DEFAULT_LEDGER_PATH = 'data/quota_ledger.json'
+
+# Error reasons that mean a key's daily quota is spent (until the Pacific-time reset)
+QUOTA_REASONS = ('quotaExceeded', 'dailyLimitExceeded')
+
+# Per-second throttling: retried on the same key with jittered exponential backoff
+RATE_LIMIT_REASONS = ('rateLimitExceeded', 'userRateLimitExceeded')
+RATE_LIMIT_RETRIES = 6
+RATE_LIMIT_BASE_DELAY = 1.0
+RATE_LIMIT_MAX_DELAY = 60.0
+
+
+class QuotaExhaustedError(Exception):
+    """Raised when every API key in the pool has spent its daily quota."""
+
+    def __init__(self, reset_at: datetime):
+        self.reset_at = reset_at
+        super().__init__(f"모든 API 키의 쿼터가 소진되었습니다 (리셋: {reset_at.isoformat()})")
+
+
+def load_api_keys(primary_key: Optional[str] = None) -> List[str]:
+    """Collect API keys from an explicit key and the YOUTUBE_API_KEYS variable.
+
+    Args:
+        primary_key: Key passed on the command line or YOUTUBE_API_KEY
+
+    Returns:
+        De-duplicated list of API keys, primary key first
+    """
+    keys = []
+    if primary_key:
+        keys.extend(k.strip() for k in primary_key.split(','))
+    keys.extend(k.strip() for k in os.getenv('YOUTUBE_API_KEYS', '').split(','))
+
+    unique_keys = []
+    for key in keys:
+        if key and key not in unique_keys:
+            unique_keys.append(key)
+    return unique_keys
+
+
+def endpoint_cost(endpoint: str) -> int:
+    """Return the quota cost of an endpoint such as 'videos.list'."""
+    return ENDPOINT_COSTS.get(endpoint, 1)
+
+
+def _has_reason(status: Optional[int], content, reasons) -> bool:
+    if status not in (403, 429):
+        return False
+    content = content.decode('utf-8', errors='ignore') if isinstance(content, bytes) else str(content)
+    return any(reason in content for reason in reasons)
+
+
+def is_quota_response(status: Optional[int], content) -> bool:
+    """Check whether an error response means the key's daily quota is spent.
+
+    Per-second throttling (rateLimitExceeded) is not exhaustion; see
+    is_rate_limit_response.
+
+    Args:
+        status: HTTP status code
+        content: Response body (bytes or str)
+    """
+    return _has_reason(status, content, QUOTA_REASONS)
+
+
+def is_rate_limit_response(status: Optional[int], content) -> bool:
+    """Check whether an error response is short-lived per-second throttling."""
+    return _has_reason(status, content, RATE_LIMIT_REASONS)
+
+
+def is_quota_error(error: HttpError) -> bool:
+    """Check whether an HttpError means the key's daily quota is spent."""
+    return is_quota_response(getattr(error.resp, 'status', None), error.content)
+
+
+def is_rate_limit_error(error: HttpError) -> bool:
+    """Check whether an HttpError is per-second throttling."""
+    return is_rate_limit_response(getattr(error.resp, 'status', None), error.content)
+
+
+def rate_limit_delay(attempt: int) -> float:
+    """Seconds to wait before retry number attempt (0-based) of a throttled request.
+
+    Exponential backoff with jitter, so workers throttled together do not
+    retry in lockstep.
+    """
+    ceiling = min(RATE_LIMIT_MAX_DELAY, RATE_LIMIT_BASE_DELAY * 2 ** attempt)
+    return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+
+class QuotaLedger:
+    """Persistent record of quota units spent per API key and quota day."""
+
+    def __init__(self, path: str = DEFAULT_LEDGER_PATH, daily_quota: int = DAILY_QUOTA):
+        """Load the ledger from disk.
+
+        Args:
+            path: JSON file that stores the ledger
+            daily_quota: Units available per key per day
+        """
+        self.path = path
+        self.daily_quota = daily_quota
+        self._lock = threading.Lock()
+        self._state = {'keys': {}}
+
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._state = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"⚠ 쿼터 장부 로드 실패, 새로 시작합니다: {e}")
+
+    @staticmethod
+    def key_id(api_key: str) -> str:
+        """Short, non-reversible identifier so raw keys never hit the disk."""
+        return hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:12]
+
+    @staticmethod
+    def quota_day(now: Optional[datetime] = None) -> str:
+        """Current quota day in Pacific Time (YYYY-MM-DD)."""
+        now = now or datetime.now(QUOTA_TIMEZONE)
+        return now.astimezone(QUOTA_TIMEZONE).strftime('%Y-%m-%d')
+
+    @staticmethod
+    def reset_time(now: Optional[datetime] = None) -> datetime:
+        """Next quota reset (midnight Pacific Time)."""
+        now = (now or datetime.now(QUOTA_TIMEZONE)).astimezone(QUOTA_TIMEZONE)
+        tomorrow = (now + timedelta(days=1)).date()
+        return datetime(tomorrow.year, tomorrow.month, tomorrow.day, tzinfo=QUOTA_TIMEZONE)
+
+    def _entry(self, api_key: str) -> Dict:
+        """Return today's entry for a key, starting a new day if needed."""
+        key_id = self.key_id(api_key)
+        today = self.quota_day()
+        entry = self._state['keys'].get(key_id)
+        if not entry or entry.get('day') != today:
+            entry = {'day': today, 'used': 0, 'by_endpoint': {}, 'exhausted': False}
+            self._state['keys'][key_id] = entry
+        return entry
+
+    def _save(self):
+        """Write the ledger atomically (caller holds the lock)."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def record(self, api_key: str, endpoint: str, units: Optional[int] = None):
+        """Record units spent by one request.
+
+        Args:
+            api_key: Key used for the request
+            endpoint: Endpoint name such as 'videos.list'
+            units: Units spent (default: ENDPOINT_COSTS lookup)
+        """
+        units = endpoint_cost(endpoint) if units is None else units
+        with self._lock:
+            entry = self._entry(api_key)
+            entry['used'] += units
+            entry['by_endpoint'][endpoint] = entry['by_endpoint'].get(endpoint, 0) + units
+            self._save()
+
+    def mark_exhausted(self, api_key: str):
+        """Flag a key as exhausted for the rest of the quota day."""
+        with self._lock:
+            entry = self._entry(api_key)
+            entry['exhausted'] = True
+            self._save()
+
+    def used(self, api_key: str) -> int:
+        """Units spent today by a key."""
+        with self._lock:
+            return self._entry(api_key)['used']
+
+    def remaining(self, api_key: str) -> int:
+        """Units left today for a key (0 once the API reported exhaustion)."""
+        with self._lock:
+            entry = self._entry(api_key)
+            if entry['exhausted']:
+                return 0
+            return max(self.daily_quota - entry['used'], 0)
+
+
+class QuotaScheduler:
+    """Routes API requests to the key with the most quota left."""
+
+    def __init__(self, api_keys: List[str], ledger: Optional[QuotaLedger] = None,
+                 wait_for_reset: bool = False, rate_limiter: Optional[TokenBucket] = None,
+                 cache: Optional[ResponseCache] = None):
+        """Initialize the key pool.
+
+        Args:
+            api_keys: YouTube Data API v3 keys
+            ledger: Quota ledger (default: data/quota_ledger.json)
+            wait_for_reset: Sleep until the daily reset instead of raising
+                QuotaExhaustedError when every key is exhausted
+            rate_limiter: Token bucket shared by every caller of this scheduler
+            cache: On-disk response cache (fresh entries cost no quota)
+        """
+        if not api_keys:
+            raise ValueError("API 키가 최소 1개 필요합니다.")
+        self.api_keys = list(api_keys)
+        self.ledger = ledger or QuotaLedger()
+        self.wait_for_reset = wait_for_reset
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        # httplib2 is not thread-safe, so every worker thread builds its own clients
+        self._local = threading.local()
+
+    def client(self, api_key: str):
+        """Return this thread's googleapiclient resource for a key (built once per thread)."""
+        clients = getattr(self._local, 'clients', None)
+        if clients is None:
+            clients = self._local.clients = {}
+        if api_key not in clients:
+            clients[api_key] = build('youtube', 'v3', developerKey=api_key)
+        return clients[api_key]
+
+    def remaining(self) -> int:
+        """Units left today across the whole key pool."""
+        return sum(self.ledger.remaining(key) for key in self.api_keys)
+
+    def pick_key(self, units: int = 1) -> Optional[str]:
+        """Choose the key with the most remaining quota that can afford a request.
+
+        Args:
+            units: Cost of the request
+
+        Returns:
+            API key, or None if no key can afford it
+        """
+        best_key, best_remaining = None, 0
+        for key in self.api_keys:
+            remaining = self.ledger.remaining(key)
+            if remaining >= units and remaining > best_remaining:
+                best_key, best_remaining = key, remaining
+        return best_key
+
+    def acquire_key(self, endpoint: str) -> str:
+        """Pick a key for an endpoint, waiting for the reset or raising if none is left.
+
+        Args:
+            endpoint: Endpoint name such as 'videos.list'
+
+        Returns:
+            API key to use
+        """
+        units = endpoint_cost(endpoint)
+        while True:
+            key = self.pick_key(units)
+            if key:
+                return key
+
+            reset_at = self.ledger.reset_time()
+            if not self.wait_for_reset:
+                raise QuotaExhaustedError(reset_at)
+
+            wait_seconds = max((reset_at - datetime.now(QUOTA_TIMEZONE)).total_seconds(), 0) + 60
+            logger.warning(f"⏸ 모든 API 키 쿼터 소진 - {reset_at.isoformat()}까지 대기 ({wait_seconds/3600:.1f}시간)")
+            time.sleep(wait_seconds)
+
+    def execute(self, endpoint: str, make_request: Callable):
+        """Execute a request on the best available key and record its cost.
+
+        Args:
+            endpoint: Endpoint name such as 'videos.list'
+            make_request: Function that takes a youtube client and returns
+                an unexecuted request, e.g. lambda yt: yt.videos().list(...)
+
+        Returns:
+            API response dictionary
+        """
+        return self.execute_dated(endpoint, make_request)[0]
+
+    def execute_dated(self, endpoint: str, make_request: Callable) -> Tuple[Dict, float]:
+        """Like execute, but also return when the response was fetched from the API.
+
+        A response served from the cache is as old as its cache entry, so
+        point-in-time data such as statistics must be stamped with this
+        time rather than the current one.
+
+        Returns:
+            (API response dictionary, fetch time in epoch seconds)
+        """
+        cached = params = None
+        if self.cache:
+            # Building a request is free; only its parameters are needed for the cache key
+            params = ResponseCache.params_from_uri(make_request(self.client(self.api_keys[0])).uri)
+            cached = self.cache.lookup(endpoint, params)
+            if cached and cached.fresh:
+                self.cache.hits += 1
+                return cached.body, cached.fetched_at
+
+        key = None
+        throttled = 0
+        while True:
+            if key is None:
+                key = self.acquire_key(endpoint)
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            request = make_request(self.client(key))
+            if cached and cached.etag:
+                request.headers['If-None-Match'] = cached.etag
+            try:
+                response = request.execute()
+            except HttpError as e:
+                if cached and getattr(e.resp, 'status', None) == 304:
+                    self.ledger.record(key, endpoint)
+                    self.cache.revalidated += 1
+                    self.cache.touch(endpoint, cached)
+                    return cached.body, cached.fetched_at
+                if is_quota_error(e):
+                    logger.warning(f"⚠ API 키 {QuotaLedger.key_id(key)} 쿼터 소진 - 다음 키로 전환")
+                    self.ledger.mark_exhausted(key)
+                    key = None
+                    continue
+                # Failed requests are still charged
+                self.ledger.record(key, endpoint)
+                if is_rate_limit_error(e) and throttled < RATE_LIMIT_RETRIES:
+                    delay = rate_limit_delay(throttled)
+                    throttled += 1
+                    logger.warning(f"⚠ 초당 요청 한도 초과 ({endpoint}) - {delay:.1f}초 후 같은 키로 재시도")
+                    time.sleep(delay)
+                    continue
+                raise
+
+            self.ledger.record(key, endpoint)
+            if self.cache:
+                self.cache.misses += 1
+                return response, self.cache.put(endpoint, params, response)
+            return response, time.time()
+
+    def plan(self, stage: str, units: int) -> bool:
+        """Log whether a stage fits in the quota left today.
+
+        Args:
+            stage: Stage name for the log message
+            units: Estimated units the stage will spend
+
+        Returns:
+            True if the estimate fits in the remaining quota
+        """
+        remaining = self.remaining()
+        if units <= remaining:
+            logger.info(f"쿼터 계획 [{stage}]: 예상 {units:,} units / 남은 {remaining:,} units")
+            return True
+
+        logger.warning(f"⚠ 쿼터 계획 [{stage}]: 예상 {units:,} units > 남은 {remaining:,} units "
+                       f"(리셋: {self.ledger.reset_time().isoformat()})")
+        return False
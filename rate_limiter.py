@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Token Bucket Rate Limiter
+Shared request-rate limit for worker threads and asyncio tasks calling the Data API.
+"""
+
+import time
+import threading
+
+
+class TokenBucket:
+    """Thread-safe token bucket.
+
+    Tokens refill continuously at `rate` per second up to `capacity`; each
+    request takes one token and waits when the bucket is empty.
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        """Initialize a full bucket.
+
+        Args:
+            rate: Sustained requests per second
+            capacity: Burst size (default: one second of requests)
+        """
+        if rate <= 0:
+            raise ValueError(f"rate는 0보다 커야 합니다: {rate}")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take tokens now and return how long the caller must wait before using them.
+
+        Tokens may go negative, which queues later callers behind this one.
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            Seconds to wait (0 if tokens were available)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens: float = 1.0):
+        """Block until tokens are available (for worker threads)."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Data API Response Cache
+On-disk store of raw API responses keyed by request parameters, revalidated with ETags.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = 'data/api_cache'
+
+# Seconds a cached response is served without contacting the API.
+# Expired entries are revalidated with If-None-Match instead of re-downloaded.
+ENDPOINT_TTLS = {
+    'search.list': 7 * 24 * 3600,
+    'channels.list': 24 * 3600,
+    'playlistItems.list': 3600,
+    'videos.list': 3600,
+    'commentThreads.list': 6 * 3600,
+    'comments.list': 6 * 3600,
+}
+
+# Query parameters that do not change the response
+IGNORED_PARAMS = ('key', 'alt')
+
+
+class CacheMissError(Exception):
+    """Raised in offline mode when a request has no cached response."""
+
+    def __init__(self, endpoint: str, params: Dict[str, str]):
+        self.endpoint = endpoint
+        self.params = params
+        super().__init__(f"오프라인 모드: 캐시에 없는 요청입니다 ({endpoint} {params})")
+
+
+class CachedResponse:
+    """One cached API response and its validator."""
+
+    def __init__(self, key: str, body: Dict, etag: Optional[str], fetched_at: float, ttl: float):
+        self.key = key
+        self.body = body
+        self.etag = etag
+        self.fetched_at = fetched_at
+        self.ttl = ttl
+
+    @property
+    def fresh(self) -> bool:
+        """True while the entry is younger than its endpoint TTL."""
+        return time.time() - self.fetched_at < self.ttl
+
+
+class ResponseCache:
+    """Raw Data API responses stored as one JSON file per request.
+
+    Entries are keyed by endpoint and query parameters (minus the API key),
+    so the sync and async engines share the same cache.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, ttls: Optional[Dict[str, float]] = None,
+                 default_ttl: Optional[float] = None, offline: bool = False):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory that stores cached responses
+            ttls: Per-endpoint TTL overrides in seconds
+            default_ttl: TTL for every endpoint (overrides ENDPOINT_TTLS)
+            offline: Serve only from the cache and never contact the API
+        """
+        self.cache_dir = cache_dir
+        self.ttls = dict(ENDPOINT_TTLS)
+        if default_ttl is not None:
+            self.ttls = {endpoint: default_ttl for endpoint in self.ttls}
+        self.ttls.update(ttls or {})
+        self.default_ttl = default_ttl if default_ttl is not None else 0
+        self.offline = offline
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize_params(params: Dict) -> Dict[str, str]:
+        """Drop ignored and empty parameters and stringify values."""
+        return {name: str(value) for name, value in sorted(params.items())
+                if name not in IGNORED_PARAMS and value is not None}
+
+    @classmethod
+    def params_from_uri(cls, uri: str) -> Dict[str, str]:
+        """Extract normalized query parameters from a googleapiclient request URI."""
+        return cls.normalize_params(dict(parse_qsl(urlsplit(uri).query)))
+
+    def request_key(self, endpoint: str, params: Dict) -> str:
+        """Stable cache key for an endpoint and its query parameters."""
+        payload = json.dumps([endpoint, self.normalize_params(params)], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, endpoint: str, key: str) -> str:
+        return os.path.join(self.cache_dir, endpoint, key[:2], f"{key}.json")
+
+    def get(self, endpoint: str, params: Dict) -> Optional[CachedResponse]:
+        """Load the cached response for a request.
+
+        Args:
+            endpoint: Endpoint name such as 'videos.list'
+            params: Query parameters
+
+        Returns:
+            Cached response, or None if the request was never cached
+        """
+        key = self.request_key(endpoint, params)
+        path = self._path(endpoint, key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"⚠ 캐시 항목 로드 실패, 무시합니다: {path} ({e})")
+            return None
+        return CachedResponse(key, entry['body'], entry.get('etag'), entry['fetched_at'],
+                              self.ttls.get(endpoint, self.default_ttl))
+
+    def put(self, endpoint: str, params: Dict, body: Dict) -> float:
+        """Store a fresh response.
+
+        Args:
+            endpoint: Endpoint name such as 'videos.list'
+            params: Query parameters
+            body: Parsed response body (its 'etag' field becomes the validator)
+
+        Returns:
+            The entry's fetched_at (epoch seconds)
+        """
+        key = self.request_key(endpoint, params)
+        fetched_at = time.time()
+        path = self._path(endpoint, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'endpoint': endpoint,
+                'params': self.normalize_params(params),
+                'etag': body.get('etag'),
+                'fetched_at': fetched_at,
+                'body': body
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        return fetched_at
+
+    def touch(self, endpoint: str, cached: CachedResponse):
+        """Restart the TTL of an entry the API confirmed unchanged (304)."""
+        path = self._path(endpoint, cached.key)
+        now = time.time()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            entry['fetched_at'] = now
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"⚠ 캐시 항목 갱신 실패: {path} ({e})")
+        cached.fetched_at = now
+
+    def lookup(self, endpoint: str, params: Dict) -> Optional[CachedResponse]:
+        """Find a cached response and decide whether the API must be called.
+
+        Returns the entry (fresh or stale) or None; in offline mode a missing
+        entry raises CacheMissError and any entry counts as fresh.
+        """
+        cached = self.get(endpoint, params)
+        if self.offline:
+            if cached is None:
+                raise CacheMissError(endpoint, self.normalize_params(params))
+            cached.ttl = float('inf')
+        return cached
+
+    def summary(self) -> str:
+        """One-line hit/revalidation/miss counts for logging."""
+        return f"캐시 적중 {self.hits:,} / 재검증(304) {self.revalidated:,} / 미스 {self.misses:,}"
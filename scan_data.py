@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Data Integrity Scanner
+Validates every per-video artifact in worker processes, reports problems as JSON and bulk-loads the valid files with orjson.
+"""
+
+import os
+import sys
+import time
+import json
+import argparse
+import logging
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import orjson
+
+from artifact_manifest import AUDIO_DIR
+from compressed_storage import read_bytes
+from data_paths import ARTIFACTS, DEFAULT_CHANNEL_SLUG, artifact_dir, artifacts, channel_path, file_path
+from denoiser import preserve_metadata
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPORT_PATH = 'data/scan_report.json'
+
+TEXT_KINDS = ('captions', 'transcript', 'denoised')
+
+# Keys a JSON artifact must have to be usable
+REQUIRED_KEYS = {
+    'comments': ('comments',),
+    'stats': ('view_count',),
+    'keywords': ('keywords',),
+    'sentiment': ('total',),
+}
+
+# Every video in the catalog should have these (transcripts are optional)
+EXPECTED_KINDS = ('comments', 'stats')
+
+# Problems that make a file unusable; the rest are warnings
+ERRORS = {'unreadable', 'empty', 'truncated', 'corrupt', 'invalid', 'id_mismatch', 'missing'}
+
+# Leftovers of interrupted downloads and writes
+LEFTOVER_SUFFIXES = ('.part', '.ytdl', '.tmp')
+
+# Whisper loops: a phrase of up to 8 words repeated at least 10 times in a row
+MAX_PHRASE_TOKENS = 8
+MIN_REPEATS = 10
+# A transcript is flagged once one loop spans this many words or loops cover this share of it
+LOOP_MIN_TOKENS = 50
+LOOP_MAX_FRACTION = 0.2
+
+# Odd multiplier (invertible modulo 2**64) for word hashes
+_HASH_BASE = 0x100000001B3
+_HASH_BASE_INVERSE = pow(_HASH_BASE, -1, 2 ** 64)
+
+# Files per worker task: large enough to amortize inter-process overhead
+CHUNK_SIZE = 64
+
+
+_hash_powers = np.ones(1, dtype=np.uint64)
+_hash_inverse_powers = np.ones(1, dtype=np.uint64)
+
+
+def _powers(length: int) -> Tuple[np.ndarray, np.ndarray]:
+    """BASE**k and BASE**-k modulo 2**64 for k < length, grown once per worker process."""
+    global _hash_powers, _hash_inverse_powers
+    if len(_hash_powers) < length:
+        size = max(length, 2 * len(_hash_powers))
+        with np.errstate(over='ignore'):
+            _hash_powers = np.ones(size, dtype=np.uint64)
+            np.cumprod(np.full(size - 1, _HASH_BASE, dtype=np.uint64), out=_hash_powers[1:])
+            _hash_inverse_powers = np.ones(size, dtype=np.uint64)
+            np.cumprod(np.full(size - 1, _HASH_BASE_INVERSE, dtype=np.uint64), out=_hash_inverse_powers[1:])
+    return _hash_powers[:length], _hash_inverse_powers[:length]
+
+
+def _word_hashes(data: bytes) -> np.ndarray:
+    """64-bit polynomial hash of every whitespace-separated word of UTF-8 text.
+
+    Computed from prefix sums over the raw bytes, so equal words get equal
+    hashes without building Python strings. Bytes <= 0x20 separate words;
+    UTF-8 continuation bytes never fall in that range.
+    """
+    codes = np.frombuffer(data, dtype=np.uint8)
+    inside = np.concatenate(([False], codes > 0x20, [False]))
+    edges = np.flatnonzero(np.diff(inside.view(np.int8)))
+    starts, ends = edges[::2], edges[1::2]
+    powers, inverse = _powers(len(codes) + 1)
+    with np.errstate(over='ignore'):
+        prefix = np.zeros(len(codes) + 1, dtype=np.uint64)
+        np.cumsum(codes * powers[:-1], out=prefix[1:])
+        # Arithmetic wraps modulo 2**64; multiplying by BASE**-start aligns every word at position 0
+        return (prefix[ends] - prefix[starts]) * inverse[starts]
+
+
+def repetition_loops(text: str) -> Tuple[float, int]:
+    """Share of words inside repetition loops and the longest loop in words.
+
+    A loop is a phrase of 1..MAX_PHRASE_TOKENS words repeated MIN_REPEATS or
+    more times in a row, the usual Whisper failure on music or silence.
+    Each phrase length is one vectorized comparison of word hashes instead
+    of a backtracking regex.
+    """
+    words = _word_hashes(text.encode('utf-8'))
+    covered = np.zeros(len(words), dtype=bool)
+    longest = 0
+    for n in range(1, MAX_PHRASE_TOKENS + 1):
+        if len(words) <= n * MIN_REPEATS:
+            break
+        # same[i]: word i equals word i + n; a run of r such positions is a phrase of n words repeated r / n + 1 times
+        same = words[n:] == words[:-n]
+        if np.count_nonzero(same) < (MIN_REPEATS - 1) * n:
+            continue
+        same = np.concatenate(([False], same, [False]))
+        edges = np.flatnonzero(np.diff(same.view(np.int8)))
+        starts, ends = edges[::2], edges[1::2]
+        loop = (ends - starts) >= (MIN_REPEATS - 1) * n
+        for start, end in zip(starts[loop].tolist(), ends[loop].tolist()):
+            covered[start:end + n] = True
+            longest = max(longest, end + n - start)
+    return (float(covered.mean()) if len(words) else 0.0), longest
+
+
+def _issue(kind: str, video_id: Optional[str], path: str, issue: str, detail: str = '') -> Dict:
+    return {'kind': kind, 'video_id': video_id, 'path': path, 'issue': issue, 'detail': detail}
+
+
+def check_json(kind: str, video_id: str, path: str, data: bytes) -> Tuple[List[Dict], Any]:
+    """Validate one JSON artifact.
+
+    Returns:
+        (issues, parsed object or None if unusable)
+    """
+    if not data.strip():
+        return [_issue(kind, video_id, path, 'empty')], None
+    try:
+        obj = orjson.loads(data)
+    except orjson.JSONDecodeError as e:
+        # Every artifact is one object: a missing closing brace or an error at the
+        # very end means the write was cut off (possibly mid-character)
+        truncated = not data.rstrip().endswith(b'}') or not data[e.pos:].strip()
+        issue = 'truncated' if truncated else 'corrupt'
+        return [_issue(kind, video_id, path, issue, str(e))], None
+    if not isinstance(obj, dict):
+        return [_issue(kind, video_id, path, 'invalid', f"최상위가 {type(obj).__name__}")], None
+    missing = [key for key in REQUIRED_KEYS.get(kind, ()) if key not in obj]
+    if missing:
+        return [_issue(kind, video_id, path, 'invalid', f"키 없음: {', '.join(missing)}")], None
+    if obj.get('video_id', video_id) != video_id:
+        return [_issue(kind, video_id, path, 'id_mismatch', f"video_id={obj['video_id']}")], None
+
+    issues = []
+    if kind == 'comments':
+        comments = obj['comments']
+        if not isinstance(comments, list):
+            return [_issue(kind, video_id, path, 'invalid', 'comments가 리스트가 아님')], None
+        if obj.get('comment_count', len(comments)) != len(comments):
+            issues.append(_issue(kind, video_id, path, 'count_mismatch',
+                                 f"comment_count={obj['comment_count']}, 실제 {len(comments)}"))
+    return issues, obj
+
+
+def check_text(kind: str, video_id: str, path: str, data: bytes) -> Tuple[List[Dict], Optional[str]]:
+    """Validate one transcript: UTF-8, header, non-empty body, no Whisper loops.
+
+    Returns:
+        (issues, text or None if unusable)
+    """
+    try:
+        text = data.decode('utf-8')
+    except UnicodeDecodeError as e:
+        return [_issue(kind, video_id, path, 'corrupt', str(e))], None
+    metadata, body = preserve_metadata(text)
+    if not body.strip():
+        return [_issue(kind, video_id, path, 'empty')], None
+    header_id = next((line.split(':', 1)[1].strip() for line in metadata.split('\n')
+                      if line.startswith('Video ID:')), video_id)
+    if header_id != video_id:
+        return [_issue(kind, video_id, path, 'id_mismatch', f"Video ID: {header_id}")], None
+
+    fraction, longest = repetition_loops(body)
+    if longest >= LOOP_MIN_TOKENS or fraction >= LOOP_MAX_FRACTION:
+        return [_issue(kind, video_id, path, 'repetitive',
+                       f"최장 반복 {longest}단어, 반복 비율 {fraction:.1%}")], text
+    return [], text
+
+
+def check_file(kind: str, video_id: str, path: str) -> Tuple[List[Dict], Any]:
+    """Read (plain or .zst) and validate one artifact."""
+    try:
+        data = read_bytes(path)
+    except ValueError as e:
+        # Corrupt .zst frame or unknown dictionary
+        return [_issue(kind, video_id, path, 'corrupt', str(e))], None
+    except OSError as e:
+        return [_issue(kind, video_id, path, 'unreadable', str(e))], None
+    if kind in TEXT_KINDS:
+        return check_text(kind, video_id, path, data)
+    return check_json(kind, video_id, path, data)
+
+
+def _check_chunk(kind: str, items: List[Tuple[str, str]], keep: bool) -> Tuple[List[Dict], int, Dict[str, Any]]:
+    """Worker task: validate a chunk of files of one kind.
+
+    Returns:
+        (issues, number of usable files, {video_id: content} if keep else {})
+    """
+    issues, usable, loaded = [], 0, {}
+    for video_id, path in items:
+        file_issues, content = check_file(kind, video_id, path)
+        issues.extend(file_issues)
+        if content is not None:
+            usable += 1
+            if keep:
+                loaded[video_id] = content
+    return issues, usable, loaded
+
+
+def _chunks(kind: str, files: Dict[str, Any]) -> Iterable[Tuple[str, List[Tuple[str, str]]]]:
+    items = [(video_id, str(path)) for video_id, path in files.items()]
+    for start in range(0, len(items), CHUNK_SIZE):
+        yield kind, items[start:start + CHUNK_SIZE]
+
+
+def _run_chunks(tasks: List[Tuple[str, List[Tuple[str, str]]]], keep: bool, workers: Optional[int]):
+    """Results of _check_chunk for every task, in a process pool unless workers == 1."""
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(tasks) <= 1:
+        return [_check_chunk(kind, items, keep) for kind, items in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_check_chunk, *zip(*tasks), [keep] * len(tasks)))
+
+
+def catalog_ids(channel_slug: str = DEFAULT_CHANNEL_SLUG) -> Optional[List[str]]:
+    """Video IDs of the channel's _videos.json, or None if there is no catalog."""
+    videos_file = channel_path(channel_slug, 'videos.json')
+    if not os.path.exists(videos_file):
+        return None
+    with open(videos_file, 'rb') as f:
+        return [video['video_id'] for video in orjson.loads(f.read())]
+
+
+def leftovers(channel_slug: str = DEFAULT_CHANNEL_SLUG) -> List[Dict]:
+    """Partial downloads and temporary files left by interrupted runs."""
+    directories = {artifact_dir(kind, channel_slug) for kind in ARTIFACTS} | {AUDIO_DIR}
+    found = []
+    for directory in sorted(directories):
+        for root, _, names in os.walk(directory):
+            for name in names:
+                if name.endswith(LEFTOVER_SUFFIXES):
+                    path = os.path.join(root, name)
+                    size = os.path.getsize(path)
+                    found.append(_issue('leftover', None, path, 'leftover', f"{size / 1024 / 1024:.1f} MB"))
+    return found
+
+
+def scan(channel_slug: str = DEFAULT_CHANNEL_SLUG, kinds: Optional[List[str]] = None,
+         workers: Optional[int] = None) -> Dict:
+    """Validate every artifact of a channel.
+
+    Files are checked in chunks by worker processes, which send back only
+    the problems found, never file contents.
+
+    Args:
+        channel_slug: Channel slug
+        kinds: Artifact kinds to check (default: all)
+        workers: Worker processes (default: CPU count; 1 runs in-process)
+
+    Returns:
+        Report: {'channel', 'scanned_at', 'elapsed_seconds', 'ok', 'summary', 'issues'}
+    """
+    start = time.perf_counter()
+    kinds = kinds or list(ARTIFACTS)
+    found = {kind: artifacts(kind, channel_slug) for kind in kinds}
+    tasks = [task for kind in kinds for task in _chunks(kind, found[kind])]
+
+    issues = []
+    usable = Counter()
+    for (kind, _), (chunk_issues, chunk_usable, _) in zip(tasks, _run_chunks(tasks, False, workers)):
+        issues.extend(chunk_issues)
+        usable[kind] += chunk_usable
+
+    # Missing files: against the catalog if there is one, else against every video seen
+    expected = catalog_ids(channel_slug)
+    if expected is None:
+        expected = sorted(set().union(*(found[kind] for kind in kinds)))
+    for kind in EXPECTED_KINDS:
+        if kind in found:
+            directory, suffix = artifact_dir(kind, channel_slug), ARTIFACTS[kind][1]
+            issues.extend(_issue(kind, video_id, file_path(directory, video_id, suffix), 'missing')
+                          for video_id in expected if video_id not in found[kind])
+    issues.extend(leftovers(channel_slug))
+
+    counts = defaultdict(Counter)
+    for issue in issues:
+        counts[issue['kind']][issue['issue']] += 1
+    summary = {kind: {'files': len(found[kind]), 'usable': usable[kind], 'issues': dict(counts[kind])}
+               for kind in kinds}
+    if counts['leftover']:
+        summary['leftover'] = {'files': counts['leftover']['leftover'], 'usable': 0, 'issues': dict(counts['leftover'])}
+
+    return {
+        'channel': channel_slug,
+        'scanned_at': datetime.now().isoformat(),
+        'elapsed_seconds': round(time.perf_counter() - start, 2),
+        'ok': not any(issue['issue'] in ERRORS for issue in issues),
+        'summary': summary,
+        'issues': sorted(issues, key=lambda issue: (issue['kind'], issue['issue'], issue['path'])),
+    }
+
+
+def load_valid(kind: str, channel_slug: str = DEFAULT_CHANNEL_SLUG, workers: Optional[int] = None) -> Dict[str, Any]:
+    """Parse every usable artifact of a kind in worker processes.
+
+    Files that fail the scanner's checks are skipped (with a warning), so
+    analysis code never sees a truncated or malformed file.
+
+    Args:
+        kind: Artifact kind, e.g. 'stats' or 'comments'
+        channel_slug: Channel slug
+        workers: Worker processes (default: CPU count; 1 runs in-process)
+
+    Returns:
+        {video_id: parsed JSON (or transcript text)}, sorted by video ID
+    """
+    tasks = list(_chunks(kind, artifacts(kind, channel_slug)))
+    loaded = {}
+    skipped = 0
+    for chunk_issues, _, chunk_loaded in _run_chunks(tasks, True, workers):
+        skipped += sum(issue['issue'] in ERRORS for issue in chunk_issues)
+        loaded.update(chunk_loaded)
+    if skipped:
+        logger.warning(f"⚠ {kind}: 손상된 파일 {skipped:,}개 제외 (python scan_data.py로 확인)")
+    return dict(sorted(loaded.items()))
+
+
+def _naive_scan(channel_slug: str, kinds: List[str]) -> float:
+    """Seconds for the per-file json.load / read loop the scanner replaces."""
+    start = time.perf_counter()
+    for kind in kinds:
+        for path in artifacts(kind, channel_slug).values():
+            try:
+                data = read_bytes(path)
+                if kind in TEXT_KINDS:
+                    data.decode('utf-8')
+                else:
+                    json.loads(data)
+            except (OSError, ValueError):
+                pass
+    return time.perf_counter() - start
+
+
+def main():
+    """Command-line entry point."""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(
+        description='데이터 디렉토리 무결성 검사 (손상/잘린 JSON, 빈 자막, Whisper 반복, 누락 파일)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python scan_data.py                       # 전체 검사 → data/scan_report.json
+  python scan_data.py --kinds comments stats
+  python scan_data.py --json                # 보고서를 stdout으로 (다른 도구 입력용)
+  python scan_data.py --compare             # 단순 파일별 루프와 소요 시간 비교
+        """
+    )
+    parser.add_argument('--channel', default=DEFAULT_CHANNEL_SLUG, help=f'채널 슬러그 (기본값: {DEFAULT_CHANNEL_SLUG})')
+    parser.add_argument('--kinds', nargs='+', choices=sorted(ARTIFACTS), help='검사할 종류 (생략 시 전체)')
+    parser.add_argument('--workers', type=int, default=None, help='워커 프로세스 수 (기본값: CPU 코어 수)')
+    parser.add_argument('--output', default=DEFAULT_REPORT_PATH, help=f'보고서 파일 (기본값: {DEFAULT_REPORT_PATH})')
+    parser.add_argument('--json', action='store_true', help='보고서를 stdout으로 출력')
+    parser.add_argument('--compare', action='store_true', help='json.load 루프와 소요 시간 비교')
+    parser.add_argument('--limit', type=int, default=20, help='출력할 문제 수 (기본값: 20)')
+    args = parser.parse_args()
+
+    report = scan(args.channel, args.kinds, args.workers)
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'wb') as f:
+        f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+
+    if args.json:
+        sys.stdout.write(orjson.dumps(report, option=orjson.OPT_INDENT_2).decode('utf-8') + '\n')
+    else:
+        print(f"\n{'종류':<12}{'파일':>10}{'정상':>10}  문제")
+        for kind, info in report['summary'].items():
+            problems = ', '.join(f"{issue} {count:,}" for issue, count in sorted(info['issues'].items())) or '-'
+            print(f"{kind:<12}{info['files']:>10,}{info['usable']:>10,}  {problems}")
+        errors = [issue for issue in report['issues'] if issue['issue'] in ERRORS]
+        if errors:
+            print()
+            for issue in errors[:args.limit]:
+                print(f"  ❌ {issue['issue']:<12}{issue['path']}  {issue['detail']}")
+            if len(errors) > args.limit:
+                print(f"  ... 외 {len(errors) - args.limit:,}개")
+
+    logger.info(f"{'✓' if report['ok'] else '⚠'} 검사 완료 ({report['elapsed_seconds']:.1f}초): {args.output}")
+    if args.compare:
+        elapsed = _naive_scan(args.channel, args.kinds or list(ARTIFACTS))
+        logger.info(f"단순 루프 (json.load, 1 프로세스): {elapsed:.1f}초")
+    if not report['ok']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
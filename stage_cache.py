@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Stage Cache
+Content-hash memoization for derived artifacts: recompute only what a code, config or input change affected.
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import hashlib
+import inspect
+import argparse
+import logging
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from compressed_storage import exists, getmtime, read_bytes
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = 'data/stage_cache.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS stage_outputs (
+    stage TEXT NOT NULL,
+    item TEXT NOT NULL,
+    input_hash TEXT NOT NULL,
+    input_mtime REAL,
+    stage_version TEXT NOT NULL,
+    output_path TEXT NOT NULL,
+    computed_at TEXT NOT NULL,
+    PRIMARY KEY (stage, item)
+);
+CREATE INDEX IF NOT EXISTS stage_outputs_path ON stage_outputs(output_path);
+"""
+
+
+def _json_default(value):
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    return repr(value)
+
+
+def code_fingerprint(*functions, config: Optional[Dict] = None) -> str:
+    """Version of a stage: hash of its functions' source plus its settings.
+
+    Editing any listed function (e.g. denoise_transcript or
+    get_extended_stopwords) or changing a setting yields a new version, which
+    makes every entry of the stage stale; unrelated edits do not.
+
+    Args:
+        *functions: Functions whose source defines the stage's output
+        config: Settings that change the output (sets are sorted)
+
+    Returns:
+        16-hex-digit version string
+    """
+    digest = hashlib.sha256()
+    for function in functions:
+        digest.update(inspect.getsource(function).encode('utf-8'))
+    digest.update(json.dumps(config or {}, sort_keys=True, ensure_ascii=False, default=_json_default).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def content_hash(data: bytes) -> str:
+    """SHA-256 of input content."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class StageCache:
+    """Input hash and stage version of every derived artifact.
+
+    An entry is current when its input content and the stage version both
+    match what produced the stored output and that output still exists.
+    Input hashes are reused while the input's mtime is unchanged, so checking
+    a whole stage costs one stat per input instead of reading every file.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        """Open (or create) the cache database.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+
+    def close(self):
+        """Close the database connection."""
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def entries(self, stage: str) -> Dict[str, Dict]:
+        """Stored entries of a stage keyed by item."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT item, input_hash, input_mtime, stage_version, output_path FROM stage_outputs WHERE stage = ?',
+                (stage,)).fetchall()
+        return {item: {'input_hash': input_hash, 'input_mtime': input_mtime, 'stage_version': version,
+                       'output_path': output_path}
+                for item, input_hash, input_mtime, version, output_path in rows}
+
+    def record(self, stage: str, item: str, input_hash: str, input_mtime: Optional[float],
+               stage_version: str, output_path: str):
+        """Store the key an output was computed from."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO stage_outputs VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (stage, item, input_hash, input_mtime, stage_version, output_path, datetime.now().isoformat()))
+
+    def invalidate(self, stage: str):
+        """Forget every entry of a stage (forces a full recompute)."""
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM stage_outputs WHERE stage = ?', (stage,))
+
+    def move_outputs(self, moves: Dict[str, str]) -> int:
+        """Point entries at outputs that were moved (e.g. by data_paths.migrate).
+
+        Args:
+            moves: {old output path: new output path}
+
+        Returns:
+            Number of entries updated
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.executemany('UPDATE stage_outputs SET output_path = ? WHERE output_path = ?',
+                                            ((new, old) for old, new in moves.items()))
+            return cursor.rowcount
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """{stage: {'entries': n, 'versions': distinct stage versions}}."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT stage, COUNT(*), COUNT(DISTINCT stage_version) FROM stage_outputs GROUP BY stage').fetchall()
+        return {stage: {'entries': entries, 'versions': versions} for stage, entries, versions in rows}
+
+
+def run_stage(stage: str, stage_version: str, inputs: Dict[str, str],
+              compute: Callable[[str, str], Optional[str]], cache: Optional[StageCache] = None,
+              force: bool = False) -> Dict[str, int]:
+    """Run a stage over many inputs, recomputing only stale entries.
+
+    Args:
+        stage: Stage name, e.g. 'denoise' or 'keywords'
+        stage_version: Result of code_fingerprint() for the stage
+        inputs: item (usually video_id) -> input file (plain or .zst)
+        compute: compute(item, input_path) -> output path, or None on failure
+        cache: Stage cache (default: data/stage_cache.db)
+        force: Recompute every entry
+
+    Returns:
+        {'computed': n, 'reused': n, 'failed': n}
+    """
+    own_cache = cache is None
+    cache = cache or StageCache()
+    try:
+        entries = cache.entries(stage)
+        counts = {'computed': 0, 'reused': 0, 'failed': 0}
+        for item, input_path in inputs.items():
+            entry = entries.get(item)
+            input_mtime = getmtime(input_path)
+            if entry and entry['input_mtime'] == input_mtime:
+                input_hash = entry['input_hash']
+            else:
+                input_hash = content_hash(read_bytes(input_path))
+
+            if (not force and entry and entry['input_hash'] == input_hash
+                    and entry['stage_version'] == stage_version
+                    and exists(entry['output_path'])):
+                if entry['input_mtime'] != input_mtime:
+                    # Touched but identical: remember the new mtime to skip hashing next time
+                    cache.record(stage, item, input_hash, input_mtime, stage_version, entry['output_path'])
+                counts['reused'] += 1
+                continue
+
+            try:
+                output_path = compute(item, input_path)
+            except Exception as e:
+                logger.warning(f"⚠ {stage} 실패: {item} ({e})")
+                output_path = None
+            if output_path is None:
+                counts['failed'] += 1
+                continue
+            cache.record(stage, item, input_hash, input_mtime, stage_version, output_path)
+            counts['computed'] += 1
+
+        logger.info(f"✓ {stage} (버전 {stage_version}): 새로 계산 {counts['computed']:,}개, "
+                    f"재사용 {counts['reused']:,}개, 실패 {counts['failed']:,}개")
+        return counts
+    finally:
+        if own_cache:
+            cache.close()
+
+
+def main():
+    """Command-line entry point."""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='단계별 재계산 캐시 (입력 해시 + 코드/설정 버전)')
+    parser.add_argument('--db', default=DEFAULT_CACHE_PATH, help=f'캐시 파일 (기본값: {DEFAULT_CACHE_PATH})')
+    parser.add_argument('--invalidate', metavar='STAGE', help='단계의 캐시를 비워 전체 재계산')
+    args = parser.parse_args()
+
+    with StageCache(args.db) as cache:
+        if args.invalidate:
+            cache.invalidate(args.invalidate)
+            logger.info(f"✓ {args.invalidate} 캐시 삭제")
+        summary = cache.summary()
+        if not summary:
+            logger.info("캐시가 비어 있습니다.")
+            sys.exit(0)
+        for stage, info in sorted(summary.items()):
+            print(f"{stage:<12}{info['entries']:>8,}개  (버전 {info['versions']}종)")
+
+
+if __name__ == "__main__":
+    main()
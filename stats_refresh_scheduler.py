@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Stats Refresh Scheduler
+Polls engagement stats per video at an interval set by its age and recent growth.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+
+from artifact_manifest import ArtifactManifest
+from data_paths import channel_path
+from quota_ledger import DEFAULT_LEDGER_PATH, QuotaExhaustedError, QuotaLedger, QuotaScheduler, load_api_keys
+from rate_limiter import TokenBucket
+from stats_timeseries import StatsTimeSeries, to_epoch
+from youtube_channel_data_collector import MAX_IDS_PER_REQUEST, YouTubeDataCollector
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# (maximum video age, polling interval): new uploads are polled often, the back catalog rarely
+AGE_INTERVALS = [
+    (6 * HOUR, 15 * 60),
+    (2 * DAY, HOUR),
+    (7 * DAY, 6 * HOUR),
+    (30 * DAY, DAY),
+    (365 * DAY, 7 * DAY),
+]
+BACK_CATALOG_INTERVAL = 30 * DAY
+
+MIN_INTERVAL = 15 * 60
+MAX_INTERVAL = 60 * DAY
+
+# Relative view growth per hour above which a video is polled twice as often
+HOT_GROWTH_RATE = 0.01
+
+# Extra wait after the quota reset time before polling again
+QUOTA_RESET_MARGIN = 60
+
+
+def age_interval(age_seconds: float) -> int:
+    """Base polling interval for a video of the given age."""
+    for max_age, interval in AGE_INTERVALS:
+        if age_seconds < max_age:
+            return interval
+    return BACK_CATALOG_INTERVAL
+
+
+class StatsRefreshScheduler:
+    """Decides which videos are due for a stats refresh.
+
+    Each video gets a base interval from its age, halved while its views grow
+    faster than HOT_GROWTH_RATE per hour and doubled once they stop moving.
+    The last two snapshots per video come from the stats time series and are
+    updated in memory as new stats arrive.
+    """
+
+    def __init__(self, videos: List[Dict], store: StatsTimeSeries):
+        """Load publish times and the latest snapshots.
+
+        Args:
+            videos: Catalog loaded from _videos.json
+            store: Stats time series of the channel
+        """
+        self.store = store
+        self.published_at: Dict[str, Optional[int]] = {}
+        # video_id -> [(collected_at, view_count), ...] (last two snapshots, oldest first)
+        self.snapshots: Dict[str, List[Tuple[int, int]]] = {}
+        self.add_videos(videos)
+        self._load_snapshots()
+
+    def add_videos(self, videos: List[Dict]):
+        """Register catalog entries (new uploads become due immediately)."""
+        for video in videos:
+            self.published_at.setdefault(video['video_id'], to_epoch(video.get('published_at')))
+
+    def _load_snapshots(self):
+        """Read the last two snapshots of every video from the time series.
+
+        Only twice the longest interval is read, a window the scheduler
+        itself keeps sparse for old videos.
+        """
+        start = datetime.fromtimestamp(time.time() - 2 * MAX_INTERVAL).isoformat()
+        columns = self.store.load(start=start)
+        if not len(columns['video_idx']):
+            return
+
+        order = np.lexsort((columns['collected_at'], columns['video_idx']))
+        video_idx = columns['video_idx'][order]
+        collected_at = columns['collected_at'][order]
+        views = columns['view_count'][order]
+
+        last = np.ones(len(video_idx), dtype=bool)
+        last[:-1] = video_idx[:-1] != video_idx[1:]
+        for i in np.flatnonzero(last):
+            history = [(int(collected_at[i]), int(views[i]))]
+            if i > 0 and video_idx[i - 1] == video_idx[i]:
+                history.insert(0, (int(collected_at[i - 1]), int(views[i - 1])))
+            self.snapshots[self.store.video_ids[video_idx[i]]] = history
+
+    def record(self, stats: List[Dict]):
+        """Update the in-memory snapshots after a refresh."""
+        for entry in stats:
+            history = self.snapshots.setdefault(entry['video_id'], [])
+            history.append((to_epoch(entry['collected_at']), int(entry['view_count'])))
+            del history[:-2]
+
+    def drop(self, video_ids: List[str]):
+        """Stop polling videos that were deleted or made private."""
+        for video_id in video_ids:
+            self.published_at.pop(video_id, None)
+            self.snapshots.pop(video_id, None)
+
+    def interval(self, video_id: str, now: float) -> int:
+        """Polling interval of one video in seconds."""
+        published = self.published_at.get(video_id)
+        interval = age_interval(now - published) if published else BACK_CATALOG_INTERVAL
+
+        history = self.snapshots.get(video_id, [])
+        if len(history) == 2:
+            (t0, views0), (t1, views1) = history
+            hours = max(t1 - t0, 1) / HOUR
+            growth = (views1 - views0) / hours / max(views1, 1)
+            if growth >= HOT_GROWTH_RATE:
+                interval //= 2
+            elif views1 == views0:
+                interval *= 2
+        return min(max(interval, MIN_INTERVAL), MAX_INTERVAL)
+
+    def next_due(self, video_id: str, now: float) -> float:
+        """Epoch time at which a video should be polled next (now if never polled)."""
+        history = self.snapshots.get(video_id)
+        if not history:
+            return now
+        return history[-1][0] + self.interval(video_id, now)
+
+    def due_batches(self, now: Optional[float] = None, max_batches: Optional[int] = None) -> List[List[str]]:
+        """Videos that are due, most overdue first, packed into videos.list-sized batches.
+
+        Args:
+            now: Reference time (default: current time)
+            max_batches: Cap on batches (quota budget per run)
+
+        Returns:
+            Lists of at most MAX_IDS_PER_REQUEST video IDs
+        """
+        now = now or time.time()
+        due = []
+        for video_id in self.published_at:
+            next_due = self.next_due(video_id, now)
+            if next_due <= now:
+                overdue = (now - next_due) / self.interval(video_id, now)
+                due.append((overdue, video_id))
+        due.sort(reverse=True)
+
+        video_ids = [video_id for _, video_id in due]
+        batches = [video_ids[i:i + MAX_IDS_PER_REQUEST] for i in range(0, len(video_ids), MAX_IDS_PER_REQUEST)]
+        return batches[:max_batches] if max_batches else batches
+
+    def seconds_until_next_due(self, now: Optional[float] = None) -> float:
+        """Time until the earliest video becomes due."""
+        now = now or time.time()
+        if not self.published_at:
+            return float(MAX_INTERVAL)
+        return max(min(self.next_due(video_id, now) for video_id in self.published_at) - now, 0)
+
+
+def refresh_once(collector: YouTubeDataCollector, scheduler: StatsRefreshScheduler, channel_slug: str,
+                 videos: List[Dict], max_batches: Optional[int] = None, dry_run: bool = False) -> int:
+    """Fetch stats for every due video once.
+
+    Args:
+        collector: Initialized data collector
+        scheduler: Refresh scheduler
+        channel_slug: Channel slug/handle for directory names
+        videos: Catalog (for publish times in the time series)
+        max_batches: Cap on videos.list calls this run
+        dry_run: Only log what is due
+
+    Returns:
+        Number of videos refreshed
+    """
+    batches = scheduler.due_batches(max_batches=max_batches)
+    due_count = sum(len(batch) for batch in batches)
+    logger.info(f"갱신 대상: 비디오 {due_count}개 / 전체 {len(scheduler.published_at)}개 "
+                f"({len(batches)}회 요청 = {len(batches)} units)")
+    if dry_run or not batches:
+        return 0
+
+    collected_stats = []
+    try:
+        for batch_ids in batches:
+            batch_stats = collector.fetch_video_stats_batch(batch_ids)
+            if batch_stats is None:
+                # The request failed; the videos stay due and are retried next run
+                continue
+            collected_stats.extend(batch_stats.values())
+
+            missing = [video_id for video_id in batch_ids if video_id not in batch_stats]
+            if missing:
+                logger.warning(f"⚠ 통계 없음 (삭제/비공개 가능), 갱신 대상에서 제외: {', '.join(missing)}")
+                scheduler.drop(missing)
+    finally:
+        # Keep the batches already fetched even if the quota ran out mid-run
+        if collected_stats:
+            collector.save_stats_snapshots(channel_slug, collected_stats, videos)
+            scheduler.record(collected_stats)
+    return len(collected_stats)
+
+
+def run_loop(collector: YouTubeDataCollector, channel_id: str, channel_slug: str, videos: List[Dict],
+             max_batches: Optional[int], max_sleep: float, sync_interval: float, min_duration_seconds: int):
+    """Refresh due videos forever, checking for new uploads every sync_interval seconds."""
+    scheduler = StatsRefreshScheduler(videos, StatsTimeSeries(channel_path(channel_slug, 'stats_timeseries')))
+    last_sync = 0.0
+    # Raise instead of waiting inside a run, so batches already fetched are saved before the wait below
+    collector.scheduler.wait_for_reset = False
+
+    while True:
+        try:
+            if time.time() - last_sync >= sync_interval:
+                merged = collector.sync_channel_videos(channel_id, channel_slug, videos,
+                                                       min_duration_seconds=min_duration_seconds)
+                if len(merged) != len(videos):
+                    videos = merged
+                    collector.save_videos_list(channel_slug, videos)
+                    scheduler.add_videos(videos)
+                last_sync = time.time()
+
+            refresh_once(collector, scheduler, channel_slug, videos, max_batches=max_batches)
+        except QuotaExhaustedError as e:
+            # refresh_once has already saved the batches fetched before the quota ran out
+            sleep_seconds = max(e.reset_at.timestamp() - time.time(), 0) + QUOTA_RESET_MARGIN
+            logger.warning(f"⏸ {e} - {sleep_seconds/3600:.1f}시간 대기 후 재개")
+            time.sleep(sleep_seconds)
+            continue
+
+        sleep_seconds = min(scheduler.seconds_until_next_due(), max_sleep,
+                            max(sync_interval - (time.time() - last_sync), 0))
+        logger.info(f"다음 갱신까지 {sleep_seconds/60:.1f}분 대기 "
+                    f"(오늘 남은 쿼터: {collector.scheduler.remaining():,} units)")
+        time.sleep(max(sleep_seconds, 1))
+
+
+def main():
+    """Command-line entry point."""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='비디오 나이/성장률 기반 참여도 통계 갱신 스케줄러')
+    parser.add_argument('channel', help='YouTube 채널 URL 또는 ID')
+    parser.add_argument('--api-key', default=os.getenv('YOUTUBE_API_KEY'),
+                        help='YouTube Data API v3 키 (기본값: 환경변수 YOUTUBE_API_KEY)')
+    parser.add_argument('--quota-ledger', default=DEFAULT_LEDGER_PATH,
+                        help=f'쿼터 사용량 기록 파일 (기본값: {DEFAULT_LEDGER_PATH})')
+    parser.add_argument('--once', action='store_true', help='한 번만 갱신하고 종료 (cron용)')
+    parser.add_argument('--dry-run', action='store_true', help='갱신 대상만 출력하고 API 호출 안 함')
+    parser.add_argument('--max-batches', type=int, default=None,
+                        help='한 번에 보낼 최대 videos.list 요청 수 (기본값: 제한 없음)')
+    parser.add_argument('--max-sleep', type=float, default=15 * 60,
+                        help='루프 모드 최대 대기 시간(초) (기본값: 900)')
+    parser.add_argument('--sync-interval', type=float, default=HOUR,
+                        help='새 업로드 확인 주기(초) (기본값: 3600)')
+    parser.add_argument('--min-duration', type=int, default=60,
+                        help='최소 비디오 길이(초) - Shorts 필터링용 (기본값: 60)')
+    args = parser.parse_args()
+
+    api_keys = load_api_keys(args.api_key)
+    if not api_keys:
+        logger.error("❌ API 키가 필요합니다! (.env의 YOUTUBE_API_KEY 또는 --api-key)")
+        sys.exit(1)
+
+    # Stats must be fresh, so the response cache is not used here
+    collector = YouTubeDataCollector(args.api_key, scheduler=QuotaScheduler(
+        api_keys, ledger=QuotaLedger(args.quota_ledger), wait_for_reset=not args.once,
+        rate_limiter=TokenBucket(10.0)), manifest=ArtifactManifest())
+
+    channel_id = collector.get_channel_id(args.channel)
+    channel_slug = collector.get_channel_info(channel_id)['channel_slug']
+
+    videos_file = channel_path(channel_slug, 'videos.json')
+    if not os.path.exists(videos_file):
+        logger.error(f"❌ 비디오 목록이 없습니다: {videos_file} (먼저 youtube_channel_data_collector.py 실행)")
+        sys.exit(1)
+    with open(videos_file, 'r', encoding='utf-8') as f:
+        videos = json.load(f)
+
+    try:
+        if args.once or args.dry_run:
+            scheduler = StatsRefreshScheduler(videos, StatsTimeSeries(channel_path(channel_slug, 'stats_timeseries')))
+            refreshed = refresh_once(collector, scheduler, channel_slug, videos,
+                                     max_batches=args.max_batches, dry_run=args.dry_run)
+            logger.info(f"✓ 비디오 {refreshed}개 통계 갱신 완료")
+        else:
+            run_loop(collector, channel_id, channel_slug, videos, args.max_batches,
+                     args.max_sleep, args.sync_interval, args.min_duration)
+    except QuotaExhaustedError as e:
+        logger.warning(f"⏸ {e}")
+        sys.exit(2)
+    except KeyboardInterrupt:
+        logger.info("중단됨")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Engagement Stats Time Series
+Append-only columnar store of view/like/comment snapshots, one row per (video, collected_at).
+"""
+
+import os
+import sys
+import json
+import argparse
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from data_paths import artifact_dir, channel_path, find_files
+
+logger = logging.getLogger(__name__)
+
+METRICS = ('view_count', 'like_count', 'comment_count', 'favorite_count')
+
+# Uncompacted segments (one per append) tolerated before they are merged
+AUTO_COMPACT_SEGMENTS = 48
+
+
+def to_epoch(timestamp: Optional[str]) -> Optional[int]:
+    """Parse an ISO 8601 timestamp ('Z' or naive local time) to epoch seconds."""
+    if not timestamp:
+        return None
+    return int(datetime.fromisoformat(timestamp.replace('Z', '+00:00')).timestamp())
+
+
+def _month_of(epoch: int) -> str:
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime('%Y%m')
+
+
+def _group_starts(video_idx: np.ndarray) -> np.ndarray:
+    """Mask of rows that start a new video run in (video, time)-sorted order."""
+    starts = np.ones(len(video_idx), dtype=bool)
+    starts[1:] = video_idx[1:] != video_idx[:-1]
+    return starts
+
+
+def _delta_encode(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Difference from the previous row of the same video (first row kept absolute)."""
+    deltas = np.diff(values, prepend=values[:1])
+    deltas[starts] = values[starts]
+    return deltas
+
+
+def _delta_decode(deltas: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Inverse of _delta_encode: cumulative sum restarted at every video run."""
+    totals = np.cumsum(deltas)
+    group = np.cumsum(starts) - 1
+    offsets = (totals - deltas)[starts]
+    return totals - offsets[group]
+
+
+class StatsTimeSeries:
+    """Append-only engagement history for one channel.
+
+    Every append writes an immutable segment sorted by (video, collected_at).
+    Video IDs are dictionary-encoded, and timestamps and counts are stored as
+    per-video deltas, so hourly snapshots compress to a few bytes per row.
+    Small segments are periodically merged into one segment per month, and
+    range queries only open segments whose time span overlaps the request.
+    """
+
+    def __init__(self, directory: str):
+        """Open (or create) a store.
+
+        Args:
+            directory: Store directory, e.g. data/{slug}_stats_timeseries
+        """
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, 'manifest.json')
+        self.video_ids: List[str] = []
+        self.published_at: List[Optional[int]] = []
+        self.segments: List[Dict] = []
+        self.next_segment = 1
+
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            self.video_ids = manifest['video_ids']
+            self.published_at = manifest['published_at']
+            self.segments = manifest['segments']
+            self.next_segment = manifest['next_segment']
+        self._index = {video_id: i for i, video_id in enumerate(self.video_ids)}
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def _video_index(self, video_id: str, published_at: Optional[str]) -> int:
+        idx = self._index.get(video_id)
+        if idx is None:
+            idx = self._index[video_id] = len(self.video_ids)
+            self.video_ids.append(video_id)
+            self.published_at.append(None)
+        if published_at and self.published_at[idx] is None:
+            self.published_at[idx] = to_epoch(published_at)
+        return idx
+
+    def _save_manifest(self):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'video_ids': self.video_ids,
+                'published_at': self.published_at,
+                'segments': self.segments,
+                'next_segment': self.next_segment
+            }, f)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _write_segment(self, columns: Dict[str, np.ndarray], compacted: bool) -> Dict:
+        """Sort, delta-encode and write one segment file; return its manifest entry."""
+        order = np.lexsort((columns['collected_at'], columns['video_idx']))
+        video_idx = columns['video_idx'][order].astype(np.int64)
+        collected_at = columns['collected_at'][order].astype(np.int64)
+        starts = _group_starts(video_idx)
+
+        t_min, t_max = int(collected_at.min()), int(collected_at.max())
+        encoded = {
+            'video_idx': np.diff(video_idx, prepend=0).astype(np.uint32),
+            'collected_at': _delta_encode(collected_at - t_min, starts).astype(np.int64),
+        }
+        for metric in METRICS:
+            encoded[metric] = _delta_encode(columns[metric][order].astype(np.int64), starts)
+
+        name = f"seg_{self.next_segment:06d}.npz"
+        self.next_segment += 1
+        path = os.path.join(self.directory, name)
+        # np.savez_compressed appends .npz to names that lack it
+        tmp_path = f"{path}.tmp.npz"
+        np.savez_compressed(tmp_path, **encoded)
+        os.replace(tmp_path, path)
+
+        return {'file': name, 'rows': int(len(video_idx)), 't_min': t_min, 't_max': t_max,
+                'compacted': compacted}
+
+    def _existing(self, video_idx: np.ndarray, collected_at: np.ndarray) -> np.ndarray:
+        """Mask of (video, collected_at) pairs that are already stored."""
+        keys = video_idx * 2**32 + collected_at
+        stored = []
+        for segment in self._segments_between(int(collected_at.min()), int(collected_at.max())):
+            columns = self._read_segment(segment)
+            stored.append(columns['video_idx'] * 2**32 + columns['collected_at'])
+        if not stored:
+            return np.zeros(len(keys), dtype=bool)
+        return np.isin(keys, np.concatenate(stored))
+
+    def append(self, stats: Iterable[Dict], published_at: Optional[Dict[str, str]] = None) -> int:
+        """Append one batch of snapshots as a new segment.
+
+        Snapshots already in the store (same video and collected_at, e.g. a
+        statistics response replayed from the API cache) are skipped.
+
+        Args:
+            stats: Engagement stats dictionaries (video_id, *_count, collected_at)
+            published_at: Optional video_id -> ISO publish time, used for age queries
+
+        Returns:
+            Number of rows appended
+        """
+        published_at = published_at or {}
+        rows = [s for s in stats if s.get('collected_at')]
+        if not rows:
+            return 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        columns = {
+            'video_idx': np.array([self._video_index(s['video_id'], published_at.get(s['video_id']))
+                                   for s in rows], dtype=np.int64),
+            'collected_at': np.array([to_epoch(s['collected_at']) for s in rows], dtype=np.int64),
+        }
+        for metric in METRICS:
+            columns[metric] = np.array([int(s.get(metric, 0)) for s in rows], dtype=np.int64)
+
+        _, first = np.unique(columns['video_idx'] * 2**32 + columns['collected_at'], return_index=True)
+        new = np.zeros(len(rows), dtype=bool)
+        new[first] = True
+        new &= ~self._existing(columns['video_idx'], columns['collected_at'])
+        if not new.all():
+            logger.info(f"이미 저장된 스냅샷 {int((~new).sum())}개 건너뜀")
+            if not new.any():
+                self._save_manifest()
+                return 0
+            columns = {name: values[new] for name, values in columns.items()}
+
+        self.segments.append(self._write_segment(columns, compacted=False))
+        self._save_manifest()
+
+        if sum(1 for segment in self.segments if not segment['compacted']) >= AUTO_COMPACT_SEGMENTS:
+            self.compact()
+        return int(new.sum())
+
+    def compact(self):
+        """Merge all segments of each calendar month (UTC) into a single segment.
+
+        Merging puts consecutive snapshots of a video next to each other, which
+        is where delta encoding pays off.
+        """
+        by_month: Dict[str, List[Dict]] = {}
+        for segment in self.segments:
+            by_month.setdefault(_month_of(segment['t_min']), []).append(segment)
+
+        merged_segments, obsolete = [], []
+        for month in sorted(by_month):
+            group = by_month[month]
+            if len(group) == 1:
+                group[0]['compacted'] = True
+                merged_segments.append(group[0])
+                continue
+            parts = [self._read_segment(segment) for segment in group]
+            columns = {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+            merged_segments.append(self._write_segment(columns, compacted=True))
+            obsolete.extend(segment['file'] for segment in group)
+
+        self.segments = sorted(merged_segments, key=lambda segment: segment['t_min'])
+        self._save_manifest()
+        for name in obsolete:
+            os.remove(os.path.join(self.directory, name))
+        logger.info(f"✓ 통계 시계열 압축: 세그먼트 {len(obsolete)}개 병합 → 총 {len(self.segments)}개")
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def _read_segment(self, segment: Dict) -> Dict[str, np.ndarray]:
+        """Load and decode one segment file."""
+        with np.load(os.path.join(self.directory, segment['file'])) as data:
+            video_idx = np.cumsum(data['video_idx'].astype(np.int64))
+            starts = _group_starts(video_idx)
+            columns = {
+                'video_idx': video_idx,
+                'collected_at': _delta_decode(data['collected_at'], starts) + segment['t_min'],
+            }
+            for metric in METRICS:
+                columns[metric] = _delta_decode(data[metric], starts)
+        return columns
+
+    def _segments_between(self, t_start: Optional[int], t_end: Optional[int]) -> List[Dict]:
+        return [segment for segment in self.segments
+                if (t_start is None or segment['t_max'] >= t_start)
+                and (t_end is None or segment['t_min'] <= t_end)]
+
+    def load(self, start: Optional[str] = None, end: Optional[str] = None,
+             video_ids: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        """Load snapshots collected in a time range.
+
+        Args:
+            start: Inclusive ISO start time (default: beginning)
+            end: Inclusive ISO end time (default: now)
+            video_ids: Restrict to these videos (default: all)
+
+        Returns:
+            Column dictionary: video_idx, collected_at (epoch seconds) and one
+            array per metric; map video_idx through self.video_ids
+        """
+        t_start, t_end = to_epoch(start), to_epoch(end)
+        wanted = None
+        if video_ids is not None:
+            wanted = np.array([self._index[v] for v in video_ids if v in self._index], dtype=np.int64)
+
+        parts = []
+        for segment in self._segments_between(t_start, t_end):
+            columns = self._read_segment(segment)
+            mask = np.ones(len(columns['video_idx']), dtype=bool)
+            if t_start is not None:
+                mask &= columns['collected_at'] >= t_start
+            if t_end is not None:
+                mask &= columns['collected_at'] <= t_end
+            if wanted is not None:
+                mask &= np.isin(columns['video_idx'], wanted)
+            parts.append({name: values[mask] for name, values in columns.items()})
+
+        names = ('video_idx', 'collected_at') + METRICS
+        if not parts:
+            return {name: np.array([], dtype=np.int64) for name in names}
+        return {name: np.concatenate([part[name] for part in parts]) for name in names}
+
+    def series(self, video_id: str) -> Dict[str, np.ndarray]:
+        """Full growth curve of one video, oldest snapshot first."""
+        columns = self.load(video_ids=[video_id])
+        order = np.argsort(columns['collected_at'], kind='stable')
+        return {name: values[order] for name, values in columns.items()}
+
+    def at_age(self, age_seconds: float, tolerance_seconds: float = 3600) -> Dict[str, np.ndarray]:
+        """Snapshot of every video closest to a given age since publication.
+
+        Args:
+            age_seconds: Target age, e.g. 86400 for "views at 24h"
+            tolerance_seconds: Maximum distance between the snapshot and the target age
+
+        Returns:
+            Column dictionary with one row per video that has a snapshot within
+            tolerance: video_idx, age (actual seconds since publish) and metrics
+        """
+        published = np.array([p if p is not None else -1 for p in self.published_at], dtype=np.int64)
+        known = published >= 0
+        if not known.any():
+            return {name: np.array([], dtype=np.int64) for name in ('video_idx', 'age') + METRICS}
+
+        targets = published + int(age_seconds)
+        window_start = int(targets[known].min() - tolerance_seconds)
+        window_end = int(targets[known].max() + tolerance_seconds)
+
+        best: Optional[Dict[str, np.ndarray]] = None
+        for segment in self._segments_between(window_start, window_end):
+            columns = self._read_segment(segment)
+            video_idx = columns['video_idx']
+            distance = np.abs(columns['collected_at'] - targets[video_idx])
+            mask = known[video_idx] & (distance <= tolerance_seconds)
+            candidate = {name: values[mask] for name, values in columns.items()}
+            candidate['distance'] = distance[mask]
+            if best is not None:
+                candidate = {name: np.concatenate([best[name], candidate[name]]) for name in candidate}
+            # Keep the closest snapshot per video
+            order = np.lexsort((candidate['distance'], candidate['video_idx']))
+            candidate = {name: values[order] for name, values in candidate.items()}
+            keep = _group_starts(candidate['video_idx'])
+            best = {name: values[keep] for name, values in candidate.items()}
+
+        if best is None:
+            return {name: np.array([], dtype=np.int64) for name in ('video_idx', 'age') + METRICS}
+        result = {'video_idx': best['video_idx'],
+                  'age': best['collected_at'] - published[best['video_idx']]}
+        for metric in METRICS:
+            result[metric] = best[metric]
+        return result
+
+    def import_snapshots(self, stats_dir: str, published_at: Optional[Dict[str, str]] = None) -> int:
+        """Seed the store from existing *_stats.json snapshot files.
+
+        Args:
+            stats_dir: data/{slug}_engagement_stats directory
+            published_at: Optional video_id -> ISO publish time
+
+        Returns:
+            Number of rows appended
+        """
+        stats = []
+        for path in find_files(stats_dir, '_stats.json').values():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    stats.append(json.load(f))
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"⚠ 통계 파일 로드 실패: {path} ({e})")
+        return self.append(stats, published_at)
+
+
+def parse_age(text: str) -> int:
+    """Parse an age such as '24h', '7d' or '90m' into seconds."""
+    units = {'m': 60, 'h': 3600, 'd': 86400}
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def main():
+    """Command-line entry point."""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='참여도 통계 시계열 저장소 도구')
+    parser.add_argument('channel_slug', help='채널 슬러그 (data/{slug}_stats_timeseries)')
+    parser.add_argument('--import-snapshots', action='store_true',
+                        help='기존 data/{slug}_engagement_stats/*_stats.json 을 시계열에 추가')
+    parser.add_argument('--compact', action='store_true', help='월 단위로 세그먼트 병합')
+    parser.add_argument('--at-age', help='게시 후 특정 시점의 통계 조회 (예: 24h, 7d)')
+    parser.add_argument('--tolerance', default='1h', help='--at-age 허용 오차 (기본값: 1h)')
+    args = parser.parse_args()
+
+    store = StatsTimeSeries(channel_path(args.channel_slug, 'stats_timeseries'))
+
+    if args.import_snapshots:
+        published_at = {}
+        videos_file = channel_path(args.channel_slug, 'videos.json')
+        if os.path.exists(videos_file):
+            with open(videos_file, 'r', encoding='utf-8') as f:
+                published_at = {v['video_id']: v.get('published_at') for v in json.load(f)}
+        rows = store.import_snapshots(artifact_dir('stats', args.channel_slug), published_at)
+        logger.info(f"✓ 스냅샷 {rows}개 추가")
+
+    if args.compact:
+        store.compact()
+
+    total_rows = sum(segment['rows'] for segment in store.segments)
+    logger.info(f"비디오 {len(store.video_ids):,}개, 스냅샷 {total_rows:,}행, 세그먼트 {len(store.segments)}개")
+
+    if args.at_age:
+        result = store.at_age(parse_age(args.at_age), parse_age(args.tolerance))
+        if not len(result['video_idx']):
+            logger.warning(f"⚠ 게시 후 {args.at_age} 시점의 스냅샷이 없습니다.")
+            sys.exit(1)
+        views = result['view_count']
+        logger.info(f"게시 후 {args.at_age}: 비디오 {len(views):,}개, "
+                    f"조회수 중앙값 {int(np.median(views)):,}, 평균 {int(views.mean()):,}")
+
+
+if __name__ == "__main__":
+    main()
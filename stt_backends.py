@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Speech-to-Text Backends
+One transcription interface over openai-whisper (PyTorch, fp32 on CPU) and faster-whisper (CTranslate2, int8), with a real-time-factor benchmark.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import logging
+from typing import Dict, List, Type, Union
+
+import numpy as np
+
+import vad
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKEND = 'openai-whisper'
+DEFAULT_LANGUAGE = 'ko'
+
+MODEL_SIZES = ('tiny', 'base', 'small', 'medium', 'large')
+
+
+class STTBackend:
+    """A loaded speech-to-text model.
+
+    Subclasses load their runtime lazily, so importing this module never
+    requires torch or CTranslate2.
+    """
+
+    name = ''
+    install = ''
+
+    def __init__(self, model_size: str = 'base', cpu_threads: int = 0):
+        """Create a backend (the model is loaded by load()).
+
+        Args:
+            model_size: Whisper model size (tiny, base, small, medium, large)
+            cpu_threads: Threads for inference (0: runtime default). Set it
+                when several worker processes share the CPU.
+        """
+        self.model_size = model_size
+        self.cpu_threads = cpu_threads
+        self.model = None
+
+    @property
+    def model_name(self) -> str:
+        """Value of the transcript's "Model:" header."""
+        return f"{self.name}-{self.model_size}"
+
+    def load(self) -> 'STTBackend':
+        """Load the model weights.
+
+        Raises:
+            ImportError: The backend's package is not installed
+        """
+        raise NotImplementedError
+
+    def transcribe(self, audio: Union[str, np.ndarray], language: str = DEFAULT_LANGUAGE) -> Dict:
+        """Transcribe one audio file or 16 kHz mono float32 samples (e.g. VAD-trimmed).
+
+        Returns:
+            {'text', 'language', 'duration' (audio seconds),
+             'segments': [{'start', 'end', 'text'}, ...]}
+        """
+        raise NotImplementedError
+
+
+class OpenAIWhisperBackend(STTBackend):
+    """Reference openai-whisper runtime (PyTorch, fp32 on CPU)."""
+
+    name = 'openai-whisper'
+    install = 'pip install openai-whisper'
+
+    @property
+    def model_name(self) -> str:
+        # Unchanged from transcripts written before backends were pluggable
+        return f"whisper-{self.model_size}"
+
+    def load(self) -> 'OpenAIWhisperBackend':
+        import whisper
+        if self.cpu_threads:
+            import torch
+            torch.set_num_threads(self.cpu_threads)
+        self.model = whisper.load_model(self.model_size)
+        return self
+
+    def transcribe(self, audio: Union[str, np.ndarray], language: str = DEFAULT_LANGUAGE) -> Dict:
+        import whisper
+        # Decode once so the duration needs no second ffmpeg run
+        if not isinstance(audio, np.ndarray):
+            audio = whisper.load_audio(str(audio))
+        result = self.model.transcribe(audio, language=language, fp16=False)
+        return {
+            'text': result['text'],
+            'language': result.get('language', language),
+            'duration': len(audio) / whisper.audio.SAMPLE_RATE,
+            'segments': [{'start': segment['start'], 'end': segment['end'], 'text': segment['text']}
+                         for segment in result.get('segments', [])],
+        }
+
+
+class FasterWhisperBackend(STTBackend):
+    """faster-whisper runtime (CTranslate2 with int8 weights on CPU)."""
+
+    name = 'faster-whisper'
+    install = 'pip install faster-whisper'
+    compute_type = 'int8'
+
+    @property
+    def model_name(self) -> str:
+        return f"faster-whisper-{self.model_size}-{self.compute_type}"
+
+    def load(self) -> 'FasterWhisperBackend':
+        from faster_whisper import WhisperModel
+        self.model = WhisperModel(self.model_size, device='cpu', compute_type=self.compute_type,
+                                  cpu_threads=self.cpu_threads)
+        return self
+
+    def transcribe(self, audio: Union[str, np.ndarray], language: str = DEFAULT_LANGUAGE) -> Dict:
+        if not isinstance(audio, np.ndarray):
+            audio = str(audio)
+        segments, info = self.model.transcribe(audio, language=language, beam_size=5)
+        # segments is a generator: decoding happens while it is consumed
+        segments = [{'start': segment.start, 'end': segment.end, 'text': segment.text} for segment in segments]
+        return {
+            # Segment texts carry their leading space, as in openai-whisper's 'text'
+            'text': ''.join(segment['text'] for segment in segments),
+            'language': info.language,
+            'duration': info.duration,
+            'segments': segments,
+        }
+
+
+BACKENDS: Dict[str, Type[STTBackend]] = {
+    backend.name: backend for backend in (OpenAIWhisperBackend, FasterWhisperBackend)
+}
+
+
+def create_backend(name: str = DEFAULT_BACKEND, model_size: str = 'base', cpu_threads: int = 0) -> STTBackend:
+    """Create and load a backend.
+
+    Raises:
+        ValueError: Unknown backend name
+        ImportError: The backend's package is not installed (message has the pip command)
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"알 수 없는 STT 백엔드: {name} (사용 가능: {', '.join(BACKENDS)})")
+    backend = BACKENDS[name](model_size, cpu_threads)
+    try:
+        return backend.load()
+    except ImportError as e:
+        raise ImportError(f"{name} 패키지가 없습니다 ({e}). 설치: {backend.install}") from e
+
+
+def transcribe_file(backend: STTBackend, audio_path: str, language: str = DEFAULT_LANGUAGE,
+                    use_vad: bool = False) -> Dict:
+    """Transcribe a file, optionally decoding only its speech regions.
+
+    With use_vad, silence, music and game audio found by vad.speech_regions
+    are cut before decoding and segment times are mapped back to the
+    original timeline. If no speech is found the whole file is decoded,
+    so a VAD miss never produces an empty transcript.
+
+    Returns:
+        backend.transcribe() result ('duration' is the original length),
+        plus 'vad' (vad.summarize()) when use_vad is set
+    """
+    if not use_vad:
+        return backend.transcribe(audio_path, language)
+    audio = vad.load_audio(audio_path)
+    regions = vad.speech_regions(audio) or [(0.0, len(audio) / vad.SAMPLE_RATE)]
+    result = backend.transcribe(vad.trim(audio, regions), language)
+    return {
+        **result,
+        'duration': len(audio) / vad.SAMPLE_RATE,
+        'segments': vad.remap_segments(result['segments'], regions),
+        'vad': vad.summarize(audio, regions),
+    }
+
+
+def benchmark(audio_files: List[str], backends: List[str], model_size: str = 'base', cpu_threads: int = 0,
+              language: str = DEFAULT_LANGUAGE, use_vad: bool = False) -> List[Dict]:
+    """Transcribe the same files with each backend and measure speed.
+
+    The real-time factor (RTF) is processing seconds per audio second:
+    below 1 is faster than real time, and 1 / RTF is the throughput in
+    audio hours per hour of one worker. With use_vad the RTF still counts
+    the full audio length, so it shows what trimming saves.
+
+    Returns:
+        One row per backend: {'backend', 'model', 'load_seconds', 'audio_seconds',
+        'transcribe_seconds', 'rtf', 'throughput', 'characters', 'files'}
+        or {'backend', 'error'} when it could not be loaded
+    """
+    rows = []
+    for name in backends:
+        start = time.perf_counter()
+        try:
+            backend = create_backend(name, model_size, cpu_threads)
+        except ImportError as e:
+            logger.warning(f"⚠ {e}")
+            rows.append({'backend': name, 'error': str(e)})
+            continue
+        load_seconds = time.perf_counter() - start
+
+        audio_seconds = transcribe_seconds = 0.0
+        characters = 0
+        files = []
+        for audio_file in audio_files:
+            start = time.perf_counter()
+            result = transcribe_file(backend, audio_file, language, use_vad)
+            elapsed = time.perf_counter() - start
+            audio_seconds += result['duration']
+            transcribe_seconds += elapsed
+            characters += len(result['text'])
+            files.append({
+                'file': audio_file,
+                'audio_seconds': round(result['duration'], 2),
+                'seconds': round(elapsed, 2),
+                'rtf': round(elapsed / result['duration'], 4) if result['duration'] else None,
+                'skipped_fraction': result['vad']['skipped_fraction'] if use_vad else 0.0,
+                'text': result['text'],
+            })
+            logger.info(f"  {name}: {os.path.basename(audio_file)} "
+                        f"{result['duration']:.0f}초 오디오 → {elapsed:.1f}초")
+
+        rtf = transcribe_seconds / audio_seconds if audio_seconds else None
+        rows.append({
+            'backend': name,
+            'model': backend.model_name,
+            'load_seconds': round(load_seconds, 2),
+            'audio_seconds': round(audio_seconds, 2),
+            'transcribe_seconds': round(transcribe_seconds, 2),
+            'rtf': round(rtf, 4) if rtf else None,
+            'throughput': round(1 / rtf, 2) if rtf else None,
+            'characters': characters,
+            'files': files,
+        })
+    return rows
+
+
+def main():
+    """Command-line entry point: RTF benchmark on local audio files."""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(
+        description='STT 백엔드 속도 비교 (같은 오디오를 백엔드별로 변환해 RTF 측정)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python stt_backends.py data/tmp/*.mp3
+  python stt_backends.py data/tmp/*.mp3 --model small --threads 4
+  python stt_backends.py data/tmp/abc123.mp3 --backends faster-whisper --output data/stt_benchmark.json
+  python stt_backends.py data/tmp/*.mp3 --vad   # 음성 구간만 변환 (RTF는 전체 길이 기준)
+  python stt_backends.py fixtures/audio/*.wav --model tiny   # 설치 확인용 (합성 오디오라 RTF 의미 없음)
+
+RTF = 변환 시간 / 오디오 길이 (1보다 작으면 실시간보다 빠름)
+백엔드 간 RTF는 아직 측정하지 않았으므로 실제 오디오로 이 장비에서 측정해서 비교
+        """
+    )
+    parser.add_argument('audio', nargs='+', help='변환할 오디오 파일')
+    parser.add_argument('--backends', nargs='+', choices=sorted(BACKENDS), default=list(BACKENDS),
+                        help='비교할 백엔드 (기본값: 전체)')
+    parser.add_argument('--model', choices=MODEL_SIZES, default='base', help='Whisper 모델 크기 (기본값: base)')
+    parser.add_argument('--threads', type=int, default=0, help='추론 스레드 수 (기본값: 런타임 기본)')
+    parser.add_argument('--language', default=DEFAULT_LANGUAGE, help=f'언어 코드 (기본값: {DEFAULT_LANGUAGE})')
+    parser.add_argument('--vad', action='store_true', help='음성 구간만 변환 (vad.py)')
+    parser.add_argument('--output', help='결과(파일별 시간과 자막 포함)를 저장할 JSON 파일')
+    args = parser.parse_args()
+
+    rows = benchmark(args.audio, args.backends, args.model, args.threads, args.language, args.vad)
+
+    print(f"\n{'백엔드':<16}{'모델':<26}{'로드':>8}{'오디오':>10}{'변환':>10}{'RTF':>8}{'배속':>8}{'글자':>8}")
+    for row in rows:
+        if 'error' in row:
+            print(f"{row['backend']:<16}{'-':<26}  ❌ {row['error']}")
+            continue
+        rtf = f"{row['rtf']:.3f}" if row['rtf'] else '-'
+        speed = f"{row['throughput']:.1f}x" if row['throughput'] else '-'
+        print(f"{row['backend']:<16}{row['model']:<26}{row['load_seconds']:>7.1f}s{row['audio_seconds']:>9.0f}s"
+              f"{row['transcribe_seconds']:>9.1f}s{rtf:>8}{speed:>8}{row['characters']:>8,}")
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+        logger.info(f"✓ 결과 저장: {args.output}")
+    if not any('error' not in row for row in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
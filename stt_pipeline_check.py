@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+STT 파이프라인 로컬 점검
+fixtures/audio 의 짧은 오디오를 로컬 HTTP 서버(YouTube 대역)로 내려주고
+batch_stt 다운로드/변환 파이프라인을 끝까지 실행해 결과 확인
+(네트워크/YouTube 없이 실행, 임시 작업 디렉토리에서 돌리므로 data/ 는 건드리지 않음)
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from batch_stt import BatchWhisperProcessor
+from compressed_storage import read_text
+from data_paths import artifact_dir, file_path
+from stt_backends import BACKENDS, DEFAULT_BACKEND
+
+# 점검용 오디오와 비디오 목록 (제목/길이)
+FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures" / "audio"
+FIXTURE_CATALOG = FIXTURE_DIR / "videos.json"
+FIXTURE_SUFFIX = ".wav"
+
+
+class FixtureServer:
+    """
+    fixtures/audio 를 내려주는 로컬 HTTP 서버 (빈 포트, 백그라운드 스레드)
+
+    batch_stt --source-url 에 url_template 을 넘기면 YouTube 대신 이 서버에서 받음
+    downloads 는 오디오 요청 수 (캐시된 오디오를 다시 받지 않는지 확인용)
+    """
+
+    def __init__(self, directory: Path = FIXTURE_DIR):
+        server = self
+
+        class Handler(SimpleHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.endswith(FIXTURE_SUFFIX):
+                    with server.lock:
+                        server.downloads += 1
+                super().do_GET()
+
+            def log_message(self, format, *args):
+                pass
+
+        self.lock = threading.Lock()
+        self.downloads = 0
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), partial(Handler, directory=str(directory)))
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="fixture-server", daemon=True)
+
+    @property
+    def url_template(self) -> str:
+        """오디오 다운로드 URL 형식 ({video_id} 치환)"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/{{video_id}}{FIXTURE_SUFFIX}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.thread.join()
+
+
+def load_fixtures(catalog_path: Path = FIXTURE_CATALOG) -> list:
+    """점검용 비디오 ID 목록"""
+    with open(catalog_path, 'r', encoding='utf-8') as f:
+        return [item['video_id'] for item in json.load(f)]
+
+
+def check_transcripts(output_dir: Path, video_ids: list) -> list:
+    """자막 파일이 모두 있고 헤더 형식이 맞는지 확인 (문제 목록 반환)"""
+    problems = []
+    for video_id in video_ids:
+        path = file_path(str(output_dir), video_id, "_whisper_transcript.txt")
+        try:
+            header = read_text(path).split("\n", 3)[:3]
+        except OSError:
+            problems.append(f"{video_id}: 자막 파일 없음 ({path})")
+            continue
+        if len(header) < 3 or header[0] != f"Video ID: {video_id}" or not header[2].startswith("Model: "):
+            problems.append(f"{video_id}: 자막 헤더가 다름 {header}")
+    return problems
+
+
+def run_check(backend: str = DEFAULT_BACKEND, model_size: str = "tiny", workers: int = 2,
+              use_vad: bool = False) -> list:
+    """
+    픽스처 서버를 띄우고 파이프라인을 두 번 실행
+
+    1회차: 모든 오디오를 한 번씩 받아 변환하고 자막을 저장해야 함
+    2회차: 모두 이미 처리된 것으로 건너뛰고, 오디오를 다시 받지 않아야 함
+
+    현재 디렉토리를 작업 디렉토리로 사용 (data/tmp, 산출물 목록, 자막이 여기에 생김)
+
+    Returns:
+        발견된 문제 목록 (비어 있으면 통과)
+    """
+    fixtures = load_fixtures()
+    output_dir = Path(artifact_dir("transcript"))
+    problems = []
+
+    with FixtureServer() as server:
+        print(f"🌐 픽스처 서버: {server.url_template}")
+
+        def run_batch():
+            processor = BatchWhisperProcessor(
+                videos_json=str(FIXTURE_CATALOG),
+                output_dir=str(output_dir),
+                model_size=model_size,
+                backend=backend,
+                use_vad=use_vad,
+                max_workers=workers,
+                download_workers=2,
+                url_template=server.url_template
+            )
+            return processor.process_batch() or {}
+
+        stats = run_batch()
+        if stats.get('success') != len(fixtures):
+            problems.append(f"1회차: {len(fixtures)}개 중 {stats.get('success', 0)}개 성공 "
+                            f"({[error['video_id'] for error in stats.get('errors', [])]} 실패)")
+        if server.downloads != len(fixtures):
+            problems.append(f"1회차: 오디오 요청 {server.downloads}회 (예상 {len(fixtures)}회)")
+        problems.extend(check_transcripts(output_dir, fixtures))
+
+        downloads = server.downloads
+        stats = run_batch()
+        if stats.get('skipped') != len(fixtures):
+            problems.append(f"2회차: {len(fixtures)}개 중 {stats.get('skipped', 0)}개만 건너뜀")
+        if server.downloads != downloads:
+            problems.append(f"2회차: 오디오를 다시 받음 ({server.downloads - downloads}회)")
+
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='로컬 픽스처 서버로 STT 배치 파이프라인 점검 (다운로드 → 변환 → 저장 → 재실행 건너뛰기)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python stt_pipeline_check.py
+  python stt_pipeline_check.py --backend faster-whisper --vad
+  python stt_pipeline_check.py --keep   # 작업 디렉토리를 지우지 않고 경로 출력
+
+필요: yt-dlp, ffmpeg, 선택한 STT 백엔드 (fixtures/audio 의 합성 오디오라 자막 내용은 확인하지 않음)
+        """
+    )
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default=DEFAULT_BACKEND,
+                        help=f'STT 백엔드 (기본: {DEFAULT_BACKEND})')
+    parser.add_argument('--model', choices=['tiny', 'base', 'small', 'medium', 'large'], default='tiny',
+                        help='Whisper 모델 크기 (기본: tiny)')
+    parser.add_argument('--workers', type=int, default=2, help='Whisper 워커 수 (기본: 2)')
+    parser.add_argument('--vad', action='store_true', help='음성 구간만 변환')
+    parser.add_argument('--keep', action='store_true', help='작업 디렉토리를 남김')
+    args = parser.parse_args()
+
+    workspace = tempfile.mkdtemp(prefix="stt_check_")
+    cwd = os.getcwd()
+    os.chdir(workspace)
+    try:
+        problems = run_check(args.backend, args.model, args.workers, args.vad)
+    finally:
+        os.chdir(cwd)
+        if args.keep:
+            print(f"📁 작업 디렉토리: {workspace}")
+        else:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+    if problems:
+        print("\n❌ 파이프라인 점검 실패:")
+        for problem in problems:
+            print(f"  - {problem}")
+        sys.exit(1)
+    print("\n✅ 파이프라인 점검 통과")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,75 +2,178 @@
 """
 Whisper 트랜스포머로 YouTube 비디오 자막 생성
 data/chimchakman_official_transcripts 에 저장
+(data/transcripts.pack 아카이브가 있으면 함께 추가)
 음성 파일은 data/tmp 에 캐싱
+(제목/길이는 _videos.json 또는 data/tmp/{video_id}.info.json 에서 읽고, 둘 다 없을 때만 yt-dlp 조회)
+(오디오/자막 생성 기록은 data/artifacts.db 산출물 목록에 추가)
 """
 
 import os
 import sys
+import json
+import time
 import argparse
 from pathlib import Path
 
+from artifact_manifest import DEFAULT_MANIFEST_PATH, record_artifact
+from compressed_storage import set_compression, write_text
+from data_paths import DEFAULT_CHANNEL_SLUG, artifact_dir, channel_path, file_path, make_artifact_dir
+from stt_backends import BACKENDS, DEFAULT_BACKEND, create_backend, transcribe_file
+from transcript_archive import DEFAULT_ARCHIVE_PATH, TranscriptArchive
+
 # 출력 디렉토리
-OUTPUT_DIR = Path("data/chimchakman_official_transcripts")
+OUTPUT_DIR = Path(artifact_dir('transcript'))
 AUDIO_CACHE_DIR = Path("data/tmp")
 
+# 오디오 다운로드 URL ({video_id} 치환, 로컬 테스트 서버로 바꿀 수 있음)
+VIDEO_URL_TEMPLATE = "https://www.youtube.com/watch?v={video_id}"
+
+# 제목/길이를 먼저 찾아볼 비디오 목록 (title, duration_seconds)
+VIDEO_CATALOG = channel_path(DEFAULT_CHANNEL_SLUG, "videos.json")
+
+# 목록에 없는 비디오의 yt-dlp 조회 결과 (오디오 옆에 저장)
+METADATA_SUFFIX = ".info.json"
+
+# 프로세스별로 로드된 STT 모델 ((백엔드, 모델 크기) → STTBackend)
+_MODELS = {}
 
-def test_whisper_single_video(video_id, model_size="base", output_dir=OUTPUT_DIR):
+# 프로세스별로 읽은 비디오 목록 (경로 → {video_id: (제목, 길이)})
+_CATALOGS = {}
+
+
+def load_model(model_size="base", backend=DEFAULT_BACKEND, cpu_threads=0):
     """
-    단일 YouTube 비디오로 Whisper 테스트
+    STT 모델 로드 (프로세스당 한 번, 이후 호출은 캐시 반환)
+    
+    배치 워커는 시작할 때 이 함수로 모델을 올려 두고
+    비디오마다 체크포인트를 다시 읽지 않음
     
     Args:
-        video_id: YouTube 비디오 ID
-        model_size: Whisper 모델 크기 (tiny, base, small, medium, large)
-        output_dir: 출력 디렉토리
+        model_size: Whisper 모델 크기
+        backend: STT 백엔드 (openai-whisper, faster-whisper)
+        cpu_threads: 추론 스레드 수 (0이면 런타임 기본값)
+    
+    Raises:
+        ImportError: 백엔드 패키지가 설치되지 않음 (메시지에 설치 명령 포함)
     """
-    # 출력 디렉토리 생성
-    output_dir = Path(output_dir)
-    output_dir.mkdir(parents=True, exist_ok=True)
+    if (backend, model_size) not in _MODELS:
+        _MODELS[backend, model_size] = create_backend(backend, model_size, cpu_threads)
+    return _MODELS[backend, model_size]
+
+
+def load_catalog(catalog_path=VIDEO_CATALOG):
+    """
+    비디오 목록에서 {video_id: (제목, 길이 초)} 조회 (프로세스당 한 번 읽음)
     
-    # 오디오 캐시 디렉토리 생성
-    AUDIO_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    목록이 없거나 읽을 수 없으면 빈 dict
+    """
+    catalog_path = str(catalog_path)
+    if catalog_path not in _CATALOGS:
+        try:
+            with open(catalog_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = []
+        if isinstance(data, dict):
+            data = data.get('videos', [])
+        _CATALOGS[catalog_path] = {
+            item['video_id']: (item.get('title'), item.get('duration_seconds'))
+            for item in data
+            if isinstance(item, dict) and 'video_id' in item
+        }
+    return _CATALOGS[catalog_path]
+
+
+def video_metadata(video_id, audio_dir=AUDIO_CACHE_DIR, catalog_path=VIDEO_CATALOG):
+    """
+    네트워크 없이 제목/길이 조회: 비디오 목록 → 오디오 옆 .info.json 순서
     
-    print("=" * 80)
-    print("🎤 Whisper (Speech-to-Text Transformer)")
-    print("=" * 80)
-    print(f"\n비디오 ID: {video_id}")
-    print(f"모델 크기: {model_size}")
-    print(f"출력 디렉토리: {output_dir}")
-    print(f"오디오 캐시: {AUDIO_CACHE_DIR}")
+    Returns:
+        {'title', 'duration', 'source'} 또는 둘 다 없으면 None
+    """
+    title, duration = load_catalog(catalog_path).get(video_id, (None, None))
+    if title is not None and duration is not None:
+        return {'title': title, 'duration': duration, 'source': 'catalog'}
+    
+    try:
+        with open(Path(audio_dir) / f"{video_id}{METADATA_SUFFIX}", 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        return {'title': cached['title'], 'duration': cached['duration'], 'source': 'cache'}
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def save_metadata(video_id, title, duration, audio_dir=AUDIO_CACHE_DIR):
+    """yt-dlp로 얻은 제목/길이를 오디오 옆에 저장 (다음 실행은 오프라인으로 조회)"""
+    metadata_file = Path(audio_dir) / f"{video_id}{METADATA_SUFFIX}"
+    temp_file = metadata_file.with_name(metadata_file.name + ".tmp")
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump({'video_id': video_id, 'title': title, 'duration': duration}, f, ensure_ascii=False)
+    os.replace(temp_file, metadata_file)
+
+
+def download_audio(video_id, audio_dir=AUDIO_CACHE_DIR, url_template=VIDEO_URL_TEMPLATE,
+                   manifest_path=DEFAULT_MANIFEST_PATH, catalog_path=VIDEO_CATALOG, verbose=True):
+    """
+    오디오 준비: yt-dlp 다운로드 + ffmpeg mp3 변환 (캐시에 있으면 재사용)
+    
+    네트워크/인코더 대기만 있는 단계라 배치에서는 다운로드 스레드가 실행
+    
+    Args:
+        video_id: YouTube 비디오 ID
+        audio_dir: 오디오 캐시 디렉토리
+        url_template: 다운로드 URL 형식 ({video_id} 치환, 테스트용 로컬 서버 지정 가능)
+        manifest_path: 산출물 목록 경로 (None이면 기록 안 함)
+        catalog_path: 제목/길이를 찾아볼 비디오 목록 (_videos.json)
+        verbose: 단계별 출력 여부
+    
+    Returns:
+        {'video_id', 'audio_path', 'title', 'duration', 'cached'} 또는 실패 시 None
+    """
+    log = print if verbose else (lambda *args, **kwargs: None)
+    audio_dir = Path(audio_dir)
+    audio_dir.mkdir(parents=True, exist_ok=True)
     
     # 오디오 파일 경로 (캐시 디렉토리 사용)
-    output_audio = AUDIO_CACHE_DIR / f"{video_id}.mp3"
+    output_audio = audio_dir / f"{video_id}.mp3"
     audio_already_exists = output_audio.exists()
+    url = url_template.format(video_id=video_id)
     
-    # Step 1: yt-dlp로 오디오 다운로드 (없을 때만)
+    # yt-dlp로 오디오 다운로드 (없을 때만)
     if audio_already_exists:
-        print("\n[1/3] 오디오 파일 확인...")
-        print(f"✓ 기존 오디오 파일 재사용: {output_audio}")
+        log("\n[1/3] 오디오 파일 확인...")
+        log(f"✓ 기존 오디오 파일 재사용: {output_audio}")
         
-        # 비디오 정보는 간단히 가져오기
-        try:
-            import yt_dlp
-            ydl_opts = {'quiet': True}
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                url = f"https://www.youtube.com/watch?v={video_id}"
-                info = ydl.extract_info(url, download=False)
-                video_title = info.get('title', 'Unknown')
-                duration = info.get('duration', 0)
-            print(f"  제목: {video_title}")
-            print(f"  길이: {duration // 60}분 {duration % 60}초")
-        except Exception as e:
-            print(f"  ⚠️  비디오 정보 가져오기 실패: {e}")
-            video_title = "Unknown"
-            duration = 0
+        # 비디오 정보는 로컬(비디오 목록, .info.json)에서 먼저 찾고, 없을 때만 yt-dlp 조회
+        metadata = video_metadata(video_id, audio_dir, catalog_path)
+        if metadata is not None:
+            video_title = metadata['title']
+            duration = metadata['duration']
+            log(f"  제목: {video_title} ({'비디오 목록' if metadata['source'] == 'catalog' else '메타데이터 캐시'})")
+            log(f"  길이: {duration // 60}분 {duration % 60}초")
+        else:
+            try:
+                import yt_dlp
+                ydl_opts = {'quiet': True}
+                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                    info = ydl.extract_info(url, download=False)
+                    video_title = info.get('title', 'Unknown')
+                    duration = info.get('duration', 0)
+                save_metadata(video_id, video_title, duration, audio_dir)
+                log(f"  제목: {video_title}")
+                log(f"  길이: {duration // 60}분 {duration % 60}초")
+            except Exception as e:
+                log(f"  ⚠️  비디오 정보 가져오기 실패: {e}")
+                video_title = "Unknown"
+                duration = 0
     else:
-        print("\n[1/3] 오디오 다운로드 중...")
+        log("\n[1/3] 오디오 다운로드 중...")
         try:
             import yt_dlp
         except ImportError:
             print("❌ yt-dlp가 설치되지 않았습니다.")
             print("설치: pip install yt-dlp")
-            return False
+            return None
         
         ydl_opts = {
             'format': 'bestaudio/best',
@@ -85,73 +188,173 @@ def test_whisper_single_video(video_id, model_size="base", output_dir=OUTPUT_DIR
         
         try:
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                url = f"https://www.youtube.com/watch?v={video_id}"
                 info = ydl.extract_info(url, download=True)
                 video_title = info.get('title', 'Unknown')
                 duration = info.get('duration', 0)
+            save_metadata(video_id, video_title, duration, audio_dir)
                 
-            print(f"✓ 다운로드 완료: {video_title}")
-            print(f"  길이: {duration // 60}분 {duration % 60}초")
-            print(f"  저장: {output_audio}")
+            log(f"✓ 다운로드 완료: {video_title}")
+            log(f"  길이: {duration // 60}분 {duration % 60}초")
+            log(f"  저장: {output_audio}")
+            record_artifact('audio', str(output_audio), tool='stt_whisper:yt-dlp-mp3-192',
+                            video_id=video_id, manifest_path=manifest_path)
             
         except Exception as e:
-            print(f"❌ 다운로드 실패: {e}")
-            print("\n대안: ffmpeg가 설치되어 있는지 확인하세요")
-            print("  Mac: brew install ffmpeg")
-            print("  Ubuntu: sudo apt-get install ffmpeg")
-            return False
+            print(f"❌ 다운로드 실패: {video_id} - {e}")
+            log("\n대안: ffmpeg가 설치되어 있는지 확인하세요")
+            log("  Mac: brew install ffmpeg")
+            log("  Ubuntu: sudo apt-get install ffmpeg")
+            return None
+    
+    return {
+        'video_id': video_id,
+        'audio_path': str(output_audio),
+        'title': video_title,
+        'duration': duration or 0,
+        'cached': audio_already_exists
+    }
+
+
+def transcribe_audio(video_id, audio_path, model_size="base", output_dir=OUTPUT_DIR, title="Unknown",
+                     archive_path=DEFAULT_ARCHIVE_PATH, manifest_path=DEFAULT_MANIFEST_PATH, verbose=True,
+                     backend=DEFAULT_BACKEND, use_vad=False):
+    """
+    준비된 오디오를 Whisper로 변환해 자막 저장 (CPU 작업만, 네트워크 사용 없음)
+    
+    백엔드와 관계없이 같은 형식으로 저장 (헤더의 Model 값만 다름)
+    
+    Args:
+        video_id: YouTube 비디오 ID
+        audio_path: 오디오 파일 경로
+        model_size: Whisper 모델 크기 (tiny, base, small, medium, large)
+        output_dir: 출력 디렉토리
+        title: 자막 헤더에 쓸 제목
+        archive_path: 자막 아카이브 경로 (인덱스가 있을 때만 추가, None이면 사용 안 함)
+        manifest_path: 산출물 목록 경로 (None이면 기록 안 함)
+        verbose: 단계별 출력 여부
+        backend: STT 백엔드 (openai-whisper, faster-whisper)
+        use_vad: 음성 구간만 변환 (무음/음악/게임 소리 구간 건너뜀, 건너뛴 비율은 항상 출력)
+    
+    Returns:
+        (저장된 자막 파일 경로, 변환 결과 dict: text/segments/duration, VAD 사용 시 vad 요약)
+        또는 실패 시 None
+    """
+    log = print if verbose else (lambda *args, **kwargs: None)
+    
+    # 출력 디렉토리 생성 (새 디렉토리는 샤딩 구조)
+    output_dir = Path(output_dir)
+    make_artifact_dir(str(output_dir))
     
     # Step 2: Whisper로 변환
-    print("\n[2/3] Whisper로 자막 생성 중...")
-    print(f"⏳ 모델 로딩 중... (처음엔 다운로드 시간 소요)")
+    log("\n[2/3] Whisper로 자막 생성 중...")
+    log(f"⏳ 모델 로딩 중... (처음엔 다운로드 시간 소요)")
     
     try:
-        import whisper
-    except ImportError:
-        print("❌ Whisper가 설치되지 않았습니다.")
-        print("설치: pip install openai-whisper")
-        return False
+        # 모델 로드 (같은 프로세스에서 이미 로드했으면 재사용)
+        reused = (backend, model_size) in _MODELS
+        engine = load_model(model_size, backend)
+    except ImportError as e:
+        print(f"❌ {e}")
+        return None
     
     try:
-        # Whisper 모델 로드
-        model = whisper.load_model(model_size)
+        log(f"✓ 모델 {'재사용' if reused else '로드 완료'} ({engine.model_name})")
+        log("⏳ 음성 인식 중... (시간이 걸릴 수 있습니다)")
         
-        print(f"✓ 모델 로드 완료 ({model_size})")
-        print("⏳ 음성 인식 중... (시간이 걸릴 수 있습니다)")
+        # 음성 인식 수행 (한국어, use_vad면 음성 구간만 디코딩하고 타임스탬프는 원래 위치로 복원)
+        start_time = time.time()
+        result = transcribe_file(engine, str(audio_path), language="ko", use_vad=use_vad)
+        elapsed = time.time() - start_time
         
-        # 음성 인식 수행
-        result = model.transcribe(
-            str(output_audio),  # Path 객체를 문자열로 변환
-            language="ko",  # 한국어
-            fp16=False  # CPU 호환
-        )
+        if use_vad:
+            summary = result['vad']
+            print(f"  🔇 VAD {video_id}: {summary['skipped_fraction']:.0%} 건너뜀 "
+                  f"(오디오 {summary['audio_seconds']:.0f}초 중 음성 {summary['speech_seconds']:.0f}초, "
+                  f"{summary['regions']}개 구간)")
         
         transcript = result["text"]
         
-        print("✓ 변환 완료!")
-        print(f"  감지된 언어: {result.get('language', 'unknown')}")
-        print(f"  텍스트 길이: {len(transcript)} 글자")
+        log("✓ 변환 완료!")
+        log(f"  감지된 언어: {result.get('language', 'unknown')}")
+        log(f"  텍스트 길이: {len(transcript)} 글자")
+        if result['duration']:
+            log(f"  오디오 {result['duration']:.0f}초 → {elapsed:.0f}초 (RTF {elapsed / result['duration']:.2f})")
         
     except Exception as e:
-        print(f"❌ Whisper 변환 실패: {e}")
-        return False
+        print(f"❌ Whisper 변환 실패: {video_id} - {e}")
+        return None
     
     # Step 3: 결과 저장
-    print("\n[3/3] 결과 저장...")
+    log("\n[3/3] 결과 저장...")
+    
+    # STORAGE_COMPRESSION=zstd 이면 .zst 로 압축 저장
+    output_file = write_text(
+        file_path(str(output_dir), video_id, "_whisper_transcript.txt", create=True),
+        f"Video ID: {video_id}\n"
+        f"Title: {title}\n"
+        f"Model: {engine.model_name}\n"
+        + "-" * 80 + "\n\n"
+        + transcript,
+        kind='transcripts'
+    )
     
-    output_file = output_dir / f"{video_id}_whisper_transcript.txt"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(f"Video ID: {video_id}\n")
-        f.write(f"Title: {video_title}\n")
-        f.write(f"Model: whisper-{model_size}\n")
-        f.write("-" * 80 + "\n\n")
-        f.write(transcript)
+    log(f"✓ 저장 완료: {output_file}")
+    record_artifact('transcript', output_file, tool=f"stt_whisper:{engine.model_name}",
+                    video_id=video_id, manifest_path=manifest_path)
     
-    print(f"✓ 저장 완료: {output_file}")
+    # 아카이브가 만들어져 있으면 함께 추가 (병렬 워커는 파일 잠금으로 직렬화)
+    if archive_path and os.path.exists(f"{archive_path}.idx.json"):
+        TranscriptArchive(archive_path).append(
+            video_id, transcript, title=title, model=engine.model_name
+        )
+        log(f"✓ 아카이브에 추가: {archive_path}")
+    
+    return output_file, result
+
+
+def test_whisper_single_video(video_id, model_size="base", output_dir=OUTPUT_DIR,
+                              archive_path=DEFAULT_ARCHIVE_PATH, manifest_path=DEFAULT_MANIFEST_PATH,
+                              url_template=VIDEO_URL_TEMPLATE, catalog_path=VIDEO_CATALOG,
+                              backend=DEFAULT_BACKEND, use_vad=False):
+    """
+    단일 YouTube 비디오로 Whisper 테스트 (오디오 준비 → 변환 → 저장)
+    
+    Args:
+        video_id: YouTube 비디오 ID
+        model_size: Whisper 모델 크기 (tiny, base, small, medium, large)
+        output_dir: 출력 디렉토리
+        archive_path: 자막 아카이브 경로 (인덱스가 있을 때만 추가, None이면 사용 안 함)
+        manifest_path: 산출물 목록 경로 (오디오/자막 기록, None이면 사용 안 함)
+        url_template: 다운로드 URL 형식 ({video_id} 치환)
+        catalog_path: 제목/길이를 찾아볼 비디오 목록 (_videos.json)
+        backend: STT 백엔드 (openai-whisper, faster-whisper)
+        use_vad: 음성 구간만 변환
+    """
+    print("=" * 80)
+    print("🎤 Whisper (Speech-to-Text Transformer)")
+    print("=" * 80)
+    print(f"\n비디오 ID: {video_id}")
+    print(f"모델 크기: {model_size} ({backend})")
+    print(f"출력 디렉토리: {output_dir}")
+    print(f"오디오 캐시: {AUDIO_CACHE_DIR}")
+    
+    # Step 1: 오디오 준비
+    audio = download_audio(video_id, url_template=url_template, manifest_path=manifest_path,
+                           catalog_path=catalog_path)
+    if audio is None:
+        return False
+    
+    # Step 2-3: 변환 및 저장
+    saved = transcribe_audio(video_id, audio['audio_path'], model_size, output_dir, audio['title'],
+                             archive_path, manifest_path, backend=backend, use_vad=use_vad)
+    if saved is None:
+        return False
+    output_file, result = saved
+    transcript = result['text']
     
     # 오디오 파일은 data/tmp 에 보존 (재사용 위해)
-    if not audio_already_exists:
-        print(f"✓ 오디오 파일 캐싱됨: {output_audio}")
+    if not audio['cached']:
+        print(f"✓ 오디오 파일 캐싱됨: {audio['audio_path']}")
     
     # 결과 미리보기
     print("\n" + "=" * 80)
@@ -165,10 +368,10 @@ def test_whisper_single_video(video_id, model_size="base", output_dir=OUTPUT_DIR
     
     # 통계
     print(f"\n📊 통계:")
-    print(f"  비디오 길이: {duration}초")
+    print(f"  비디오 길이: {audio['duration']}초")
     print(f"  텍스트 길이: {len(transcript)}자")
     print(f"  단어 수: {len(transcript.split())}개")
-    print(f"  오디오 캐시: {output_audio} ({'재사용' if audio_already_exists else '신규'})")
+    print(f"  오디오 캐시: {audio['audio_path']} ({'재사용' if audio['cached'] else '신규'})")
     
     return True
 
@@ -181,6 +384,8 @@ def main():
 사용 예시:
   python sst_whisper.py 15TdCFjSzCk
   python sst_whisper.py QFCLUZWNtQs --model small
+  python sst_whisper.py QFCLUZWNtQs --backend faster-whisper   # CTranslate2 int8 (속도는 stt_backends.py로 측정)
+  python sst_whisper.py QFCLUZWNtQs --vad                      # 음성 구간만 변환
   
 모델 크기 (크기 ↑ = 정확도 ↑, 속도 ↓):
   tiny   - 가장 빠름, 부정확 (39M params)
@@ -191,6 +396,7 @@ def main():
   
 필요 패키지:
   pip install openai-whisper yt-dlp
+  pip install faster-whisper          # --backend faster-whisper 사용 시
   
 ffmpeg 필요:
   Mac: brew install ffmpeg
@@ -210,13 +416,40 @@ ffmpeg 필요:
         help='Whisper 모델 크기 (기본값: base)'
     )
     
+    parser.add_argument(
+        '--backend',
+        choices=sorted(BACKENDS),
+        default=DEFAULT_BACKEND,
+        help=f'STT 백엔드 (기본값: {DEFAULT_BACKEND})'
+    )
+    
+    parser.add_argument(
+        '--vad',
+        action='store_true',
+        help='음성 구간만 변환 (무음/음악/게임 소리 구간 건너뜀)'
+    )
+    
     parser.add_argument(
         '--output-dir',
         default=OUTPUT_DIR,
         help=f'출력 디렉토리 (기본값: {OUTPUT_DIR})'
     )
     
+    parser.add_argument(
+        '--archive',
+        default=DEFAULT_ARCHIVE_PATH,
+        help=f'자막 아카이브 (이미 만들어져 있을 때만 추가, 기본값: {DEFAULT_ARCHIVE_PATH})'
+    )
+    
+    parser.add_argument(
+        '--compress',
+        action='store_true',
+        help='자막을 zstd 사전 압축(.zst)으로 저장 (기본값: 환경변수 STORAGE_COMPRESSION)'
+    )
+    
     args = parser.parse_args()
+    if args.compress:
+        set_compression(True)
     
     print("\n⚠️  주의사항:")
     print("  - 처음 실행 시 모델 다운로드로 시간이 걸립니다")
@@ -224,7 +457,8 @@ ffmpeg 필요:
     print("  - 20분 비디오 = CPU 30분~1시간, GPU 5~10분")
     print()
     
-    success = test_whisper_single_video(args.video_id, args.model, args.output_dir)
+    success = test_whisper_single_video(args.video_id, args.model, args.output_dir, args.archive,
+                                        backend=args.backend, use_vad=args.vad)
     sys.exit(0 if success else 1)
 
 
@@ -2,6 +2,7 @@
 """
 한글 감정 분석 테스트
 댓글의 긍정/부정 판단 테스트
+(--all: 댓글 디렉토리 전체를 분석해 비디오별 결과 저장, 바뀐 비디오만 다시 계산)
 """
 
 import json
@@ -10,6 +11,16 @@ from typing import List, Dict
 from transformers import pipeline
 from collections import Counter
 
+from artifact_manifest import record_artifact
+from comment_corpus import load_corpus
+from compressed_storage import read_json
+from data_paths import artifact_dir, file_path, find_files
+from stage_cache import code_fingerprint, run_stage
+
+SENTIMENT_MODEL = "beomi/kcbert-base"
+COMMENTS_DIR = artifact_dir("comments")
+SENTIMENT_DIR = artifact_dir("sentiment")
+
 
 def test_sentiment_models():
     """여러 한글 감정 분석 모델 테스트"""
@@ -87,8 +98,7 @@ def analyze_comment_file(filepath: str):
     
     # JSON 파일 로드
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = read_json(filepath)
     except FileNotFoundError:
         print(f"❌ 파일을 찾을 수 없습니다: {filepath}")
         return
@@ -105,12 +115,12 @@ def analyze_comment_file(filepath: str):
     try:
         analyzer = pipeline(
             "sentiment-analysis",
-            model="beomi/kcbert-base",
+            model=SENTIMENT_MODEL,
             device=-1
         )
         
         # 댓글 텍스트만 추출
-        texts = [c['text'] for c in comments]
+        texts = [comment_text(c) for c in comments]
         
         # 감정 분석
         results = analyzer(texts)
@@ -127,7 +137,7 @@ def analyze_comment_file(filepath: str):
             else:
                 negative += 1
             
-            print(f"{emoji} {result['label']:8s} ({result['score']:.1%}) | {comment['text'][:60]}...")
+            print(f"{emoji} {result['label']:8s} ({result['score']:.1%}) | {comment_text(comment)[:60]}...")
         
         # 최종 통계
         total = len(comments)
@@ -147,6 +157,65 @@ def analyze_comment_file(filepath: str):
         traceback.print_exc()
 
 
+def comment_text(comment) -> str:
+    """댓글 텍스트 (수집기는 문자열, 백필은 dict로 저장)"""
+    return comment['text'] if isinstance(comment, dict) else comment
+
+
+def summarize_sentiment(results: List[Dict]) -> Dict:
+    """
+    감정 분석 결과 요약
+    
+    Args:
+        results: pipeline 출력 ({'label', 'score'} 리스트)
+    
+    Returns:
+        긍정/부정 개수와 Sentiment Score (0-100, 댓글 없으면 None)
+    """
+    labels = Counter(result['label'] for result in results)
+    total = len(results)
+    return {
+        'total': total,
+        'positive': labels.get('POSITIVE', 0),
+        'negative': total - labels.get('POSITIVE', 0),
+        'sentiment_score': round(labels.get('POSITIVE', 0) / total * 100, 2) if total else None
+    }
+
+
+def analyze_comments_directory(directory: str = COMMENTS_DIR, output_dir: str = SENTIMENT_DIR,
+                               force: bool = False) -> Dict:
+    """
+    댓글 디렉토리 전체 감정 분석 (바뀐 것만 다시 계산)
+    
+    댓글 내용, 요약 코드, 모델 중 하나라도 바뀐 비디오만 분석하고
+    결과는 {output_dir}/{video_id}_sentiment.json 에 저장
+    (댓글 텍스트는 파일별 JSON 대신 댓글 코퍼스에서 읽음)
+    
+    Returns:
+        {'computed': n, 'reused': n, 'failed': n}
+    """
+    version = code_fingerprint(summarize_sentiment, config={'model': SENTIMENT_MODEL})
+    analyzer = corpus = None
+    
+    def compute(video_id: str, path: str) -> str:
+        nonlocal analyzer, corpus
+        # 다시 계산할 비디오가 있을 때만 모델과 코퍼스 로드 (코퍼스는 바뀐 파일만 갱신)
+        if analyzer is None:
+            analyzer = pipeline("sentiment-analysis", model=SENTIMENT_MODEL, device=-1)
+            corpus = load_corpus(directory)
+        texts = corpus.video_texts(video_id)
+        result = {'video_id': video_id, 'model': SENTIMENT_MODEL,
+                  **summarize_sentiment(analyzer(texts, truncation=True) if texts else [])}
+        output_file = file_path(output_dir, video_id, "_sentiment.json", create=True)
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        record_artifact('sentiment', output_file, tool=f"test_sentiment_ko:{SENTIMENT_MODEL}", video_id=video_id)
+        return output_file
+    
+    inputs = {video_id: str(path) for video_id, path in find_files(directory, "_comments.json").items()}
+    return run_stage('sentiment', version, inputs, compute, force=force)
+
+
 def quick_test():
     """빠른 테스트 (설치 확인)"""
     
@@ -177,6 +246,13 @@ def quick_test():
 if __name__ == "__main__":
     import sys
     
+    # 전체 댓글 분석 (바뀐 비디오만)
+    if len(sys.argv) > 1 and sys.argv[1] == '--all':
+        args = [arg for arg in sys.argv[2:] if arg != '--force']
+        counts = analyze_comments_directory(args[0] if args else COMMENTS_DIR, force='--force' in sys.argv)
+        print(f"✅ 새로 분석: {counts['computed']}개, 재사용: {counts['reused']}개, 실패: {counts['failed']}개")
+        sys.exit(1 if counts['failed'] else 0)
+    
     # 빠른 테스트 먼저
     if not quick_test():
         print("\n⚠️  먼저 필요한 패키지를 설치해주세요:")
@@ -191,4 +267,6 @@ if __name__ == "__main__":
         analyze_comment_file(sys.argv[1])
     else:
         print("\n💡 실제 댓글 파일 분석하려면:")
-        print("   python test_sentiment_korean.py data/chimchakman_official_comments/ZSrodkQDhWE_comments.json")
\ No newline at end of file
+        print("   python test_sentiment_korean.py data/chimchakman_official_comments/ZSrodkQDhWE_comments.json")
+        print("\n💡 전체 댓글 분석 (바뀐 비디오만 다시 계산):")
+        print("   python test_sentiment_korean.py --all [--force]")
\ No newline at end of file
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Packed Transcript Archive
+All Whisper transcripts in one data file plus an offset index, read through mmap.
+"""
+
+import os
+import sys
+import json
+import mmap
+import fcntl
+import argparse
+import logging
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+from compressed_storage import read_text
+from data_paths import artifact_dir, find_files
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ARCHIVE_PATH = 'data/transcripts.pack'
+TRANSCRIPTS_DIR = artifact_dir('transcript')
+TRANSCRIPT_SUFFIX = '_whisper_transcript.txt'
+
+SEPARATOR = '-' * 80
+
+# Header lines written by stt_whisper.py, mapped to index fields
+HEADER_FIELDS = {'Video ID': 'video_id', 'Title': 'title', 'Model': 'model', 'Duration': 'duration'}
+
+
+def parse_transcript(text: str) -> Tuple[Dict[str, str], str]:
+    """Split a transcript file into header fields and body.
+
+    Args:
+        text: Full file contents ("Video ID: ...", "Title: ...", dashes, body)
+
+    Returns:
+        (header fields, body) - the header is empty for files without one
+    """
+    header = {}
+    lines = text.split('\n')
+    for i, line in enumerate(lines[:10]):
+        stripped = line.strip()
+        if stripped and stripped == '-' * len(stripped):
+            body = '\n'.join(lines[i + 1:])
+            return header, body[1:] if body.startswith('\n') else body
+        name, sep, value = line.partition(': ')
+        if sep and name in HEADER_FIELDS:
+            header[HEADER_FIELDS[name]] = value
+    return {}, text
+
+
+def format_transcript(header: Dict[str, str], body: str) -> str:
+    """Rebuild the on-disk transcript format written by stt_whisper.py."""
+    lines = [f"{name}: {header[field]}" for name, field in HEADER_FIELDS.items() if field in header]
+    return '\n'.join(lines + [SEPARATOR, '', '']) + body if lines else body
+
+
+class TranscriptArchive:
+    """Transcript bodies packed back to back in one file.
+
+    The index (a JSON sidecar) maps video_id to the byte offset and length of
+    the UTF-8 body plus the header fields, so readers never parse headers.
+    Appends go to the end of the data file under an exclusive file lock,
+    which lets parallel Whisper workers add transcripts safely; a replaced
+    transcript leaves dead bytes behind until compact() runs.
+    """
+
+    def __init__(self, path: str = DEFAULT_ARCHIVE_PATH):
+        """Open an archive (it is created on the first append).
+
+        Args:
+            path: Data file; the index lives next to it as <path>.idx.json
+        """
+        self.path = path
+        self.index_path = f"{path}.idx.json"
+        self.lock_path = f"{path}.lock"
+        self.index: Dict[str, Dict] = {}
+        self._file = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._mapped_size = 0
+        self._mapped_inode = None
+        self._load_index()
+
+    def _load_index(self):
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+        else:
+            self.index = {}
+
+    def _save_index(self):
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+
+    @contextmanager
+    def _locked(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.lock_path, 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def _stat(self) -> Tuple[int, Optional[int]]:
+        """Size and inode of the data file (0, None if it does not exist)."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return 0, None
+        return stat.st_size, stat.st_ino
+
+    def _mapped(self) -> mmap.mmap:
+        """Map the data file, remapping when it changed since the last read.
+
+        Appends grow the same file and keep every offset valid. compact() in
+        any process replaces it with a new inode whose offsets all moved, so
+        the index is reloaded together with it (under the lock, because
+        compact() swaps the data file before it writes the new index).
+        Callers must look up index entries after calling this.
+        """
+        size, inode = self._stat()
+        if self._mmap is not None and size == self._mapped_size and inode == self._mapped_inode:
+            return self._mmap
+        if inode != self._mapped_inode:
+            with self._locked():
+                self._load_index()
+                size, inode = self._stat()
+        if size == 0:
+            raise KeyError("빈 자막 아카이브입니다.")
+        # The previous map is not closed here: views handed out earlier may
+        # still point into it, and it is freed once they are released.
+        # The file object is not needed once the map exists.
+        if self._file is not None:
+            self._file.close()
+        self._file = open(self.path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mapped_size = size
+        self._mapped_inode = inode
+        return self._mmap
+
+    def close(self):
+        """Release the memory map."""
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Views are still exported; the map is freed with the last one
+                pass
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._mapped_size = 0
+        self._mapped_inode = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __contains__(self, video_id: str) -> bool:
+        return video_id in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def header(self, video_id: str) -> Dict[str, str]:
+        """Header fields (video_id, title, model, ...) without touching the data file."""
+        entry = self.index[video_id]
+        return {name: value for name, value in entry.items() if name not in ('offset', 'length')}
+
+    def view(self, video_id: str) -> memoryview:
+        """Zero-copy UTF-8 bytes of one transcript body.
+
+        The view stays valid until close(); call bytes(view) to keep a copy.
+        """
+        mapped = self._mapped()
+        entry = self.index[video_id]
+        return memoryview(mapped)[entry['offset']:entry['offset'] + entry['length']]
+
+    def text(self, video_id: str) -> str:
+        """Decoded transcript body (no header)."""
+        return str(self.view(video_id), 'utf-8')
+
+    def full_text(self, video_id: str) -> str:
+        """Transcript in the original file format (header + body)."""
+        # text() first: it reloads the index if the data file was compacted
+        body = self.text(video_id)
+        return format_transcript(self.header(video_id), body)
+
+    def iter_views(self) -> Iterator[Tuple[str, memoryview]]:
+        """Yield (video_id, body bytes) for every transcript in file order."""
+        if not self.index:
+            return
+        mapped = memoryview(self._mapped())
+        for video_id, entry in sorted(self.index.items(), key=lambda item: item[1]['offset']):
+            yield video_id, mapped[entry['offset']:entry['offset'] + entry['length']]
+
+    def iter_texts(self) -> Iterator[Tuple[str, str]]:
+        """Yield (video_id, decoded body) for every transcript in file order."""
+        for video_id, view in self.iter_views():
+            yield video_id, str(view, 'utf-8')
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def append(self, video_id: str, body: str, **header) -> Dict:
+        """Append (or replace) one transcript.
+
+        Args:
+            video_id: YouTube video ID
+            body: Transcript text without header
+            **header: Header fields such as title and model
+
+        Returns:
+            Index entry of the stored transcript
+        """
+        return self.append_many([(video_id, body, header)])[video_id]
+
+    def append_many(self, transcripts) -> Dict[str, Dict]:
+        """Append several transcripts under one lock and one index write.
+
+        Args:
+            transcripts: Iterable of (video_id, body, header dict)
+
+        Returns:
+            Index entries of the stored transcripts
+        """
+        added = {}
+        with self._locked():
+            # Another process may have appended since this index was loaded
+            self._load_index()
+            with open(self.path, 'ab') as f:
+                offset = f.tell()
+                for video_id, body, header in transcripts:
+                    data = body.encode('utf-8')
+                    f.write(data)
+                    entry = {**{k: v for k, v in header.items() if v is not None},
+                             'video_id': video_id, 'offset': offset, 'length': len(data)}
+                    self.index[video_id] = added[video_id] = entry
+                    offset += len(data)
+                f.flush()
+                os.fsync(f.fileno())
+            self._save_index()
+        return added
+
+    def import_directory(self, directory: str = TRANSCRIPTS_DIR, replace: bool = False) -> int:
+        """Pack every *_whisper_transcript.txt file of a directory.
+
+        Args:
+            directory: Transcript directory
+            replace: Re-import videos that are already in the archive
+
+        Returns:
+            Number of transcripts imported
+        """
+        batch, imported = [], 0
+        for video_id, path in find_files(directory, TRANSCRIPT_SUFFIX).items():
+            if video_id in self.index and not replace:
+                continue
+            header, body = parse_transcript(read_text(path))
+            header.pop('video_id', None)
+            batch.append((video_id, body, header))
+            if len(batch) >= 500:
+                imported += len(self.append_many(batch))
+                batch = []
+        if batch:
+            imported += len(self.append_many(batch))
+        return imported
+
+    def compact(self):
+        """Rewrite the data file without bytes of replaced transcripts."""
+        with self._locked():
+            self._load_index()
+            live = sum(entry['length'] for entry in self.index.values())
+            size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+            if live == size:
+                return
+
+            tmp_path = f"{self.path}.compact.tmp"
+            with open(self.path, 'rb') as src, open(tmp_path, 'wb') as dst:
+                offset = 0
+                for entry in sorted(self.index.values(), key=lambda e: e['offset']):
+                    src.seek(entry['offset'])
+                    dst.write(src.read(entry['length']))
+                    entry['offset'] = offset
+                    offset += entry['length']
+                dst.flush()
+                os.fsync(dst.fileno())
+            self.close()
+            os.replace(tmp_path, self.path)
+            self._save_index()
+            logger.info(f"✓ 자막 아카이브 압축: {size:,} → {live:,} bytes")
+
+
+def main():
+    """Command-line entry point."""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='Whisper 자막 아카이브 (단일 데이터 파일 + 오프셋 인덱스)')
+    parser.add_argument('--archive', default=DEFAULT_ARCHIVE_PATH,
+                        help=f'아카이브 데이터 파일 (기본값: {DEFAULT_ARCHIVE_PATH})')
+    parser.add_argument('--import-dir', nargs='?', const=TRANSCRIPTS_DIR, default=None,
+                        help=f'자막 디렉토리를 아카이브에 추가 (기본값: {TRANSCRIPTS_DIR})')
+    parser.add_argument('--replace', action='store_true', help='이미 있는 비디오도 다시 가져오기')
+    parser.add_argument('--compact', action='store_true', help='교체된 자막의 빈 공간 제거')
+    parser.add_argument('--show', metavar='VIDEO_ID', help='자막 하나를 원본 형식으로 출력')
+    args = parser.parse_args()
+
+    with TranscriptArchive(args.archive) as archive:
+        if args.import_dir:
+            imported = archive.import_directory(args.import_dir, replace=args.replace)
+            logger.info(f"✓ 자막 {imported}개 추가: {args.archive}")
+        if args.compact:
+            archive.compact()
+        if args.show:
+            if args.show not in archive:
+                logger.error(f"❌ 아카이브에 없는 비디오입니다: {args.show}")
+                sys.exit(1)
+            print(archive.full_text(args.show))
+            return
+
+        size = os.path.getsize(archive.path) if os.path.exists(archive.path) else 0
+        logger.info(f"자막 {len(archive):,}개, {size / 1024 / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Voice Activity Detection
+CPU pre-pass that finds speech regions, so the STT stage decodes only those spans and maps timestamps back to the original audio.
+"""
+
+import sys
+import json
+import argparse
+import logging
+import subprocess
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Whisper models (both backends) take 16 kHz mono float32
+SAMPLE_RATE = 16000
+
+# 20 ms analysis frames
+FRAME_SIZE = 320
+FRAMES_PER_SECOND = SAMPLE_RATE // FRAME_SIZE
+
+# Telephone speech band; most speech energy, little of the game/music bass
+SPEECH_BAND_HZ = (300, 3400)
+
+# A frame is active when its speech-band level is this far above the noise floor
+# (the 10th percentile of the file) and above an absolute floor
+ENERGY_MARGIN_DB = 12.0
+ABSOLUTE_FLOOR_DB = -55.0
+
+# Speech alternates syllables and short gaps; over one second its level varies
+# far more than sustained music or game audio
+MODULATION_WINDOW_SECONDS = 1.0
+MIN_MODULATION_DB = 6.0
+
+# Region shaping: pauses shorter than min_silence stay inside a region,
+# regions shorter than min_speech are dropped, padding keeps word edges
+MIN_SPEECH_SECONDS = 0.3
+MIN_SILENCE_SECONDS = 1.0
+PADDING_SECONDS = 0.3
+
+# Frames per FFT batch (about 20 minutes of audio, bounded memory for long videos)
+_FFT_BATCH = 60000
+
+
+def load_audio(path: str) -> np.ndarray:
+    """Decode any audio file to 16 kHz mono float32 with ffmpeg (as whisper.load_audio does).
+
+    Raises:
+        RuntimeError: ffmpeg failed or is not installed
+    """
+    command = ['ffmpeg', '-nostdin', '-threads', '0', '-i', str(path),
+               '-f', 's16le', '-ac', '1', '-acodec', 'pcm_s16le', '-ar', str(SAMPLE_RATE), '-']
+    try:
+        output = subprocess.run(command, capture_output=True, check=True).stdout
+    except FileNotFoundError as e:
+        raise RuntimeError("ffmpeg가 설치되지 않았습니다.") from e
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"오디오 디코딩 실패: {e.stderr.decode(errors='replace')[-300:]}") from e
+    return np.frombuffer(output, np.int16).astype(np.float32) / 32768.0
+
+
+def band_levels(audio: np.ndarray) -> np.ndarray:
+    """Speech-band level of every 20 ms frame, in dB relative to full scale."""
+    frames = len(audio) // FRAME_SIZE
+    window = np.hanning(FRAME_SIZE).astype(np.float32)
+    frequencies = np.fft.rfftfreq(FRAME_SIZE, 1 / SAMPLE_RATE)
+    band = (frequencies >= SPEECH_BAND_HZ[0]) & (frequencies <= SPEECH_BAND_HZ[1])
+    # Power of a full-scale sine inside the band, so levels read as dBFS
+    scale = (window.sum() / 2) ** 2
+
+    levels = np.empty(frames, dtype=np.float32)
+    for start in range(0, frames, _FFT_BATCH):
+        stop = min(frames, start + _FFT_BATCH)
+        chunk = audio[start * FRAME_SIZE:stop * FRAME_SIZE].reshape(-1, FRAME_SIZE) * window
+        power = np.abs(np.fft.rfft(chunk, axis=1)[:, band]) ** 2
+        levels[start:stop] = 10 * np.log10(power.sum(axis=1) / scale + 1e-10)
+    return levels
+
+
+def modulation(levels: np.ndarray, window_frames: int) -> np.ndarray:
+    """Standard deviation of the level over a centered window, per frame (cumulative sums, O(n))."""
+    if len(levels) == 0:
+        return levels
+    half = window_frames // 2
+    padded = np.pad(levels.astype(np.float64), (half, window_frames - half), mode='edge')
+    total = np.concatenate(([0.0], np.cumsum(padded)))
+    squares = np.concatenate(([0.0], np.cumsum(padded ** 2)))
+    sums = total[window_frames:window_frames + len(levels)] - total[:len(levels)]
+    sums_sq = squares[window_frames:window_frames + len(levels)] - squares[:len(levels)]
+    variance = sums_sq / window_frames - (sums / window_frames) ** 2
+    return np.sqrt(np.maximum(variance, 0)).astype(np.float32)
+
+
+def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Start and end (exclusive) frame of every run of True."""
+    edges = np.flatnonzero(np.diff(np.concatenate(([False], mask, [False])).view(np.int8)))
+    return edges[::2], edges[1::2]
+
+
+def speech_regions(audio: np.ndarray, energy_margin_db: float = ENERGY_MARGIN_DB,
+                   min_modulation_db: float = MIN_MODULATION_DB, min_speech: float = MIN_SPEECH_SECONDS,
+                   min_silence: float = MIN_SILENCE_SECONDS, padding: float = PADDING_SECONDS
+                   ) -> List[Tuple[float, float]]:
+    """Speech regions of 16 kHz mono audio.
+
+    Args:
+        audio: 16 kHz mono float32 samples
+        energy_margin_db: Level above the file's noise floor for a frame to count
+        min_modulation_db: Level variation over one second that speech must show
+            (0 disables the music/game-audio check)
+        min_speech: Shortest region kept, in seconds
+        min_silence: Shortest pause that splits regions, in seconds
+        padding: Seconds added around each region
+
+    Returns:
+        Sorted, non-overlapping (start, end) pairs in seconds
+    """
+    levels = band_levels(audio)
+    if len(levels) == 0:
+        return []
+    floor = np.percentile(levels, 10)
+    active = (levels > floor + energy_margin_db) & (levels > ABSOLUTE_FLOOR_DB)
+    if min_modulation_db > 0:
+        window = int(MODULATION_WINDOW_SECONDS * FRAMES_PER_SECOND)
+        active &= modulation(levels, window) >= min_modulation_db
+
+    starts, ends = _runs(active)
+    if len(starts) == 0:
+        return []
+    # Close pauses shorter than min_silence
+    keep = np.concatenate(([True], starts[1:] - ends[:-1] >= min_silence * FRAMES_PER_SECOND))
+    starts, ends = starts[keep], np.concatenate((ends[:-1][keep[1:]], ends[-1:]))
+    # Drop blips, then pad and merge what the padding made touch
+    long_enough = ends - starts >= min_speech * FRAMES_PER_SECOND
+    duration = len(audio) / SAMPLE_RATE
+    regions = []
+    for start, end in zip(starts[long_enough] / FRAMES_PER_SECOND, ends[long_enough] / FRAMES_PER_SECOND):
+        start, end = max(0.0, start - padding), min(duration, end + padding)
+        if regions and start <= regions[-1][1]:
+            regions[-1] = (regions[-1][0], end)
+        else:
+            regions.append((float(start), float(end)))
+    return regions
+
+
+def trim(audio: np.ndarray, regions: List[Tuple[float, float]]) -> np.ndarray:
+    """Audio of the regions, concatenated in order."""
+    if not regions:
+        return audio[:0]
+    return np.concatenate([audio[int(start * SAMPLE_RATE):int(end * SAMPLE_RATE)] for start, end in regions])
+
+
+def to_original(times, regions: List[Tuple[float, float]]) -> np.ndarray:
+    """Map times on the trimmed timeline back to the original audio.
+
+    A time exactly at a cut belongs to the region that starts there.
+    """
+    times = np.asarray(times, dtype=np.float64)
+    if not regions:
+        return times
+    bounds = np.array(regions, dtype=np.float64)
+    # Start of each region on the trimmed timeline
+    trimmed_starts = np.concatenate(([0.0], np.cumsum(bounds[:, 1] - bounds[:, 0])[:-1]))
+    index = np.clip(np.searchsorted(trimmed_starts, times, side='right') - 1, 0, len(bounds) - 1)
+    return bounds[index, 0] + (times - trimmed_starts[index])
+
+
+def remap_segments(segments: List[Dict], regions: List[Tuple[float, float]]) -> List[Dict]:
+    """Segments with 'start'/'end' moved from the trimmed to the original timeline."""
+    if not segments:
+        return []
+    starts = to_original([segment['start'] for segment in segments], regions)
+    # An end exactly at a cut belongs to the region before it
+    ends = to_original([max(segment['start'], segment['end'] - 1e-6) for segment in segments], regions)
+    return [{**segment, 'start': round(float(start), 3), 'end': round(float(end) + 1e-6, 3)}
+            for segment, start, end in zip(segments, starts, ends)]
+
+
+def summarize(audio: np.ndarray, regions: List[Tuple[float, float]]) -> Dict:
+    """Audio, speech and skipped seconds and the skipped fraction."""
+    duration = len(audio) / SAMPLE_RATE
+    speech = sum(end - start for start, end in regions)
+    return {
+        'audio_seconds': round(duration, 2),
+        'speech_seconds': round(speech, 2),
+        'skipped_seconds': round(duration - speech, 2),
+        'skipped_fraction': round(1 - speech / duration, 4) if duration else 0.0,
+        'regions': len(regions),
+    }
+
+
+def main():
+    """Command-line entry point: show the speech regions of audio files."""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(
+        description='오디오에서 음성 구간 찾기 (STT 전에 무음/음악/게임 소리 구간 제외)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python vad.py data/tmp/abc123.mp3                 # 음성 구간과 건너뛸 비율
+  python vad.py data/tmp/*.mp3 --json               # 파일별 요약을 JSON으로
+  python vad.py data/tmp/abc123.mp3 --min-modulation 0   # 에너지 기준만 사용 (음악 판별 끔)
+        """
+    )
+    parser.add_argument('audio', nargs='+', help='오디오 파일')
+    parser.add_argument('--margin', type=float, default=ENERGY_MARGIN_DB,
+                        help=f'노이즈 바닥 대비 음성 레벨 dB (기본값: {ENERGY_MARGIN_DB})')
+    parser.add_argument('--min-modulation', type=float, default=MIN_MODULATION_DB,
+                        help=f'1초 동안 음성 레벨 변화 최소 dB, 0이면 끔 (기본값: {MIN_MODULATION_DB})')
+    parser.add_argument('--min-silence', type=float, default=MIN_SILENCE_SECONDS,
+                        help=f'구간을 나누는 최소 무음 초 (기본값: {MIN_SILENCE_SECONDS})')
+    parser.add_argument('--json', action='store_true', help='파일별 요약과 구간을 JSON으로 출력')
+    args = parser.parse_args()
+
+    reports = []
+    for path in args.audio:
+        try:
+            audio = load_audio(path)
+        except RuntimeError as e:
+            logger.error(f"❌ {path}: {e}")
+            continue
+        regions = speech_regions(audio, args.margin, args.min_modulation, min_silence=args.min_silence)
+        summary = summarize(audio, regions)
+        reports.append({'file': path, **summary, 'speech': [[round(s, 2), round(e, 2)] for s, e in regions]})
+        if not args.json:
+            logger.info(f"{path}: 음성 {summary['speech_seconds']:.0f}초 / {summary['audio_seconds']:.0f}초, "
+                        f"{summary['regions']}개 구간, {summary['skipped_fraction']:.0%} 건너뜀")
+
+    if args.json:
+        sys.stdout.write(json.dumps(reports, ensure_ascii=False, indent=2) + '\n')
+    if len(reports) < len(args.audio):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -15,11 +15,23 @@ from typing import List, Dict, Optional
 import logging
 
 from dotenv import load_dotenv
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from youtube_transcript_api import YouTubeTranscriptApi
 from youtube_transcript_api._errors import TranscriptsDisabled, NoTranscriptFound
 
+from artifact_manifest import DEFAULT_MANIFEST_PATH, ArtifactManifest
+from comment_store import DEFAULT_DB_PATH, CommentStore
+from comment_schema import comments_document, from_thread, upgrade
+from compressed_storage import set_compression, write_json, write_text
+from crawl_checkpoint import CrawlCheckpoint
+from data_paths import artifact_dir, channel_path, file_path, make_artifact_dir
+from stats_timeseries import StatsTimeSeries
+from rate_limiter import TokenBucket
+from quota_ledger import (
+    DEFAULT_LEDGER_PATH, QuotaExhaustedError, QuotaLedger, QuotaScheduler, load_api_keys
+)
+from response_cache import DEFAULT_CACHE_DIR, CacheMissError, ResponseCache
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -33,21 +45,47 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# videos.list accepts at most 50 comma-separated IDs per request
+MAX_IDS_PER_REQUEST = 50
+
+# Stage-level progress is flushed every N videos (and always on interruption)
+STAGE_CHECKPOINT_INTERVAL = 50
+
 
 class YouTubeDataCollector:
     """YouTube channel data collector."""
     
-    def __init__(self, api_key: str, max_workers: int = 5):
+    def __init__(self, api_key: str, max_workers: int = 5, scheduler: Optional[QuotaScheduler] = None,
+                 comment_workers: int = 1, reply_mode: str = 'all', max_replies: Optional[int] = None,
+                 comment_store: Optional[CommentStore] = None, manifest: Optional[ArtifactManifest] = None):
         """Initialize YouTube API client.
         
         Args:
-            api_key: YouTube Data API v3 key
+            api_key: YouTube Data API v3 key (comma-separated for a key pool)
             max_workers: Number of parallel workers for transcript fetching
+            scheduler: Quota scheduler shared by every API call
+                (default: pool built from api_key and YOUTUBE_API_KEYS)
+            comment_workers: Number of worker threads for comment collection
+            reply_mode: 'all' (inline replies, paged when truncated), 'inline'
+                (inline replies only, no extra calls) or 'none'
+            max_replies: Maximum replies kept per comment thread (None: no cap)
+            comment_store: SQLite comment store that mirrors the comment JSON files
+            manifest: Artifact manifest updated for every comment/stats file written
         """
-        self.youtube = build('youtube', 'v3', developerKey=api_key)
+        self.scheduler = scheduler or QuotaScheduler(load_api_keys(api_key))
         self.max_workers = max_workers
+        self.comment_workers = comment_workers
+        self.reply_mode = reply_mode
+        self.max_replies = max_replies
+        self.comment_store = comment_store
+        self.manifest = manifest
         self.request_delay = 0.5  # Delay between requests to avoid rate limiting
     
+    def _throttle(self):
+        """Pause between paged API calls unless a shared token bucket already paces them."""
+        if self.scheduler.rate_limiter is None:
+            time.sleep(self.request_delay)
+    
     def get_channel_info(self, channel_id: str) -> Dict[str, str]:
         """Get channel information including custom URL/handle.
         
@@ -58,33 +96,13 @@ class YouTubeDataCollector:
             Dictionary with channel_id and channel_slug
         """
         try:
-            response = self.youtube.channels().list(
+            response = self.scheduler.execute('channels.list', lambda yt: yt.channels().list(
                 part='snippet',
                 id=channel_id
-            ).execute()
+            ))
             
             if response.get('items'):
-                snippet = response['items'][0]['snippet']
-                custom_url = snippet.get('customUrl', '').replace('@', '').replace('/', '')
-                
-                # Use custom URL as slug, fallback to channel title, then channel ID
-                if custom_url:
-                    channel_slug = custom_url
-                else:
-                    # Sanitize channel title for use as filename
-                    channel_slug = snippet['title'].replace(' ', '_').replace('/', '_')
-                    # Remove special characters
-                    import re
-                    channel_slug = re.sub(r'[^\w\-_]', '', channel_slug)
-                
-                logger.info(f"채널 정보: {snippet['title']}")
-                logger.info(f"채널 슬러그: {channel_slug}")
-                
-                return {
-                    'channel_id': channel_id,
-                    'channel_slug': channel_slug,
-                    'channel_title': snippet['title']
-                }
+                return self._build_channel_info(channel_id, response['items'][0]['snippet'])
         except HttpError as e:
             logger.error(f"채널 정보 가져오기 실패: {e}")
         
@@ -95,6 +113,37 @@ class YouTubeDataCollector:
             'channel_title': channel_id
         }
     
+    def _build_channel_info(self, channel_id: str, snippet: Dict) -> Dict[str, str]:
+        """Derive the channel slug from a channels.list snippet.
+        
+        Args:
+            channel_id: YouTube channel ID
+            snippet: 'snippet' part of a channels.list item
+            
+        Returns:
+            Dictionary with channel_id, channel_slug and channel_title
+        """
+        custom_url = snippet.get('customUrl', '').replace('@', '').replace('/', '')
+        
+        # Use custom URL as slug, fallback to channel title, then channel ID
+        if custom_url:
+            channel_slug = custom_url
+        else:
+            # Sanitize channel title for use as filename
+            channel_slug = snippet['title'].replace(' ', '_').replace('/', '_')
+            # Remove special characters
+            import re
+            channel_slug = re.sub(r'[^\w\-_]', '', channel_slug)
+        
+        logger.info(f"채널 정보: {snippet['title']}")
+        logger.info(f"채널 슬러그: {channel_slug}")
+        
+        return {
+            'channel_id': channel_id,
+            'channel_slug': channel_slug,
+            'channel_title': snippet['title']
+        }
+    
     def get_channel_id(self, channel_input: str) -> Optional[str]:
         """Get channel ID from URL or validate existing ID.
         
@@ -119,13 +168,12 @@ class YouTubeDataCollector:
                 # Need to resolve custom URL to channel ID
                 username = channel_input.split('/')[-1].split('?')[0].replace('@', '')
                 try:
-                    request = self.youtube.search().list(
+                    response = self.scheduler.execute('search.list', lambda yt: yt.search().list(
                         part='snippet',
                         q=username,
                         type='channel',
                         maxResults=1
-                    )
-                    response = request.execute()
+                    ))
                     if response.get('items'):
                         return response['items'][0]['snippet']['channelId']
                 except HttpError as e:
@@ -133,12 +181,16 @@ class YouTubeDataCollector:
         
         return channel_input
     
-    def fetch_channel_videos(self, channel_id: str, channel_slug: str, min_duration_seconds: int = 60) -> List[Dict]:
+    def fetch_channel_videos(self, channel_id: str, channel_slug: str, min_duration_seconds: int = 60,
+                             include_stats: bool = False) -> List[Dict]:
         """Fetch all long-form videos from a channel (excludes Shorts).
         
         Args:
             channel_id: YouTube channel ID
+            channel_slug: Channel slug/handle for directory name
             min_duration_seconds: Minimum video duration in seconds (default: 60, filters out Shorts which are < 60s)
+            include_stats: Also request 'statistics' in the per-page videos.list call
+                and save *_stats.json files in the same pass
             
         Returns:
             List of video metadata dictionaries
@@ -146,62 +198,66 @@ class YouTubeDataCollector:
         logger.info(f"채널 {channel_id}의 롱폼 비디오 목록 가져오는 중...")
         logger.info(f"필터: {min_duration_seconds}초 이상의 비디오만 수집")
         videos = []
+        collected_stats = []
+        
+        video_parts = 'contentDetails,snippet'
+        if include_stats:
+            video_parts += ',statistics'
+            stats_dir = artifact_dir('stats', channel_slug)
+            make_artifact_dir(stats_dir)
+            logger.info("비디오 목록과 참여도 통계를 함께 수집합니다.")
         
         try:
             # Get the uploads playlist ID
-            channel_response = self.youtube.channels().list(
-                part='contentDetails',
-                id=channel_id
-            ).execute()
-            
-            if not channel_response.get('items'):
-                logger.error(f"채널을 찾을 수 없습니다: {channel_id}")
+            uploads_playlist_id = self._get_uploads_playlist_id(channel_id)
+            if not uploads_playlist_id:
                 return videos
             
-            uploads_playlist_id = channel_response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
-            logger.info(f"업로드 플레이리스트 ID: {uploads_playlist_id}")
+            # Resume from the last page that was paid for, if any
+            checkpoint = CrawlCheckpoint(f"catalog_{channel_id}")
+            if checkpoint.exists and checkpoint.matches(min_duration_seconds=min_duration_seconds):
+                videos = checkpoint.items
+                logger.info(f"↻ 체크포인트에서 재개: 비디오 {len(videos)}개 수집된 상태")
+            else:
+                checkpoint.clear()
             
             # Fetch all videos from the uploads playlist
-            next_page_token = None
-            video_count = 0
-            shorts_filtered = 0
+            next_page_token = checkpoint.page_token
+            video_count = len(videos)
+            shorts_filtered = checkpoint.state.get('shorts_filtered', 0)
             
             while True:
-                playlist_response = self.youtube.playlistItems().list(
+                playlist_response = self.scheduler.execute('playlistItems.list', lambda yt: yt.playlistItems().list(
                     part='snippet,contentDetails',
                     playlistId=uploads_playlist_id,
                     maxResults=50,
                     pageToken=next_page_token
-                ).execute()
+                ))
                 
                 # Collect video IDs to fetch durations
                 video_ids = [item['contentDetails']['videoId'] for item in playlist_response.get('items', [])]
                 
                 # Fetch video details including duration
                 if video_ids:
-                    videos_response = self.youtube.videos().list(
-                        part='contentDetails,snippet',
+                    videos_response, fetched_at = self.scheduler.execute_dated('videos.list', lambda yt: yt.videos().list(
+                        part=video_parts,
                         id=','.join(video_ids)
-                    ).execute()
+                    ))
                     
                     for video_item in videos_response.get('items', []):
-                        # Parse ISO 8601 duration (e.g., PT1M30S = 1 min 30 sec)
-                        duration_str = video_item['contentDetails']['duration']
-                        duration_seconds = self._parse_duration(duration_str)
+                        video_data = self._build_video_data(video_item)
+                        duration_seconds = video_data['duration_seconds']
                         
                         # Filter out Shorts (videos under min_duration_seconds)
                         if duration_seconds >= min_duration_seconds:
-                            video_data = {
-                                'video_id': video_item['id'],
-                                'title': video_item['snippet']['title'],
-                                'description': video_item['snippet']['description'],
-                                'published_at': video_item['snippet']['publishedAt'],
-                                'thumbnail': video_item['snippet']['thumbnails'].get('high', {}).get('url', ''),
-                                'duration_seconds': duration_seconds,
-                                'duration_formatted': self._format_duration(duration_seconds)
-                            }
                             videos.append(video_data)
                             video_count += 1
+                            
+                            if include_stats and 'statistics' in video_item:
+                                stats = self._build_engagement_data(video_item['id'], video_item['statistics'],
+                                                                    fetched_at)
+                                self._save_video_stats(stats_dir, stats)
+                                collected_stats.append(stats)
                         else:
                             shorts_filtered += 1
                             logger.debug(f"Shorts 필터링: {video_item['snippet']['title']} ({duration_seconds}초)")
@@ -212,7 +268,15 @@ class YouTubeDataCollector:
                 if not next_page_token:
                     break
                 
-                time.sleep(self.request_delay)
+                checkpoint.save(next_page_token, videos,
+                                min_duration_seconds=min_duration_seconds,
+                                shorts_filtered=shorts_filtered)
+                self._throttle()
+            
+            checkpoint.clear()
+            
+            if collected_stats:
+                self._append_stats_history(channel_slug, collected_stats, videos)
             
             # Sort by published date (newest first)
             videos.sort(key=lambda x: x['published_at'], reverse=True)
@@ -223,6 +287,144 @@ class YouTubeDataCollector:
         
         return videos
     
+    def _get_uploads_playlist_id(self, channel_id: str) -> Optional[str]:
+        """Look up the uploads playlist of a channel.
+        
+        Args:
+            channel_id: YouTube channel ID
+            
+        Returns:
+            Uploads playlist ID or None if the channel was not found
+        """
+        channel_response = self.scheduler.execute('channels.list', lambda yt: yt.channels().list(
+            part='contentDetails',
+            id=channel_id
+        ))
+        
+        if not channel_response.get('items'):
+            logger.error(f"채널을 찾을 수 없습니다: {channel_id}")
+            return None
+        
+        uploads_playlist_id = channel_response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
+        logger.info(f"업로드 플레이리스트 ID: {uploads_playlist_id}")
+        return uploads_playlist_id
+    
+    def sync_channel_videos(self, channel_id: str, channel_slug: str, known_videos: List[Dict],
+                            min_duration_seconds: int = 60, include_stats: bool = False) -> List[Dict]:
+        """Add new uploads to an existing catalog without walking the whole playlist.
+        
+        The uploads playlist is ordered newest-first, so paging stops at the
+        first video ID that is already in the catalog.
+        
+        Args:
+            channel_id: YouTube channel ID
+            channel_slug: Channel slug/handle for directory name
+            known_videos: Catalog loaded from _videos.json
+            min_duration_seconds: Minimum video duration in seconds (filters out Shorts)
+            include_stats: Also request 'statistics' for the new videos and save *_stats.json
+            
+        Returns:
+            Merged catalog (new videos first, sorted by published date)
+        """
+        logger.info(f"채널 {channel_id} 증분 동기화 중... (기존 비디오 {len(known_videos)}개)")
+        known_ids = {video['video_id'] for video in known_videos}
+        new_ids = []
+        pages = 0
+        
+        try:
+            uploads_playlist_id = self._get_uploads_playlist_id(channel_id)
+            if not uploads_playlist_id:
+                return known_videos
+            
+            next_page_token = None
+            reached_known = False
+            
+            while not reached_known:
+                playlist_response = self.scheduler.execute('playlistItems.list', lambda yt: yt.playlistItems().list(
+                    part='contentDetails',
+                    playlistId=uploads_playlist_id,
+                    maxResults=50,
+                    pageToken=next_page_token
+                ))
+                pages += 1
+                
+                for item in playlist_response.get('items', []):
+                    video_id = item['contentDetails']['videoId']
+                    if video_id in known_ids:
+                        reached_known = True
+                        break
+                    new_ids.append(video_id)
+                
+                next_page_token = playlist_response.get('nextPageToken')
+                if not next_page_token:
+                    break
+                
+                if not reached_known:
+                    self._throttle()
+            
+            video_parts = 'contentDetails,snippet'
+            if include_stats:
+                video_parts += ',statistics'
+                stats_dir = artifact_dir('stats', channel_slug)
+                make_artifact_dir(stats_dir)
+            
+            new_videos = []
+            collected_stats = []
+            shorts_filtered = 0
+            for start in range(0, len(new_ids), MAX_IDS_PER_REQUEST):
+                batch_ids = new_ids[start:start + MAX_IDS_PER_REQUEST]
+                videos_response, fetched_at = self.scheduler.execute_dated('videos.list', lambda yt: yt.videos().list(
+                    part=video_parts,
+                    id=','.join(batch_ids)
+                ))
+                
+                for video_item in videos_response.get('items', []):
+                    video_data = self._build_video_data(video_item)
+                    if video_data['duration_seconds'] >= min_duration_seconds:
+                        new_videos.append(video_data)
+                        if include_stats and 'statistics' in video_item:
+                            stats = self._build_engagement_data(video_item['id'], video_item['statistics'],
+                                                                fetched_at)
+                            self._save_video_stats(stats_dir, stats)
+                            collected_stats.append(stats)
+                    else:
+                        shorts_filtered += 1
+            
+            if collected_stats:
+                self._append_stats_history(channel_slug, collected_stats, new_videos)
+            
+        except HttpError as e:
+            logger.error(f"증분 동기화 실패, 기존 목록을 유지합니다: {e}")
+            return known_videos
+        
+        logger.info(f"✓ 새 롱폼 비디오 {len(new_videos)}개 발견 "
+                    f"(플레이리스트 {pages}페이지, Shorts {shorts_filtered}개 제외)")
+        
+        videos = new_videos + known_videos
+        videos.sort(key=lambda x: x['published_at'], reverse=True)
+        return videos
+    
+    def _build_video_data(self, video_item: Dict) -> Dict:
+        """Convert a videos.list item (snippet + contentDetails) to a catalog entry.
+        
+        Args:
+            video_item: Item from a videos.list response
+            
+        Returns:
+            Video metadata dictionary as stored in _videos.json
+        """
+        # Parse ISO 8601 duration (e.g., PT1M30S = 1 min 30 sec)
+        duration_seconds = self._parse_duration(video_item['contentDetails']['duration'])
+        return {
+            'video_id': video_item['id'],
+            'title': video_item['snippet']['title'],
+            'description': video_item['snippet']['description'],
+            'published_at': video_item['snippet']['publishedAt'],
+            'thumbnail': video_item['snippet']['thumbnails'].get('high', {}).get('url', ''),
+            'duration_seconds': duration_seconds,
+            'duration_formatted': self._format_duration(duration_seconds)
+        }
+    
     def _parse_duration(self, duration_str: str) -> int:
         """Parse ISO 8601 duration to seconds.
         
@@ -283,7 +485,7 @@ class YouTubeDataCollector:
         # Create data directory if it doesn't exist
         os.makedirs('data', exist_ok=True)
         
-        filename = f"data/{channel_slug}_videos.json"
+        filename = channel_path(channel_slug, 'videos.json')
         logger.info(f"비디오 목록을 {filename}에 저장 중...")
         
         with open(filename, 'w', encoding='utf-8') as f:
@@ -343,8 +545,8 @@ class YouTubeDataCollector:
         logger.info(f"병렬 프로세스로 자막 수집 시작 (워커: {self.max_workers})...")
         
         # Create output directory
-        transcript_dir = f"data/{channel_slug}_transcripts"
-        os.makedirs(transcript_dir, exist_ok=True)
+        transcript_dir = artifact_dir('captions', channel_slug)
+        make_artifact_dir(transcript_dir)
         
         total_videos = len(videos)
         completed = 0
@@ -365,9 +567,8 @@ class YouTubeDataCollector:
                 try:
                     transcript = future.result()
                     if transcript:
-                        transcript_file = os.path.join(transcript_dir, f"{video_id}_transcript.txt")
-                        with open(transcript_file, 'w', encoding='utf-8') as f:
-                            f.write(transcript)
+                        transcript_file = file_path(transcript_dir, video_id, '_transcript.txt', create=True)
+                        write_text(transcript_file, transcript, kind='transcripts')
                     
                     logger.info(f"진행률: {completed}/{total_videos} ({completed*100//total_videos}%)")
                     
@@ -379,6 +580,73 @@ class YouTubeDataCollector:
         
         logger.info(f"✓ 자막 수집 완료: {transcript_dir}/")
     
+    def _build_engagement_data(self, video_id: str, stats: Dict, fetched_at: Optional[float] = None) -> Dict:
+        """Convert a videos.list 'statistics' object to the *_stats.json layout.
+        
+        Args:
+            video_id: YouTube video ID
+            stats: 'statistics' part of a videos.list item
+            fetched_at: When the response was fetched from the API (epoch seconds,
+                from execute_dated); a cached response keeps its original time
+            
+        Returns:
+            Dictionary of engagement stats
+        """
+        return {
+            'video_id': video_id,
+            'view_count': int(stats.get('viewCount', 0)),
+            'like_count': int(stats.get('likeCount', 0)),
+            'comment_count': int(stats.get('commentCount', 0)),
+            'favorite_count': int(stats.get('favoriteCount', 0)),
+            'collected_at': (datetime.fromtimestamp(fetched_at) if fetched_at else datetime.now()).isoformat()
+        }
+    
+    def _save_video_stats(self, stats_dir: str, stats: Dict) -> str:
+        """Write engagement stats for one video to {video_id}_stats.json.
+        
+        Args:
+            stats_dir: Output directory
+            stats: Engagement stats from _build_engagement_data
+            
+        Returns:
+            Path to saved file
+        """
+        stats_file = file_path(stats_dir, stats['video_id'], '_stats.json', create=True)
+        with open(stats_file, 'w', encoding='utf-8') as f:
+            json.dump(stats, f, ensure_ascii=False, indent=2)
+        if self.manifest:
+            self.manifest.record(stats['video_id'], 'stats', stats_file, tool='youtube_channel_data_collector')
+        return stats_file
+    
+    def _append_stats_history(self, channel_slug: str, stats: List[Dict], videos: List[Dict]):
+        """Append one collection run to data/{slug}_stats_timeseries.
+        
+        The *_stats.json files only hold the latest snapshot; the time series
+        keeps every run so growth curves survive.
+        
+        Args:
+            channel_slug: Channel slug/handle for directory name
+            stats: Engagement stats collected in this run
+            videos: Video metadata (publish times enable age queries)
+        """
+        published_at = {video['video_id']: video.get('published_at') for video in videos}
+        rows = StatsTimeSeries(channel_path(channel_slug, 'stats_timeseries')).append(stats, published_at)
+        logger.info(f"✓ 통계 시계열에 스냅샷 {rows}개 추가")
+    
+    def save_stats_snapshots(self, channel_slug: str, stats: List[Dict], videos: List[Dict]):
+        """Write *_stats.json for each snapshot and append them to the time series.
+        
+        Args:
+            channel_slug: Channel slug/handle for directory name
+            stats: Engagement stats from fetch_video_stats_batch
+            videos: Video metadata (publish times enable age queries)
+        """
+        stats_dir = artifact_dir('stats', channel_slug)
+        make_artifact_dir(stats_dir)
+        for entry in stats:
+            self._save_video_stats(stats_dir, entry)
+        self._append_stats_history(channel_slug, stats, videos)
+    
     def fetch_video_stats(self, video_id: str) -> Optional[Dict]:
         """Fetch engagement statistics for a video.
         
@@ -388,32 +656,41 @@ class YouTubeDataCollector:
         Returns:
             Dictionary of engagement stats
         """
+        return (self.fetch_video_stats_batch([video_id]) or {}).get(video_id)
+    
+    def fetch_video_stats_batch(self, video_ids: List[str]) -> Optional[Dict[str, Dict]]:
+        """Fetch engagement statistics for up to 50 videos in one videos.list call.
+        
+        Args:
+            video_ids: YouTube video IDs (at most MAX_IDS_PER_REQUEST)
+            
+        Returns:
+            Dictionary mapping video_id to engagement stats. Videos that were
+            deleted or made private are missing from the result. None if the
+            request itself failed, so callers can tell that apart from missing videos.
+        """
+        if len(video_ids) > MAX_IDS_PER_REQUEST:
+            raise ValueError(f"videos.list는 최대 {MAX_IDS_PER_REQUEST}개 ID만 허용합니다: {len(video_ids)}")
+        
+        results = {}
         try:
-            response = self.youtube.videos().list(
+            # maxResults is not supported together with the id filter
+            response, fetched_at = self.scheduler.execute_dated('videos.list', lambda yt: yt.videos().list(
                 part='statistics',
-                id=video_id
-            ).execute()
+                id=','.join(video_ids)
+            ))
             
-            if response.get('items'):
-                stats = response['items'][0]['statistics']
-                engagement_data = {
-                    'video_id': video_id,
-                    'view_count': int(stats.get('viewCount', 0)),
-                    'like_count': int(stats.get('likeCount', 0)),
-                    'comment_count': int(stats.get('commentCount', 0)),
-                    'favorite_count': int(stats.get('favoriteCount', 0)),
-                    'collected_at': datetime.now().isoformat()
-                }
-                logger.info(f"✓ 비디오 {video_id} 참여도 통계 수집 완료")
-                return engagement_data
+            for item in response.get('items', []):
+                results[item['id']] = self._build_engagement_data(item['id'], item['statistics'], fetched_at)
             
         except HttpError as e:
-            logger.error(f"✗ 비디오 {video_id} 통계 가져오기 실패: {e}")
+            logger.error(f"✗ 비디오 {len(video_ids)}개 통계 가져오기 실패: {e}")
+            return None
         
-        return None
+        return results
     
     def fetch_all_video_stats(self, channel_slug: str, videos: List[Dict]):
-        """Fetch engagement stats for all videos.
+        """Fetch engagement stats for all videos, 50 IDs per videos.list call.
         
         Args:
             channel_slug: Channel slug/handle for directory name
@@ -422,109 +699,219 @@ class YouTubeDataCollector:
         logger.info("비디오 참여도 통계 수집 중...")
         
         # Create output directory
-        stats_dir = f"data/{channel_slug}_engagement_stats"
-        os.makedirs(stats_dir, exist_ok=True)
+        stats_dir = artifact_dir('stats', channel_slug)
+        make_artifact_dir(stats_dir)
+        
+        video_ids = [video['video_id'] for video in videos]
+        collected_stats = []
         
-        for idx, video in enumerate(videos, 1):
-            video_id = video['video_id']
-            stats = self.fetch_video_stats(video_id)
+        for start in range(0, len(video_ids), MAX_IDS_PER_REQUEST):
+            batch_ids = video_ids[start:start + MAX_IDS_PER_REQUEST]
+            batch_stats = self.fetch_video_stats_batch(batch_ids)
             
-            if stats:
-                stats_file = os.path.join(stats_dir, f"{video_id}_stats.json")
-                with open(stats_file, 'w', encoding='utf-8') as f:
-                    json.dump(stats, f, ensure_ascii=False, indent=2)
+            if batch_stats is not None:
+                for video_id in batch_ids:
+                    stats = batch_stats.get(video_id)
+                    if stats:
+                        self._save_video_stats(stats_dir, stats)
+                        collected_stats.append(stats)
+                    else:
+                        logger.warning(f"⚠ 비디오 {video_id} 통계 없음 (삭제/비공개 가능)")
             
-            logger.info(f"진행률: {idx}/{len(videos)} ({idx*100//len(videos)}%)")
-            time.sleep(self.request_delay)
+            done = start + len(batch_ids)
+            logger.info(f"진행률: {done}/{len(video_ids)} ({done*100//len(video_ids)}%)")
+            
+            if done < len(video_ids):
+                self._throttle()
         
-        logger.info(f"✓ 참여도 통계 수집 완료: {stats_dir}/")
+        self._append_stats_history(channel_slug, collected_stats, videos)
+        logger.info(f"✓ 참여도 통계 {len(collected_stats)}개 수집 완료: {stats_dir}/")
     
-    def fetch_video_comments(self, video_id: str) -> List[str]:
-        """Fetch comments for a video (text only, no author metadata).
+    def fetch_video_comments(self, video_id: str) -> List[Dict]:
+        """Fetch comments for a video, top-level comments followed by their replies.
         
         Args:
             video_id: YouTube video ID
             
         Returns:
-            List of comment texts
+            List of comment records (see comment_schema.FIELDS)
         """
-        comments = []
+        # Resume a thread listing that stopped mid-way (e.g. quota exhausted);
+        # checkpoints written before schema 2 hold bare strings
+        checkpoint = CrawlCheckpoint(f"comments_{video_id}")
+        comments = [upgrade(comment) for comment in checkpoint.items]
+        if checkpoint.exists:
+            logger.info(f"↻ 비디오 {video_id} 댓글 체크포인트에서 재개 ({len(comments)}개 수집된 상태)")
         
         try:
-            next_page_token = None
+            next_page_token = checkpoint.page_token
             
             while True:
-                response = self.youtube.commentThreads().list(
-                    part='snippet',
+                response = self.scheduler.execute('commentThreads.list', lambda yt: yt.commentThreads().list(
+                    part=self._thread_parts(),
                     videoId=video_id,
                     maxResults=100,
                     pageToken=next_page_token,
                     textFormat='plainText'
-                ).execute()
+                ))
                 
                 for item in response.get('items', []):
-                    comment_text = item['snippet']['topLevelComment']['snippet']['textDisplay']
-                    comments.append(comment_text)
-                    
-                    # Get replies if any
-                    if item['snippet']['totalReplyCount'] > 0:
-                        try:
-                            replies_response = self.youtube.comments().list(
-                                part='snippet',
-                                parentId=item['snippet']['topLevelComment']['id'],
-                                maxResults=100,
-                                textFormat='plainText'
-                            ).execute()
-                            
-                            for reply in replies_response.get('items', []):
-                                reply_text = reply['snippet']['textDisplay']
-                                comments.append(reply_text)
-                        except HttpError:
-                            pass
+                    comments.extend(from_thread(item, self._thread_replies(item)))
                 
                 next_page_token = response.get('nextPageToken')
                 if not next_page_token:
                     break
                 
-                time.sleep(self.request_delay)
+                checkpoint.save(next_page_token, comments)
+                self._throttle()
             
+            checkpoint.clear()
             logger.info(f"✓ 비디오 {video_id} 댓글 {len(comments)}개 수집 완료")
             
         except HttpError as e:
             if 'commentsDisabled' in str(e):
+                checkpoint.clear()
                 logger.warning(f"⚠ 비디오 {video_id} 댓글 비활성화됨")
             else:
+                # Keep the checkpoint so the next run continues from the failed page
                 logger.error(f"✗ 비디오 {video_id} 댓글 가져오기 실패: {e}")
         
         return comments
     
+    def _thread_parts(self) -> str:
+        """commentThreads.list parts for the configured reply mode."""
+        return 'snippet' if self.reply_mode == 'none' else 'snippet,replies'
+    
+    def _reply_limit(self, item: Dict) -> int:
+        """Number of replies wanted for a comment thread."""
+        if self.reply_mode == 'none':
+            return 0
+        total = item['snippet']['totalReplyCount']
+        return total if self.max_replies is None else min(total, self.max_replies)
+    
+    def _thread_replies(self, item: Dict) -> List[Dict]:
+        """Replies of a comment thread, using the inline set when it is complete.
+        
+        commentThreads.list with part='replies' returns up to 5 replies inline;
+        comments.list is paged only when that set is shorter than wanted.
+        
+        Args:
+            item: commentThreads.list item
+            
+        Returns:
+            List of reply comment resources
+        """
+        limit = self._reply_limit(item)
+        if limit == 0:
+            return []
+        
+        inline = item.get('replies', {}).get('comments', [])
+        if len(inline) >= limit or self.reply_mode == 'inline':
+            return inline[:limit]
+        
+        replies = []
+        page_token = None
+        try:
+            while len(replies) < limit:
+                response = self.scheduler.execute('comments.list', lambda yt: yt.comments().list(
+                    part='snippet',
+                    parentId=item['snippet']['topLevelComment']['id'],
+                    maxResults=100,
+                    pageToken=page_token,
+                    textFormat='plainText'
+                ))
+                replies.extend(response.get('items', []))
+                
+                page_token = response.get('nextPageToken')
+                if not page_token:
+                    break
+        except HttpError:
+            # Fall back to whatever came inline
+            return inline[:limit]
+        
+        return replies[:limit]
+    
+    def _save_video_comments(self, comments_dir: str, video_id: str, comments: List) -> str:
+        """Write comments for one video to {video_id}_comments.json.
+        
+        Args:
+            comments_dir: Output directory
+            video_id: YouTube video ID
+            comments: Collected comments
+            
+        Returns:
+            Path to saved file
+        """
+        comments_file = file_path(comments_dir, video_id, '_comments.json', create=True)
+        # Written as {video_id}_comments.json.zst when STORAGE_COMPRESSION=zstd
+        comments_file = write_json(comments_file, comments_document(video_id, comments), kind='comments')
+        if self.comment_store:
+            self.comment_store.replace_video_comments(video_id, comments)
+        if self.manifest:
+            self.manifest.record(video_id, 'comments', comments_file,
+                                 tool=f"youtube_channel_data_collector:replies-{self.reply_mode}")
+        return comments_file
+    
+    def _collect_video_comments(self, comments_dir: str, video_id: str) -> bool:
+        """Fetch and save comments for one video (runs in a comment worker).
+        
+        Args:
+            comments_dir: Output directory
+            video_id: YouTube video ID
+            
+        Returns:
+            True if the thread listing finished (no leftover checkpoint)
+        """
+        comments = self.fetch_video_comments(video_id)
+        # Each file is written as soon as its video finishes
+        self._save_video_comments(comments_dir, video_id, comments)
+        # A leftover per-video checkpoint means the listing failed part-way
+        return not CrawlCheckpoint(f"comments_{video_id}").exists
+    
     def fetch_all_comments(self, channel_slug: str, videos: List[Dict]):
-        """Fetch comments for all videos.
+        """Fetch comments for all videos across comment_workers threads.
         
         Args:
             channel_slug: Channel slug/handle for directory name
             videos: List of video metadata
         """
-        logger.info("비디오 댓글 수집 중...")
+        logger.info(f"비디오 댓글 수집 중... (워커: {self.comment_workers})")
         
         # Create output directory
-        comments_dir = f"data/{channel_slug}_comments"
-        os.makedirs(comments_dir, exist_ok=True)
+        comments_dir = artifact_dir('comments', channel_slug)
+        make_artifact_dir(comments_dir)
         
-        for idx, video in enumerate(videos, 1):
-            video_id = video['video_id']
-            comments = self.fetch_video_comments(video_id)
-            
-            comments_file = os.path.join(comments_dir, f"{video_id}_comments.json")
-            with open(comments_file, 'w', encoding='utf-8') as f:
-                json.dump({
-                    'video_id': video_id,
-                    'comment_count': len(comments),
-                    'comments': comments
-                }, f, ensure_ascii=False, indent=2)
+        # Videos finished by an interrupted run of this stage are skipped
+        stage_checkpoint = CrawlCheckpoint(f"comments_stage_{channel_slug}")
+        completed = set(stage_checkpoint.items)
+        if completed:
+            logger.info(f"↻ 댓글 단계 체크포인트에서 재개: {len(completed)}개 비디오 완료된 상태")
+        
+        remaining = [video['video_id'] for video in videos if video['video_id'] not in completed]
+        
+        executor = ThreadPoolExecutor(max_workers=self.comment_workers)
+        try:
+            future_to_video = {
+                executor.submit(self._collect_video_comments, comments_dir, video_id): video_id
+                for video_id in remaining
+            }
             
-            logger.info(f"진행률: {idx}/{len(videos)} ({idx*100//len(videos)}%)")
+            for idx, future in enumerate(as_completed(future_to_video), 1):
+                if future.result():
+                    completed.add(future_to_video[future])
+                if idx % STAGE_CHECKPOINT_INTERVAL == 0:
+                    stage_checkpoint.save(None, sorted(completed))
+                
+                logger.info(f"진행률: {idx}/{len(remaining)} ({idx*100//len(remaining)}%)")
+        except BaseException:
+            # Quota exhausted or interrupted: stop queued videos and keep progress
+            executor.shutdown(wait=True, cancel_futures=True)
+            stage_checkpoint.save(None, sorted(completed))
+            raise
+        finally:
+            executor.shutdown(wait=True)
         
+        stage_checkpoint.clear()
         logger.info(f"✓ 댓글 수집 완료: {comments_dir}/")
 
 
@@ -540,6 +927,7 @@ def main():
   
 환경변수:
   YOUTUBE_API_KEY를 .env 파일에 설정하거나 --api-key로 직접 전달
+  YOUTUBE_API_KEYS=key1,key2 로 여러 키를 등록하면 쿼터가 남은 키를 자동 선택
         """
     )
     parser.add_argument(
@@ -551,6 +939,98 @@ def main():
         help='YouTube Data API v3 키 (기본값: 환경변수 YOUTUBE_API_KEY)',
         default=os.getenv('YOUTUBE_API_KEY')
     )
+    parser.add_argument(
+        '--quota-ledger',
+        default=DEFAULT_LEDGER_PATH,
+        help=f'쿼터 사용량 기록 파일 (기본값: {DEFAULT_LEDGER_PATH})'
+    )
+    parser.add_argument(
+        '--wait-for-quota',
+        action='store_true',
+        help='모든 API 키 쿼터 소진 시 종료하지 않고 리셋(태평양 자정)까지 대기'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        default=DEFAULT_CACHE_DIR,
+        help=f'API 응답 캐시 디렉토리 (기본값: {DEFAULT_CACHE_DIR})'
+    )
+    parser.add_argument(
+        '--cache-ttl',
+        type=float,
+        default=None,
+        help='모든 엔드포인트에 적용할 캐시 유효 시간(초). 만료된 항목은 ETag로 재검증 (기본값: 엔드포인트별)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='API 응답 캐시 사용 안 함'
+    )
+    parser.add_argument(
+        '--offline',
+        action='store_true',
+        help='API를 호출하지 않고 캐시된 응답만 사용 (캐시에 없는 요청은 오류)'
+    )
+    parser.add_argument(
+        '--comment-workers',
+        type=int,
+        default=4,
+        help='댓글 수집 워커 스레드 수 (기본값: 4)'
+    )
+    parser.add_argument(
+        '--comment-db',
+        default=DEFAULT_DB_PATH,
+        help=f'댓글 SQLite 저장소 (기본값: {DEFAULT_DB_PATH})'
+    )
+    parser.add_argument(
+        '--no-comment-db',
+        action='store_true',
+        help='댓글을 JSON 파일에만 저장'
+    )
+    parser.add_argument(
+        '--manifest',
+        default=DEFAULT_MANIFEST_PATH,
+        help=f'산출물 목록 (기본값: {DEFAULT_MANIFEST_PATH})'
+    )
+    parser.add_argument(
+        '--no-manifest',
+        action='store_true',
+        help='산출물 목록을 갱신하지 않음'
+    )
+    parser.add_argument(
+        '--replies',
+        choices=['all', 'inline', 'none'],
+        default='all',
+        help='답글 수집 방식: all(인라인 답글, 잘린 경우만 추가 호출), inline(인라인만), none (기본값: all)'
+    )
+    parser.add_argument(
+        '--max-replies',
+        type=int,
+        default=None,
+        help='댓글 스레드당 최대 답글 수 (기본값: 제한 없음)'
+    )
+    parser.add_argument(
+        '--requests-per-second',
+        type=float,
+        default=10.0,
+        help='모든 워커가 공유하는 Data API 초당 요청 수 상한 (기본값: 10)'
+    )
+    parser.add_argument(
+        '--engine',
+        choices=['sync', 'async'],
+        default='sync',
+        help='수집 엔진: sync(googleapiclient) 또는 async(aiohttp 커넥션 풀) (기본값: sync)'
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=16,
+        help='async 엔진의 최대 동시 요청 수 (기본값: 16)'
+    )
+    parser.add_argument(
+        '--api-base-url',
+        default=None,
+        help='async 엔진의 Data API 기본 URL (벤치마크용 목 서버 등)'
+    )
     parser.add_argument(
         '--max-workers',
         type=int,
@@ -568,6 +1048,16 @@ def main():
         action='store_true',
         help='기존 비디오 목록 파일을 무시하고 새로 가져오기'
     )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='기존 비디오 목록에 없는 새 업로드만 가져와서 병합 (이미 아는 비디오에서 페이징 중단)'
+    )
+    parser.add_argument(
+        '--stats-with-catalog',
+        action='store_true',
+        help='비디오 목록 수집 시 참여도 통계도 함께 가져오기 (3단계 API 호출 생략)'
+    )
     parser.add_argument(
         '--skip-transcripts',
         action='store_true',
@@ -583,10 +1073,18 @@ def main():
         action='store_true',
         help='댓글 수집 건너뛰기'
     )
+    parser.add_argument(
+        '--compress',
+        action='store_true',
+        help='댓글/자막을 zstd 사전 압축(.zst)으로 저장 (기본값: 환경변수 STORAGE_COMPRESSION)'
+    )
     
     args = parser.parse_args()
+    if args.compress:
+        set_compression(True)
     
-    if not args.api_key:
+    api_keys = load_api_keys(args.api_key)
+    if not api_keys:
         logger.error("❌ API 키가 필요합니다!")
         logger.error("다음 중 하나를 수행하세요:")
         logger.error("  1. .env 파일에 YOUTUBE_API_KEY=your_key 추가")
@@ -599,7 +1097,63 @@ def main():
     logger.info("=" * 60)
     
     # Initialize collector
-    collector = YouTubeDataCollector(args.api_key, args.max_workers)
+    scheduler = QuotaScheduler(
+        api_keys,
+        ledger=QuotaLedger(args.quota_ledger),
+        wait_for_reset=args.wait_for_quota,
+        rate_limiter=TokenBucket(args.requests_per_second),
+        cache=None if args.no_cache else ResponseCache(args.cache_dir, default_ttl=args.cache_ttl,
+                                                       offline=args.offline)
+    )
+    if args.offline:
+        logger.info(f"오프라인 모드: {args.cache_dir}의 캐시된 응답만 사용합니다.")
+    logger.info(f"API 키 {len(api_keys)}개, 오늘 남은 쿼터: {scheduler.remaining():,} units")
+    comment_store = None if args.no_comment_db else CommentStore(args.comment_db)
+    manifest = None if args.no_manifest else ArtifactManifest(args.manifest)
+    if args.engine == 'async':
+        from async_collector import DEFAULT_API_BASE_URL, AsyncYouTubeDataCollector
+        collector = AsyncYouTubeDataCollector(
+            args.api_key,
+            args.max_workers,
+            scheduler=scheduler,
+            base_url=args.api_base_url or DEFAULT_API_BASE_URL,
+            concurrency=args.concurrency,
+            reply_mode=args.replies,
+            max_replies=args.max_replies,
+            comment_store=comment_store,
+            manifest=manifest
+        )
+        logger.info(f"async 엔진 사용 (동시 요청 {args.concurrency}개, {collector.base_url})")
+    else:
+        collector = YouTubeDataCollector(args.api_key, args.max_workers, scheduler=scheduler,
+                                         comment_workers=args.comment_workers,
+                                         reply_mode=args.replies,
+                                         max_replies=args.max_replies,
+                                         comment_store=comment_store,
+                                         manifest=manifest)
+    
+    try:
+        run_collection(collector, args)
+    except QuotaExhaustedError as e:
+        logger.warning(f"⏸ {e}")
+        logger.warning("수집된 파일은 보존됩니다. 쿼터 리셋 후 다시 실행하세요 (--wait-for-quota로 자동 대기 가능).")
+        sys.exit(2)
+    except CacheMissError as e:
+        logger.error(f"❌ {e}")
+        sys.exit(1)
+    finally:
+        if scheduler.cache:
+            logger.info(scheduler.cache.summary())
+
+
+def run_collection(collector: YouTubeDataCollector, args: argparse.Namespace):
+    """Run the four collection stages for one channel.
+    
+    Args:
+        collector: Initialized data collector
+        args: Parsed command line arguments
+    """
+    scheduler = collector.scheduler
     
     # Get channel ID
     channel_id = collector.get_channel_id(args.channel)
@@ -617,31 +1171,51 @@ def main():
     
     # Step 1: Fetch videos
     logger.info("\n[1/4] 비디오 목록 수집")
+    stats_collected = False
     
     # Check if videos JSON already exists
-    videos_file = f"data/{channel_slug}_videos.json"
-    if os.path.exists(videos_file) and not args.force_refresh:
+    videos_file = channel_path(channel_slug, 'videos.json')
+    if CrawlCheckpoint(f"catalog_{channel_id}").exists:
+        logger.info("↻ 중단된 비디오 목록 수집 체크포인트 발견 - 이어서 수집합니다.")
+        videos = collector.fetch_channel_videos(channel_id, channel_slug, min_duration_seconds=args.min_duration,
+                                                include_stats=args.stats_with_catalog)
+        collector.save_videos_list(channel_slug, videos)
+        stats_collected = args.stats_with_catalog
+    elif os.path.exists(videos_file) and not args.force_refresh:
         logger.info(f"✓ 기존 비디오 목록 파일 발견: {videos_file}")
-        logger.info("API 호출을 건너뛰고 기존 파일을 사용합니다.")
-        logger.info("(새로 가져오려면 --force-refresh 옵션 사용)")
+        if not args.incremental:
+            logger.info("API 호출을 건너뛰고 기존 파일을 사용합니다.")
+            logger.info("(새 업로드를 반영하려면 --incremental, 전체를 새로 가져오려면 --force-refresh 옵션 사용)")
         try:
             with open(videos_file, 'r', encoding='utf-8') as f:
                 videos = json.load(f)
             logger.info(f"✓ {len(videos)}개의 비디오 정보를 로드했습니다.")
-        except Exception as e:
+            
+            if args.incremental:
+                known_count = len(videos)
+                videos = collector.sync_channel_videos(channel_id, channel_slug, videos,
+                                                       min_duration_seconds=args.min_duration,
+                                                       include_stats=args.stats_with_catalog)
+                if len(videos) > known_count:
+                    collector.save_videos_list(channel_slug, videos)
+        except (OSError, json.JSONDecodeError) as e:
             logger.error(f"파일 로드 실패: {e}")
             logger.info("API를 통해 새로 가져옵니다...")
-            videos = collector.fetch_channel_videos(channel_id, channel_slug, min_duration_seconds=args.min_duration)
+            videos = collector.fetch_channel_videos(channel_id, channel_slug, min_duration_seconds=args.min_duration,
+                                                    include_stats=args.stats_with_catalog)
             collector.save_videos_list(channel_slug, videos)
+            stats_collected = args.stats_with_catalog
     else:
         if args.force_refresh and os.path.exists(videos_file):
             logger.info("--force-refresh 옵션으로 기존 파일을 무시하고 새로 가져옵니다.")
         logger.info(f"롱폼 비디오만 수집 ({args.min_duration}초 이상)")
-        videos = collector.fetch_channel_videos(channel_id, channel_slug, min_duration_seconds=args.min_duration)
+        videos = collector.fetch_channel_videos(channel_id, channel_slug, min_duration_seconds=args.min_duration,
+                                                include_stats=args.stats_with_catalog)
         if not videos:
             logger.error("비디오를 찾을 수 없습니다.")
             sys.exit(1)
         collector.save_videos_list(channel_slug, videos)
+        stats_collected = args.stats_with_catalog
     
     if not videos:
         logger.error("비디오 목록이 비어있습니다.")
@@ -654,8 +1228,17 @@ def main():
     else:
         logger.info("\n[2/4] 자막 수집 건너뜀")
     
+    # Check the remaining API stages against today's quota
+    if not stats_collected and not args.skip_stats:
+        scheduler.plan('참여도 통계', -(-len(videos) // MAX_IDS_PER_REQUEST))
+    if not args.skip_comments:
+        # At least one commentThreads page per video; replies cost extra
+        scheduler.plan('댓글', len(videos))
+    
     # Step 3: Fetch engagement stats
-    if not args.skip_stats:
+    if stats_collected:
+        logger.info("\n[3/4] 참여도 통계는 비디오 목록과 함께 수집됨")
+    elif not args.skip_stats:
         logger.info("\n[3/4] 참여도 통계 수집")
         collector.fetch_all_video_stats(channel_slug, videos)
     else:
@@ -671,6 +1254,7 @@ def main():
     logger.info("\n" + "=" * 60)
     logger.info("✅ 모든 데이터 수집 완료!")
     logger.info(f"📁 수집된 데이터 위치: ./data/{channel_slug}_*")
+    logger.info(f"🎫 오늘 남은 쿼터: {scheduler.remaining():,} units")
     logger.info("=" * 60)
 
 